@@ -0,0 +1,108 @@
+"""
+bench_chunking.py
+-----------------
+
+Review embedding throughput with the old preparation (500-word chunks from
+``chunk_text``) versus token-aware chunks from ``EmbeddingModel.chunk``.
+Both are encoded with a single ``SentenceTransformer.encode(texts,
+batch_size=...)`` call, which already sorts texts by length; with
+``--max-batch-tokens`` the token chunks are also encoded in
+``EmbeddingModel``'s token-budgeted batches.
+
+For each mode it reports
+
+* texts/sec and tokens/sec (real tokens the model read, counted outside
+  the timed call),
+* coverage (share of each review's tokens that reached the model rather
+  than being truncated at ``max_seq_length``).
+
+Reviews are synthetic with a long-tailed length distribution like IMDb's
+(mostly a paragraph, some a few thousand words); pass ``--csv`` to use a
+real reviews CSV written by the scraper.
+
+Usage:
+    python -m benchmarks.bench_chunking
+    python -m benchmarks.bench_chunking --n 5000 --max-batch-tokens 8192
+    python -m benchmarks.bench_chunking --csv data/csv/imdb_reviews_The_Matrix.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from cinematch.processing.cleaning import chunk_text, clean_texts
+from cinematch.processing.embedding import EmbeddingModel
+from benchmarks.bench_parallel_embedding import PHRASES
+
+
+def make_reviews(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    word_counts = np.clip(rng.lognormal(mean=4.6, sigma=0.9, size=n).astype(int), 3, 5000)
+    vocabulary = " ".join(PHRASES).split()
+    return [" ".join(rng.choice(vocabulary, size=count)) for count in word_counts]
+
+
+def coverage(model: EmbeddingModel, reviews, flat) -> float:
+    """Review tokens inside some chunk's first ``max_tokens`` word-pieces."""
+    total = int(sum(len(e.ids) for e in model._tokenizer_copy().encode_batch(reviews, add_special_tokens=False)))
+    seen = model.token_lengths(flat) - 2  # without [CLS]/[SEP]
+    return min(1.0, float(seen.sum()) / total) if total else 1.0
+
+
+def run(model: EmbeddingModel, reviews, chunks, encode) -> dict:
+    flat = [chunk for parts in chunks for chunk in parts]
+    start = time.perf_counter()
+    encode(flat)
+    seconds = time.perf_counter() - start
+    tokens = int(model.token_lengths(flat).sum())
+    return {
+        'texts': len(flat),
+        'texts_per_sec': len(flat) / seconds,
+        'tokens_per_sec': tokens / seconds,
+        'coverage': coverage(model, reviews, flat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark word chunks vs token chunks against a single encode call")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--n", type=int, default=2000, help="Synthetic reviews")
+    parser.add_argument("--csv", type=str, help="Real reviews CSV instead of synthetic data")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--overlap", type=int, default=32, help="Tokens shared by consecutive chunks")
+    parser.add_argument("--max-batch-tokens", type=int, help="Also time token-budgeted batches with this cap")
+    args = parser.parse_args()
+
+    if args.csv:
+        import pandas as pd
+        reviews = [text for text in clean_texts(pd.read_csv(args.csv)['content']) if len(text) >= 20]
+    else:
+        reviews = make_reviews(args.n)
+
+    model = EmbeddingModel(args.model, max_batch_tokens=args.max_batch_tokens)
+    model.model.encode(reviews[:args.batch_size], batch_size=args.batch_size)  # warm up
+    print(f"{len(reviews):,} reviews, batch {args.batch_size}, max_seq_length {model.model.max_seq_length}\n")
+
+    def encode(texts):
+        return model.model.encode(texts, batch_size=args.batch_size)
+
+    token_chunks = model.chunk(reviews, overlap=args.overlap)
+    results = [
+        ("500 words, encode()", run(model, reviews, [chunk_text(review) for review in reviews], encode)),
+        ("token chunks, encode()", run(model, reviews, token_chunks, encode)),
+    ]
+    if args.max_batch_tokens:
+        budgeted = run(model, reviews, token_chunks, lambda texts: model.encode_array(texts, batch_size=args.batch_size))
+        results.append((f"token chunks, {args.max_batch_tokens} tok", budgeted))
+
+    print(f"{'mode':<28} {'texts':>7} {'texts/s':>9} {'tokens/s':>10} {'coverage':>9}")
+    for name, stats in results:
+        print(f"{name:<28} {stats['texts']:>7} {stats['texts_per_sec']:>9.0f} {stats['tokens_per_sec']:>10.0f} {stats['coverage']:>9.0%}")
+    baseline = results[0][1]['tokens_per_sec']
+    for name, stats in results[1:]:
+        print(f"{name}: {stats['tokens_per_sec'] / baseline:.2f}x tokens/sec of a plain encode() on 500-word chunks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+bench_embedding_memory.py
+-------------------------
+
+Peak memory and wall time of holding a batch of review embeddings as
+Python lists (``EmbeddingModel.encode``, the old ``.tolist()`` path) versus
+one contiguous float32 array (``EmbeddingModel.encode_array``), from the
+encoder output up to the upsert-sized chunks handed to the vector store.
+
+By default the encoder is simulated with random float32 blocks of the
+model's shape, which isolates the cost of the representation itself; pass
+``--model`` to run the real sentence-transformers model instead (the
+encode time then dominates wall time, but the memory gap is the same).
+``--store`` additionally upserts both variants into a throwaway ChromaDB.
+
+Usage:
+    python -m benchmarks.bench_embedding_memory
+    python -m benchmarks.bench_embedding_memory --n 100000 --model --store
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+UPSERT_CHUNK = 5461  # ChromaDB's default max batch size
+
+
+def synthetic_encoder(dim: int, normalize: bool):
+    rng = np.random.default_rng(0)
+
+    def encode(texts, batch_size):
+        block = rng.standard_normal((len(texts), dim), dtype=np.float32)
+        if normalize:
+            block /= np.linalg.norm(block, axis=1, keepdims=True)
+        return block
+
+    return encode
+
+
+def run_lists(encode, texts, batch_size, upsert):
+    embeddings = []
+    for start in range(0, len(texts), batch_size):
+        embeddings.extend(encode(texts[start:start + batch_size], batch_size).tolist())
+    for start in range(0, len(embeddings), UPSERT_CHUNK):
+        upsert(start, embeddings[start:start + UPSERT_CHUNK])
+    return embeddings
+
+
+def run_array(encode, texts, batch_size, upsert):
+    blocks = [encode(texts[start:start + batch_size], batch_size) for start in range(0, len(texts), batch_size)]
+    embeddings = np.concatenate(blocks)
+    del blocks
+    for start in range(0, len(embeddings), UPSERT_CHUNK):
+        upsert(start, embeddings[start:start + UPSERT_CHUNK])
+    return embeddings
+
+
+def measure(name, func, *args):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {elapsed:>8.2f}s {peak / 2 ** 20:>10.1f} MiB {current / 2 ** 20:>10.1f} MiB")
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list vs float32-array embedding batches")
+    parser.add_argument("--n", type=int, default=100_000, help="Number of reviews")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (synthetic encoder)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--normalize", action="store_true")
+    parser.add_argument("--model", action="store_true", help="Use the real EmbeddingModel instead of the synthetic encoder")
+    parser.add_argument("--store", action="store_true", help="Also upsert into a temporary ChromaDB collection")
+    args = parser.parse_args()
+
+    texts = [f"Review {i}: a thoughtful take on the pacing, the score and the third act." for i in range(args.n)]
+
+    if args.model:
+        from cinematch.processing.embedding import EmbeddingModel
+        model = EmbeddingModel()
+
+        def encode(batch, batch_size):
+            return model.encode_array(batch, batch_size=batch_size, normalize=args.normalize)
+    else:
+        encode = synthetic_encoder(args.dim, args.normalize)
+
+    tmp = None
+    if args.store:
+        from cinematch.processing.store import VectorStore
+        tmp = tempfile.TemporaryDirectory()
+
+    results = {}
+    print(f"{args.n:,} reviews, batch {args.batch_size}, {'model' if args.model else f'synthetic dim={args.dim}'}\n")
+    print(f"{'variant':<28} {'wall':>9} {'peak':>14} {'retained':>14}")
+    for name, run in (("lists (.tolist())", run_lists), ("float32 array", run_array)):
+        upsert = lambda start, chunk: None
+        if tmp:
+            store = VectorStore(collection_name=f"bench_{run.__name__}", persistent_path=tmp.name)
+
+            def upsert(start, chunk, store=store):
+                ids = [str(i) for i in range(start, start + len(chunk))]
+                store.collection.upsert(ids=ids, embeddings=chunk, documents=texts[start:start + len(chunk)])
+        results[name] = measure(name, run, encode, texts, args.batch_size, upsert)
+
+    (list_time, list_peak), (array_time, array_peak) = results.values()
+    print(f"\nfloat32 array: {list_peak / array_peak:.1f}x lower peak memory, {list_time / array_time:.1f}x faster")
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+bench_hnsw_sweep.py
+-------------------
+
+Recall/latency sweep over the vector store's index settings: for every
+combination of distance space, HNSW ``m`` and ``ef_construction`` a
+collection is built in a temporary ChromaDB, then queried at each
+``ef_search``. Each row reports
+
+* build time,
+* recall@k against exact (brute-force numpy) search in the same space,
+* single-query latency p50 / p99.
+
+Chroma applies ``ef_search`` when a process first loads the index, so each
+``ef_search`` is measured in a fresh process.
+
+By default the vectors are synthetic (unit-norm, clustered like review
+embeddings of a few thousand movies); pass ``--collection`` to sweep over
+the embeddings of an existing collection, so the chosen point fits our
+actual corpus size. Queries are held out of the index.
+
+Usage:
+    python -m benchmarks.bench_hnsw_sweep
+    python -m benchmarks.bench_hnsw_sweep --n 50000 --m 8 16 32 --ef-search 10 50 100 200
+    python -m benchmarks.bench_hnsw_sweep --collection cinematch_reviews --path ./data/chroma_db --spaces cosine l2
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cinematch.processing.store import VectorStore
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, size=n)] + 0.6 * rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def stored_vectors(collection: str, path: str) -> np.ndarray:
+    store = VectorStore(collection, persistent_path=path)
+    blocks, step = [], store.max_batch_size
+    for offset in range(0, store.count(), step):
+        blocks.append(np.asarray(store.collection.get(include=["embeddings"], limit=step, offset=offset)['embeddings'], dtype=np.float32))
+    return np.concatenate(blocks)
+
+
+def exact_top_k(data: np.ndarray, queries: np.ndarray, k: int, space: str) -> np.ndarray:
+    if space == "cosine":
+        data = data / np.linalg.norm(data, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    if space == "l2":
+        scores = -(np.sum(data ** 2, axis=1)[None, :] - 2 * queries @ data.T)
+    else:
+        scores = queries @ data.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def build(path: str, name: str, data: np.ndarray, space: str, m: int, ef_construction: int) -> VectorStore:
+    store = VectorStore(name, persistent_path=path, space=space, m=m, ef_construction=ef_construction)
+    ids = [str(i) for i in range(len(data))]
+    store.add_documents(documents=ids, metadatas=[{'row': i} for i in range(len(data))], embeddings=data, ids=ids)
+    return store
+
+
+def measure_queries(path: str, name: str, ef_search: int, queries: np.ndarray, truth: np.ndarray, k: int):
+    store = VectorStore(name, persistent_path=path, ef_search=ef_search)
+    store.query_embeddings(queries[:1], n_results=k)  # warm up
+    hits, timings = 0, []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        result = store.query_embeddings(query[None, :], n_results=k)
+        timings.append(time.perf_counter() - start)
+        hits += len(set(map(int, result['ids'][0])) & set(expected.tolist()))
+    timings = np.array(timings) * 1000
+    return hits / (k * len(queries)), np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep distance space and HNSW parameters for recall and latency")
+    parser.add_argument("--n", type=int, default=20_000, help="Synthetic vectors")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2_000, help="Synthetic clusters (movies)")
+    parser.add_argument("--collection", type=str, help="Sweep over this existing collection's embeddings instead")
+    parser.add_argument("--path", type=str, default="./data/chroma_db", help="ChromaDB directory of --collection")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out query vectors")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--spaces", nargs="+", default=["cosine"], choices=["cosine", "ip", "l2"])
+    parser.add_argument("--m", nargs="+", type=int, default=[16])
+    parser.add_argument("--ef-construction", nargs="+", type=int, default=[100])
+    parser.add_argument("--ef-search", nargs="+", type=int, default=[10, 25, 50, 100, 200])
+    args = parser.parse_args()
+
+    vectors = stored_vectors(args.collection, args.path) if args.collection else synthetic_vectors(args.n, args.dim, args.clusters)
+    rng = np.random.default_rng(1)
+    order = rng.permutation(len(vectors))
+    queries, data = vectors[order[:args.queries]], vectors[order[args.queries:]]
+    print(f"{len(data):,} vectors x {data.shape[1]}, {len(queries)} queries, recall@{args.k}\n")
+
+    print(f"{'space':<7} {'m':>4} {'ef_c':>5} {'ef_s':>5} {'build':>8} {'recall':>7} {'p50 ms':>7} {'p99 ms':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, (space, m, ef_construction) in enumerate(itertools.product(args.spaces, args.m, args.ef_construction)):
+            truth = exact_top_k(data, queries, args.k, space)
+            start = time.perf_counter()
+            build(tmp, f"sweep_{n}", data, space, m, ef_construction)
+            build_seconds = time.perf_counter() - start
+            for ef_search in args.ef_search:
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    recall, p50, p99 = executor.submit(
+                        measure_queries, tmp, f"sweep_{n}", ef_search, queries, truth, args.k
+                    ).result()
+                print(f"{space:<7} {m:>4} {ef_construction:>5} {ef_search:>5} {build_seconds:>7.1f}s {recall:>7.3f} {p50:>7.2f} {p99:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
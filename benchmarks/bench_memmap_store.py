@@ -0,0 +1,108 @@
+"""
+bench_memmap_store.py
+---------------------
+
+Query path of the two vector store backends over the same vectors: the
+ChromaDB ``VectorStore`` (HNSW, approximate) versus the in-process
+``MemmapVectorStore`` (memory-mapped float32 matrix, exact top-k by matrix
+product + ``argpartition``).
+
+For each backend it reports build time and size on disk, single-query
+latency p50 / p99 with and without a ``movie_id`` filter, batched query
+throughput and recall@k against exact search (1.0 for the memmap store by
+construction).
+
+Vectors are synthetic (unit-norm, clustered by movie) unless
+``--collection`` names an existing collection to copy.
+
+Usage:
+    python -m benchmarks.bench_memmap_store
+    python -m benchmarks.bench_memmap_store --n 500000 --skip-chroma
+    python -m benchmarks.bench_memmap_store --collection cinematch_reviews --path ./data/chroma_db
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from cinematch.processing.memmap_store import MemmapVectorStore
+from cinematch.processing.store import VectorStore
+from benchmarks.bench_hnsw_sweep import exact_top_k, stored_vectors, synthetic_vectors
+
+
+def disk_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def fill(store, data: np.ndarray, movies: int, batch: int):
+    for start in range(0, len(data), batch):
+        rows = range(start, min(start + batch, len(data)))
+        store.add_documents(
+            documents=[f"review {i}" for i in rows],
+            metadatas=[{'movie_id': f"tt{i % movies:07d}", 'row': i} for i in rows],
+            embeddings=data[start:start + batch],
+            ids=[str(i) for i in rows],
+        )
+
+
+def latencies(store, queries: np.ndarray, k: int, where=None) -> np.ndarray:
+    store.query_embeddings(queries[:1], n_results=k, where=where)  # warm up
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        store.query_embeddings(query[None, :], n_results=k, where=where)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def run(name: str, store, path: str, data, queries, truth, args):
+    start = time.perf_counter()
+    fill(store, data, args.movies, args.batch)
+    build_seconds = time.perf_counter() - start
+
+    plain = latencies(store, queries, args.k)
+    filtered = latencies(store, queries, args.k, where={'movie_id': "tt0000007"})
+    start = time.perf_counter()
+    for offset in range(0, len(queries), 64):
+        store.query_embeddings(queries[offset:offset + 64], n_results=args.k)
+    qps = len(queries) / (time.perf_counter() - start)
+
+    found = store.query_embeddings(queries, n_results=args.k)['ids']
+    recall = np.mean([len(set(map(int, ids)) & set(expected.tolist())) / args.k for ids, expected in zip(found, truth)])
+    print(f"{name:<8} {build_seconds:>7.1f}s {disk_size(path) / 2 ** 20:>8.0f} MiB "
+          f"{np.percentile(plain, 50):>7.2f} {np.percentile(plain, 99):>7.2f} "
+          f"{np.percentile(filtered, 50):>7.2f} {np.percentile(filtered, 99):>7.2f} {qps:>8.0f} {recall:>7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ChromaDB vs memory-mapped exact search")
+    parser.add_argument("--n", type=int, default=100_000, help="Synthetic vectors")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--movies", type=int, default=2_000, help="Synthetic movies (clusters and movie_id values)")
+    parser.add_argument("--collection", type=str, help="Copy this existing collection's embeddings instead")
+    parser.add_argument("--path", type=str, default="./data/chroma_db", help="ChromaDB directory of --collection")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=5_000, help="Documents per add_documents call")
+    parser.add_argument("--skip-chroma", action="store_true", help="Only run the memmap store (e.g. for very large --n)")
+    args = parser.parse_args()
+
+    vectors = stored_vectors(args.collection, args.path) if args.collection else synthetic_vectors(args.n, args.dim, args.movies)
+    queries, data = vectors[:args.queries], vectors[args.queries:]
+    truth = exact_top_k(data, queries, args.k, "cosine")
+    print(f"{len(data):,} vectors x {data.shape[1]}, {len(queries)} queries, k={args.k}\n")
+
+    print(f"{'backend':<8} {'build':>8} {'disk':>12} {'p50 ms':>7} {'p99 ms':>7} {'filt p50':>8} {'p99':>6} {'batch q/s':>9} {'recall':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.skip_chroma:
+            path = os.path.join(tmp, "chroma")
+            run("chroma", VectorStore("bench_reviews", persistent_path=path), path, data, queries, truth, args)
+        path = os.path.join(tmp, "memmap")
+        run("memmap", MemmapVectorStore(path), path, data, queries, truth, args)
+
+
+if __name__ == "__main__":
+    main()
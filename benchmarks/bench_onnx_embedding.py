@@ -0,0 +1,93 @@
+"""
+bench_onnx_embedding.py
+-----------------------
+
+Embedding backends on CPU: the PyTorch ``SentenceTransformer`` reference
+versus the same model on ONNX Runtime, in fp32 and int8 (dynamic
+quantization).
+
+For each backend it reports
+
+* batch throughput (reviews/sec at ``--batch-size``),
+* single-query latency p50 / p99 (one text per ``encode`` call, the
+  search path),
+* cosine agreement with the PyTorch vectors for the same texts (mean and
+  minimum), i.e. how interchangeable the vectors are with an index built
+  by the reference model.
+
+Usage:
+    python -m benchmarks.bench_onnx_embedding
+    python -m benchmarks.bench_onnx_embedding --n 5000 --queries 500 --threads 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from cinematch.processing.embedding import EmbeddingModel
+from benchmarks.bench_parallel_embedding import make_reviews
+
+
+def throughput(model: EmbeddingModel, texts, batch_size: int) -> float:
+    model.encode_array(texts[:batch_size], batch_size=batch_size)  # warm up
+    start = time.perf_counter()
+    model.encode_array(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def query_latencies(model: EmbeddingModel, queries) -> np.ndarray:
+    for query in queries[:10]:
+        model.encode_array([query])
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        model.encode_array([query])
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def cosine_agreement(reference: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+    dot = np.sum(reference * embeddings, axis=1)
+    return dot / (np.linalg.norm(reference, axis=1) * np.linalg.norm(embeddings, axis=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PyTorch vs ONNX (fp32/int8) embedding backends")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--n", type=int, default=2000, help="Reviews for the throughput run")
+    parser.add_argument("--queries", type=int, default=300, help="Single-text queries for the latency run")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, help="Torch threads for the reference model")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    texts = make_reviews(args.n)
+    queries = [f"movies like {text[:40]}" for text in texts[:args.queries]]
+
+    variants = [
+        ("torch fp32", dict(backend="torch")),
+        ("onnx fp32", dict(backend="onnx")),
+        ("onnx int8", dict(backend="onnx", quantize=True)),
+    ]
+    reference = None
+    print(f"{'backend':<12} {'reviews/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'cos mean':>9} {'cos min':>9}")
+    for name, kwargs in variants:
+        model = EmbeddingModel(args.model, **kwargs)
+        rate = throughput(model, texts, args.batch_size)
+        latencies = query_latencies(model, queries)
+        embeddings = model.encode_array(texts, batch_size=args.batch_size)
+        if reference is None:
+            reference = embeddings
+        agreement = cosine_agreement(reference, embeddings)
+        print(
+            f"{name:<12} {rate:>10.0f} {np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f} "
+            f"{agreement.mean():>9.5f} {agreement.min():>9.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
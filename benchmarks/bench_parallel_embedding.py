@@ -0,0 +1,74 @@
+"""
+bench_parallel_embedding.py
+---------------------------
+
+Encode throughput of ``ParallelEncoder`` with 1, 2, 4 and 8 worker
+processes, against a single in-process ``SentenceTransformer.encode`` call.
+
+Each configuration encodes the same synthetic reviews; worker start-up
+(spawning and loading the model) is timed separately from encoding, since
+the pipeline pays it once per run. By default the cores are split evenly
+between the workers; pass ``--threads-per-worker`` to pin a fixed count.
+
+Usage:
+    python -m benchmarks.bench_parallel_embedding
+    python -m benchmarks.bench_parallel_embedding --n 20000 --workers 1 2 4 8 --threads-per-worker 1
+"""
+
+import argparse
+import os
+import time
+
+from cinematch.processing.parallel_embedding import ParallelEncoder, load_sentence_transformer
+
+PHRASES = [
+    "The pacing drags in the second act but the finale makes up for it.",
+    "A career-best performance wrapped in a script that never quite lands.",
+    "Gorgeous cinematography, forgettable characters, and a score that carries every scene.",
+    "I went in expecting a popcorn movie and came out thinking about it for days.",
+]
+
+
+def make_reviews(n: int) -> list:
+    return [f"{PHRASES[i % len(PHRASES)]} ({i})" for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-process embedding")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--n", type=int, default=10_000, help="Number of reviews")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads-per-worker", type=int, help="Torch threads per worker (default: cores / workers)")
+    args = parser.parse_args()
+
+    texts = make_reviews(args.n)
+    print(f"{args.n:,} reviews, batch {args.batch_size}, {os.cpu_count()} cores\n")
+
+    model = load_sentence_transformer(args.model, None)
+    model.encode(texts[:args.batch_size], batch_size=args.batch_size)  # warm up
+    start = time.perf_counter()
+    model.encode(texts, batch_size=args.batch_size)
+    baseline = time.perf_counter() - start
+    del model
+
+    print(f"{'workers':>7} {'threads':>7} {'start-up':>9} {'encode':>9} {'reviews/s':>10} {'speedup':>8}")
+    print(f"{'-':>7} {os.cpu_count():>7} {'-':>9} {baseline:>8.2f}s {args.n / baseline:>10.0f} {1:>7.2f}x")
+    for workers in args.workers:
+        start = time.perf_counter()
+        with ParallelEncoder(args.model, workers, args.threads_per_worker) as encoder:
+            # Bring every worker up (and load its model) before timing.
+            encoder.encode(texts[:workers], batch_size=1)
+            startup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            encoder.encode(texts, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{workers:>7} {encoder.threads_per_worker:>7} {startup:>8.2f}s {elapsed:>8.2f}s "
+                f"{args.n / elapsed:>10.0f} {baseline / elapsed:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
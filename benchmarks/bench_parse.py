@@ -0,0 +1,74 @@
+"""
+bench_parse.py
+--------------
+
+Per-page parse time of an IMDb title page: the legacy CSS-selector
+extractors versus the JSON fast path (``IMDbScraperDDGS.parse_movie_page``).
+
+Pages are read from a directory of saved HTML files. The fixture in
+tests/fixtures is used by default; point ``--pages`` at the response cache
+(``data/http_cache/bodies``) to benchmark real downloaded pages.
+
+Usage:
+    python -m benchmarks.bench_parse
+    python -m benchmarks.bench_parse --pages data/http_cache/bodies --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from cinematch.scraper import utils
+from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+
+DEFAULT_PAGES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def time_per_page(parse, pages, repeat: int) -> list:
+    """Return per-page parse times in milliseconds (best of ``repeat``)."""
+    timings = []
+    for content in pages:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(content)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IMDb title page parsing")
+    parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES, help="Directory of saved title pages")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per page (best is kept)")
+    args = parser.parse_args()
+
+    pages = [p.read_bytes() for p in sorted(args.pages.iterdir()) if p.suffix == ".html"]
+    if not pages:
+        print(f"No .html pages found in {args.pages}")
+        return
+
+    scraper = IMDbScraperDDGS()
+    fastest_parser = utils.HTML_PARSER
+
+    variants = [
+        ("selectors (html.parser)", "html.parser", False),
+        (f"selectors ({fastest_parser})", fastest_parser, False),
+        (f"json fast path ({fastest_parser} fallback)", fastest_parser, True),
+    ]
+
+    print(f"Parsing {len(pages)} page(s), best of {args.repeat} runs each\n")
+    print(f"{'variant':<40} {'mean ms':>9} {'median ms':>10} {'max ms':>8}")
+    baseline = None
+    for name, backend, fast in variants:
+        utils.HTML_PARSER = backend
+        timings = time_per_page(lambda c: scraper.parse_movie_page(c, fast=fast), pages, args.repeat)
+        mean = statistics.mean(timings)
+        baseline = baseline or mean
+        print(f"{name:<40} {mean:>9.2f} {statistics.median(timings):>10.2f} {max(timings):>8.2f}  ({baseline / mean:.1f}x)")
+    utils.HTML_PARSER = fastest_parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+bench_streaming.py
+------------------
+
+Corpus ingestion run sequentially (the loop ``run_corpus_pipeline`` used
+before: read and clean a movie, encode its batches, upsert, next movie)
+versus the staged ``ingest_movies`` pipeline, where reading/cleaning,
+encoding and ChromaDB writes overlap in their own threads.
+
+A synthetic corpus of ``--movies`` x ``--reviews`` is written to a temporary
+directory and ingested into a fresh ChromaDB for each variant. The encoder
+is simulated by default (random vectors after sleeping ``--encode-ms`` per
+text, which like PyTorch releases the GIL while it works); pass ``--model``
+to use the real sentence-transformers model. Reports wall time and, for
+the staged run, the per-stage metrics; ``--memory`` also traces peak
+Python memory (tracemalloc slows Python-heavy stages several times over,
+so timings are not comparable with it on).
+
+Usage:
+    python -m benchmarks.bench_streaming
+    python -m benchmarks.bench_streaming --movies 40 --reviews 2000 --queue-size 2
+    python -m benchmarks.bench_streaming --memory
+    python -m benchmarks.bench_streaming --model
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cinematch.processing.pipeline import batched, ingest_movies, iter_movies, sync_movie_records
+from cinematch.processing.store import VectorStore
+from benchmarks.bench_chunking import make_reviews
+
+
+class SyntheticEncoder:
+    def __init__(self, dim: int, encode_ms: float):
+        self.dimension = dim
+        self.encode_ms = encode_ms
+        self.rng = np.random.default_rng(0)
+
+    def chunk(self, texts, overlap=32):
+        return [[text] for text in texts]
+
+    def encode_array(self, texts, batch_size=32):
+        time.sleep(len(texts) * self.encode_ms / 1000)
+        return self.rng.standard_normal((len(texts), self.dimension), dtype=np.float32)
+
+
+def write_corpus(output_dir: str, movies: int, reviews: int):
+    os.makedirs(os.path.join(output_dir, "json"))
+    os.makedirs(os.path.join(output_dir, "csv"))
+    names = []
+    for m in range(movies):
+        name = f"Movie {m}"
+        names.append(name)
+        with open(os.path.join(output_dir, "json", f"imdb_data_Movie_{m}.json"), 'w') as f:
+            json.dump({'imdb_id': f"tt{m:07d}", 'title': name, 'year': 2000}, f)
+        texts = [f"{text} (movie {m}, review {i})" for i, text in enumerate(make_reviews(reviews, seed=m))]
+        pd.DataFrame({'title': "Review", 'content': texts, 'type': "user"}).to_csv(
+            os.path.join(output_dir, "csv", f"imdb_reviews_Movie_{m}.csv"), index=False
+        )
+    return names
+
+
+def sequential(names, output_dir, embed_model, store, batch_size):
+    """The pre-streaming corpus loop: one stage at a time on one thread."""
+    totals = {'movie_ids': set(), 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    chunker = lambda texts: embed_model.chunk(texts)
+    documents, metadatas, embeddings = [], [], []
+    records = (record for movie in iter_movies(names, output_dir)
+               for record in sync_movie_records(*movie, store, totals, chunker=chunker, dedup_threshold=0.8))
+    for batch in batched(records, batch_size):
+        texts = [text for text, _ in batch]
+        documents.extend(texts)
+        metadatas.extend(meta for _, meta in batch)
+        embeddings.append(embed_model.encode_array(texts, batch_size=batch_size))
+        if len(documents) >= store.max_batch_size:
+            store.add_documents(documents=documents, metadatas=metadatas, embeddings=np.concatenate(embeddings))
+            documents, metadatas, embeddings = [], [], []
+    if documents:
+        store.add_documents(documents=documents, metadatas=metadatas, embeddings=np.concatenate(embeddings))
+
+
+def measure(name, trace_memory, func, *args, **kwargs):
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = ""
+    if trace_memory:
+        peak = f" {tracemalloc.get_traced_memory()[1] / 2 ** 20:>10.1f} MiB peak"
+        tracemalloc.stop()
+    print(f"{name:<12} {elapsed:>8.2f}s{peak}")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs staged streaming ingestion")
+    parser.add_argument("--movies", type=int, default=20)
+    parser.add_argument("--reviews", type=int, default=1000, help="Reviews per movie")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queue-size", type=int, default=4)
+    parser.add_argument("--encode-ms", type=float, default=0.5, help="Simulated encode time per review")
+    parser.add_argument("--model", action="store_true", help="Use the real sentence-transformers model")
+    parser.add_argument("--memory", action="store_true", help="Trace peak Python memory (slows the run)")
+    args = parser.parse_args()
+
+    if args.model:
+        from cinematch.processing.embedding import EmbeddingModel
+        embed_model = EmbeddingModel()
+    else:
+        embed_model = SyntheticEncoder(384, args.encode_ms)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        names = write_corpus(output_dir, args.movies, args.reviews)
+        print(f"{args.movies} movies x {args.reviews:,} reviews, batch {args.batch_size}\n")
+
+        store = VectorStore("bench_sequential", persistent_path=os.path.join(tmp, "sequential"))
+        old_seconds, _ = measure("sequential", args.memory, sequential, names, output_dir, embed_model, store, args.batch_size)
+
+        store = VectorStore("bench_streaming", persistent_path=os.path.join(tmp, "streaming"))
+        new_seconds, pipeline = measure(
+            "streaming", args.memory, ingest_movies, names, {}, output_dir,
+            batch_size=args.batch_size, encode_size=args.batch_size, embed_model=embed_model,
+            vector_store=store, queue_size=args.queue_size,
+        )
+        print(f"\nstreaming: {old_seconds / new_seconds:.2f}x faster\n")
+        print(pipeline.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -36,11 +36,11 @@ class RankingService:
     @staticmethod
     def filter_by_score(results: List[Dict], threshold: float = 0.5) -> List[Dict]:
         """
-        Filter out results that are too far (large L2 distance).
-        Note: For L2 distance, lower is better. 
-        So we filter where distance > threshold.
-        Adjust threshold based on empirical testing.
+        Filter out results whose score is below ``threshold``.
+
+        Scores are the cosine similarity of the query and the review
+        (``SearchService`` converts the distance of whichever space the
+        collection uses), so one threshold works for cosine, ip and l2
+        collections alike. Higher is better.
         """
-        # TODO: Calibrate threshold for L2 vs Cosine. 
-        # For now, let's just return all, or implement a soft cut-off.
-        return [r for r in results if r['distance'] < threshold]
+        return [r for r in results if r['score'] >= threshold]
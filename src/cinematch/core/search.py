@@ -1,14 +1,23 @@
 from cinematch.processing.embedding import EmbeddingModel
-from cinematch.processing.store import VectorStore
-from typing import List, Dict
+from cinematch.processing.registry import get_embedding_model, get_vector_store
+from typing import List, Dict, Optional
 
 class SearchService:
     """
     Service to handle semantic search queries against the vector database.
     """
-    def __init__(self):
-        self.embedding_model = EmbeddingModel()
-        self.vector_store = VectorStore()
+    def __init__(self, embedding_model: Optional[EmbeddingModel] = None, vector_store=None):
+        """
+        Args:
+            embedding_model: Query encoder; e.g. ``EmbeddingModel(backend="onnx",
+                quantize=True)`` for lower query latency on CPU. Defaults to
+                the model shared by the whole process.
+            vector_store: Store to search; a ``VectorStore`` (the shared one
+                by default) or a ``MemmapVectorStore`` for in-process exact
+                search.
+        """
+        self.embedding_model = embedding_model or get_embedding_model()
+        self.vector_store = vector_store or get_vector_store()
 
     def search(self, query: str, k: int = 10, filter_criteria: Dict = None) -> List[Dict]:
         """
@@ -22,13 +31,13 @@ class SearchService:
         Returns:
             List of dictionaries containing matched documents and metadata.
         """
-        # 1. Generate embedding for the query
-        query_embedding = self.embedding_model.encode([query])[0]
+        # 1. Generate embedding for the query (a (1, dim) float32 array)
+        query_embedding = self.embedding_model.encode_array([query])
         
         # 2. Query the vector store
         # Note: ChromaDB query returns a specific structure. vector_store.query wrapper returns this.
-        results = self.vector_store.collection.query(
-            query_embeddings=[query_embedding],
+        results = self.vector_store.query_embeddings(
+            query_embedding,
             n_results=k,
             where=filter_criteria
         )
@@ -47,10 +56,7 @@ class SearchService:
         for i in range(len(ids)):
             formatted_results.append({
                 'id': ids[i],
-                'score': 1 - distances[i],  # specific to cosine distance if used, Chroma default is L2 usually, need to check distance metric. Assuming L2 roughly maps to distance. 
-                                          # Ideally we'd configure cosine similarity. For L2, smaller is better.
-                                          # Let's just return distance for now or invert if we know the metric. 
-                                          # Default Chroma is L2 (Squared Euclidean). 0 is exact match.
+                'score': self.vector_store.score(distances[i]),  # cosine similarity, whatever the collection's space
                 'distance': distances[i],
                 'metadata': metadatas[i],
                 'content': documents[i]
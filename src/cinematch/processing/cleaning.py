@@ -1,5 +1,17 @@
 import re
 import html
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_URL_RE = re.compile(r'http\S+|www.\S+')
+
+# RE2 (Arrow) versions of the patterns above. RE2's \s/\S are ASCII-only, so
+# the non-space class spells out what Python's Unicode \s also matches.
+_WS_CLASS = r'\s\x0b\x1c-\x1f\x{85}\p{Z}'
+_TAG_RE2 = r'<[^>]+>'
+_URL_RE2 = rf'http[^{_WS_CLASS}]+|www.[^{_WS_CLASS}]+'
 
 def clean_text(text: str) -> str:
     """
@@ -15,23 +27,171 @@ def clean_text(text: str) -> str:
         return ""
     
     # Decode HTML entities (e.g., &quot; -> ")
-    text = html.unescape(text)
+    if '&' in text:
+        text = html.unescape(text)
     
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', ' ', text)
+    if '<' in text:
+        text = _TAG_RE.sub(' ', text)
     
     # Remove URLs
-    text = re.sub(r'http\S+|www.\S+', '', text)
-    
-    # Remove multiple spaces/newlines
-    text = re.sub(r'\s+', ' ', text).strip()
+    if 'http' in text or 'www' in text:
+        text = _URL_RE.sub('', text)
     
-    return text
+    # Remove multiple spaces/newlines (str.split() splits on the same
+    # Unicode whitespace as \s and drops both ends)
+    return ' '.join(text.split())
+
+def _arrow():
+    """(pyarrow, pyarrow.compute), or None when pyarrow is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return None
+    return pa, pc
+
+def _as_text(value) -> str:
+    if isinstance(value, str):
+        return value
+    if value is None or value != value:  # None / NaN
+        return ""
+    return str(value)
+
+def _clean_arrow(column) -> List[str]:
+    pa, pc = _arrow()
+    column = pc.fill_null(column.cast(pa.large_string()), "")
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+
+    # Entities have no Arrow kernel; unescape just the rows that contain one.
+    has_entity = pc.match_substring(column, '&')
+    if pc.any(has_entity).as_py():
+        values = column.to_pylist()
+        for i in pc.indices_nonzero(has_entity).to_pylist():
+            values[i] = html.unescape(values[i])
+        column = pa.array(values, type=pa.large_string())
+
+    column = pc.replace_substring_regex(column, _TAG_RE2, ' ')
+    column = pc.replace_substring_regex(column, _URL_RE2, '')
+    return [' '.join(text.split()) for text in column.to_pylist()]
+
+def _clean_chunk(texts: List) -> List[str]:
+    texts = [_as_text(text) for text in texts]
+    arrow = _arrow()
+    if arrow:
+        pa, _ = arrow
+        return _clean_arrow(pa.array(texts, type=pa.large_string()))
+    return [clean_text(text) for text in texts]
+
+def clean_texts(texts: Sequence[str], workers: int = 1, chunk_size: int = 50_000) -> List[str]:
+    """
+    Clean a whole column of texts at once; same output as ``clean_text`` per item.
+
+    With pyarrow installed the tag and URL patterns run as Arrow regex
+    kernels over the column and entities are decoded only where an ``&``
+    occurs. Missing values (None/NaN) become "" and other non-strings
+    are converted with ``str``.
+
+    Args:
+        texts: A pandas Series, pyarrow Array/ChunkedArray or list of strings.
+        workers: Processes to spread chunks over (for very large columns).
+        chunk_size: Texts per chunk when ``workers`` > 1.
+
+    Returns:
+        Cleaned strings, in input order.
+    """
+    arrow = _arrow()
+    pd = sys.modules.get('pandas')  # a Series can only come from an already imported pandas
+    if arrow and pd is not None and isinstance(texts, pd.Series):
+        # String Series are Arrow-backed (or cheaply converted); anything
+        # else takes the per-item path below.
+        pa = arrow[0]
+        try:
+            column = pa.array(texts, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            column = None
+        if column is not None and (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            texts = column
+
+    if arrow and isinstance(texts, (arrow[0].Array, arrow[0].ChunkedArray)):
+        if workers <= 1 or len(texts) <= chunk_size:
+            return _clean_arrow(texts)
+        texts = texts.to_pylist()
+    else:
+        texts = list(texts)
+
+    if workers <= 1 or len(texts) <= chunk_size:
+        return _clean_chunk(texts)
+
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    cleaned = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(_clean_chunk, chunks):
+            cleaned.extend(part)
+    return cleaned
+
+def plain_tokenizer(tokenizer):
+    """
+    Private copy of a tokenizer's backend, with truncation and padding off.
+
+    Hugging Face fast tokenizers leave the truncation/padding of their last
+    call set on the shared backend, so the original is never used (or
+    mutated) directly.
+    """
+    from tokenizers import Tokenizer
+
+    tokenizer = getattr(tokenizer, 'backend_tokenizer', tokenizer)
+    plain = Tokenizer.from_str(tokenizer.to_str())
+    plain.no_truncation()
+    plain.no_padding()
+    return plain
+
+def chunk_by_tokens(texts: List[str], tokenizer, max_tokens: int = 254, overlap: int = 32) -> List[List[str]]:
+    """
+    Split texts into chunks that fit the model's own token limit.
+
+    Chunks are slices of the original text covering at most ``max_tokens``
+    word-pieces, and consecutive chunks share ``overlap`` tokens so that no
+    sentence loses its context at a boundary.
+
+    Args:
+        texts: Cleaned texts.
+        tokenizer: A ``tokenizers.Tokenizer`` or a Hugging Face fast
+            tokenizer (e.g. ``SentenceTransformer.tokenizer``); pass the
+            result of ``plain_tokenizer`` when calling repeatedly.
+        max_tokens: Word-pieces per chunk, excluding special tokens.
+        overlap: Word-pieces repeated at the start of the next chunk.
+
+    Returns:
+        The chunks of each text (one chunk for texts that already fit,
+        none for empty texts).
+    """
+    if not 0 <= overlap < max_tokens:
+        raise ValueError(f"overlap must be in [0, max_tokens), got {overlap} for max_tokens={max_tokens}")
+    tokenizer = getattr(tokenizer, 'backend_tokenizer', tokenizer)
+    if tokenizer.truncation is not None or tokenizer.padding is not None:
+        tokenizer = plain_tokenizer(tokenizer)
+    step = max_tokens - overlap
+
+    chunks = []
+    for text, encoding in zip(texts, tokenizer.encode_batch(texts, add_special_tokens=False)):
+        offsets = encoding.offsets
+        if len(offsets) <= max_tokens:
+            chunks.append([text] if text.strip() else [])
+            continue
+        pieces = []
+        for start in range(0, len(offsets) - overlap, step):
+            end = min(start + max_tokens, len(offsets))
+            pieces.append(text[offsets[start][0]:offsets[end - 1][1]])
+        chunks.append(pieces)
+    return chunks
 
 def chunk_text(text: str, max_words: int = 500) -> list[str]:
     """
     Splits text into smaller chunks for embedding models that have token limits.
-    Simple word-based chunking.
+    Simple word-based chunking; ``chunk_by_tokens`` follows the model's
+    actual limit.
     """
     words = text.split()
     chunks = []
@@ -0,0 +1,162 @@
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+_WORD_RE = re.compile(r'\w+')
+
+# splitmix64 finalizer constants; multiplication wraps modulo 2**64.
+_MIX1 = np.uint64(0xbf58476d1ce4e5b9)
+_MIX2 = np.uint64(0x94d049bb133111eb)
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    values = (values ^ (values >> np.uint64(30))) * _MIX1
+    values = (values ^ (values >> np.uint64(27))) * _MIX2
+    return values ^ (values >> np.uint64(31))
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) splitting ``num_perm`` so the LSH S-curve turns at ``threshold``.
+
+    Two signatures become candidates when any band of ``rows`` values
+    matches exactly; the similarity where that is a coin flip is about
+    ``(1 / bands) ** (1 / rows)``.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles.
+
+    The fraction of positions where two signatures agree estimates the
+    Jaccard similarity of the two texts' shingle sets.
+    """
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Args:
+            num_perm: Hash functions per signature (more is more precise).
+            shingle_size: Words per shingle.
+            seed: Seed of the hash functions; signatures are only comparable
+                between hashers with the same settings.
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seeds = np.random.default_rng(seed).integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-bit hashes of the text's lowercased word shingles (the whole text if it is shorter than one)."""
+        words = _WORD_RE.findall(text.lower())
+        size = min(self.shingle_size, len(words))
+        if size == 0:
+            return np.empty(0, dtype=np.uint64)
+        shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """The text's MinHash signature, or None when it has no words."""
+        shingles = self.shingles(text)
+        if not len(shingles):
+            return None
+        return _mix(shingles[:, None] ^ self.seeds[None, :]).min(axis=0)
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures.
+
+    Each signature is cut into ``bands`` bands; signatures sharing any
+    band land in the same bucket and are returned as candidates.
+    """
+    def __init__(self, num_perm: int = 128, threshold: float = 0.8):
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+
+    def insert(self, key: int, signature: np.ndarray) -> List[int]:
+        """Add a signature and return the keys already sharing a bucket with it."""
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            bucket = buckets[signature[band * self.rows:(band + 1) * self.rows].tobytes()]
+            candidates.update(bucket)
+            bucket.append(key)
+        return sorted(candidates)
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+def near_duplicate_clusters(
+    texts: List[str],
+    threshold: float = 0.8,
+    hasher: Optional[MinHasher] = None,
+) -> List[List[int]]:
+    """
+    Group texts whose estimated Jaccard similarity reaches ``threshold``.
+
+    LSH candidates are confirmed on the full signatures before they are
+    merged; clusters are transitive (A~B and B~C puts A, B and C together).
+
+    Args:
+        texts: Cleaned texts.
+        threshold: Minimum estimated shingle Jaccard similarity.
+        hasher: MinHasher to use (128 permutations, 5-word shingles by default).
+
+    Returns:
+        Clusters of positions into ``texts``, each sorted, in order of
+        their first member; every text is in exactly one cluster.
+    """
+    hasher = hasher or MinHasher()
+    index = LSHIndex(hasher.num_perm, threshold)
+    parents = list(range(len(texts)))
+    signatures = {}
+
+    for i, text in enumerate(texts):
+        signature = hasher.signature(text)
+        if signature is None:
+            continue  # nothing to compare; stays on its own
+        for j in index.insert(i, signature):
+            if np.mean(signatures[j] == signature) >= threshold:
+                root_i, root_j = _find(parents, i), _find(parents, j)
+                if root_i != root_j:
+                    parents[max(root_i, root_j)] = min(root_i, root_j)
+        signatures[i] = signature
+
+    clusters = defaultdict(list)
+    for i in range(len(texts)):
+        clusters[_find(parents, i)].append(i)
+    return list(clusters.values())
+
+def dedupe_records(
+    records: List[Tuple[str, Dict]],
+    threshold: float = 0.8,
+    hasher: Optional[MinHasher] = None,
+) -> Tuple[List[Tuple[str, Dict]], Dict[str, int]]:
+    """
+    Keep one representative per cluster of near-duplicate reviews.
+
+    The representative is the longest text of its cluster (the first on
+    ties); its metadata gains ``duplicate_count``, the number of reviews
+    it stands in for besides itself.
+
+    Returns:
+        The kept records in input order, and counts of reviews, kept
+        reviews, dropped duplicates and dropped characters.
+    """
+    texts = [text for text, _ in records]
+    kept = []
+    for cluster in near_duplicate_clusters(texts, threshold, hasher):
+        representative = max(cluster, key=lambda i: (len(texts[i]), -i))
+        kept.append((representative, len(cluster) - 1))
+    kept.sort()
+
+    kept_chars = sum(len(texts[i]) for i, _ in kept)
+    deduped = [(texts[i], {**records[i][1], "duplicate_count": duplicates}) for i, duplicates in kept]
+    stats = {
+        'reviews': len(records),
+        'kept': len(kept),
+        'duplicates': len(records) - len(kept),
+        'chars_saved': sum(len(text) for text in texts) - kept_chars,
+    }
+    return deduped, stats
@@ -1,29 +1,261 @@
-from sentence_transformers import SentenceTransformer
-from typing import List
+import time
+import numpy as np
+from functools import partial
+from typing import Dict, List, Optional
+from cinematch.processing.cleaning import chunk_by_tokens, plain_tokenizer
+from cinematch.processing.embedding_cache import EmbeddingCache
+from cinematch.processing.onnx_backend import load_onnx_model
+from cinematch.processing.parallel_embedding import ParallelEncoder, load_sentence_transformer
+
+def length_batches(lengths: np.ndarray, batch_size: int, max_batch_tokens: Optional[int] = None) -> List[np.ndarray]:
+    """
+    Group text positions into batches of similar token length.
+
+    Positions are sorted by length and cut into consecutive batches, so each
+    batch is padded only up to lengths close to its own. With
+    ``max_batch_tokens`` a batch also stops growing once ``len(batch) *
+    longest`` would exceed it, which lets short texts go in larger batches.
+
+    Returns:
+        Arrays of positions into ``lengths``, one per batch.
+    """
+    order = np.argsort(lengths, kind='stable')
+    if max_batch_tokens is None:
+        return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+    batches, start = [], 0
+    for end in range(1, len(order) + 1):
+        # Sorted ascending, so the newest item is the longest in the batch.
+        too_big = (end - start) * lengths[order[end - 1]] > max_batch_tokens
+        if end - start > batch_size or (too_big and end - start > 1):
+            batches.append(order[start:end - 1])
+            start = end - 1
+    batches.append(order[start:])
+    return batches
 
 class EmbeddingModel:
     """
     Wrapper for sentence-transformers model to generate text embeddings.
     """
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        cache: Optional[EmbeddingCache] = None,
+        workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        backend: str = "torch",
+        quantize: bool = False,
+        max_batch_tokens: Optional[int] = None,
+    ):
         """
         Initialize the embedding model.
         Args:
             model_name: The name of the HuggingFace model to use.
+            cache: Optional embedding cache consulted before encoding, so
+                unchanged texts are never embedded twice.
+            workers: Worker processes for batches larger than one forward
+                pass (1 encodes in this process).
+            threads_per_worker: Torch threads per worker process (the cores
+                are split evenly by default).
+            backend: "torch" (full-precision PyTorch) or "onnx" (ONNX
+                Runtime on CPU, same vectors up to float rounding). Falls
+                back to "torch" when onnxruntime or the ONNX model is
+                unavailable.
+            quantize: With the ONNX backend, use the int8 dynamically
+                quantized model.
+            max_batch_tokens: Optional cap on padded tokens per batch. Inputs
+                larger than one batch are then tokenized once up front and
+                cut into token-budgeted batches (short texts go in larger
+                batches than ``batch_size``); otherwise each call is a single
+                ``SentenceTransformer.encode``, which sorts by length itself.
+        """
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        if quantize and backend != "onnx":
+            raise ValueError("Quantization requires the onnx backend")
+
+        print(f"Loading embedding model: {model_name} ({backend}{', int8' if quantize else ''})...")
+        self.model_name = model_name
+        self.backend = backend
+        self.quantize = quantize
+        self.model = None
+        if backend == "onnx":
+            try:
+                self.model = load_onnx_model(model_name, quantize=quantize)
+            except (ImportError, OSError) as e:
+                print(f"⚠️ ONNX backend unavailable ({e}); falling back to torch.")
+                # The cache keys off these, so fp32 vectors are not filed as int8.
+                self.backend = "torch"
+                self.quantize = False
+        if self.model is None:
+            # Imported here so that importing this module does not load torch.
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name)
+        self.cache = cache
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.max_batch_tokens = max_batch_tokens
+        self._pool: Optional[ParallelEncoder] = None
+        self._plain_tokenizer = None
+        self._stats = {'texts': 0, 'tokens': 0, 'padded_tokens': 0, 'seconds': 0.0, 'token_seconds': 0.0}
+
+    @property
+    def cache_name(self) -> str:
+        """Model name the cache files vectors under; int8 vectors are kept apart."""
+        return f"{self.model_name}@int8" if self.quantize else self.model_name
+
+    @property
+    def dimension(self) -> int:
+        """Length of the embedding vectors."""
+        return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def tokenizer(self):
+        """The model's own (fast) tokenizer."""
+        return self.model.tokenizer
+
+    @property
+    def max_tokens(self) -> int:
+        """Word-pieces the model reads per text, excluding [CLS]/[SEP]; the rest is truncated."""
+        return self.model.max_seq_length - 2
+
+    def _tokenizer_copy(self):
+        if self._plain_tokenizer is None:
+            self._plain_tokenizer = plain_tokenizer(self.tokenizer)
+        return self._plain_tokenizer
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        """Tokens the model actually processes per text (special tokens included, truncation applied)."""
+        encodings = self._tokenizer_copy().encode_batch(texts)
+        return np.minimum([len(encoding.ids) for encoding in encodings], self.model.max_seq_length)
+
+    def chunk(self, texts: List[str], overlap: int = 32) -> List[List[str]]:
+        """Split each text into chunks that fit the model without truncation (see ``chunk_by_tokens``)."""
+        return chunk_by_tokens(texts, self._tokenizer_copy(), max_tokens=self.max_tokens, overlap=overlap)
+
+    def encode_stats(self) -> Dict[str, float]:
+        """
+        Texts encoded so far and texts per second.
+
+        Real and padded tokens (and tokens per second) are only counted for
+        token-budgeted batches, the one path that tokenizes up front.
+        """
+        stats = dict(self._stats)
+        stats['texts_per_sec'] = stats['texts'] / stats['seconds'] if stats['seconds'] else 0.0
+        stats['tokens_per_sec'] = stats['tokens'] / stats['token_seconds'] if stats['token_seconds'] else 0.0
+        stats['padding'] = 1 - stats['tokens'] / stats['padded_tokens'] if stats['padded_tokens'] else 0.0
+        return stats
+
+    def encode_array(self, texts: List[str], batch_size: int = 32, normalize: bool = False) -> np.ndarray:
         """
-        print(f"Loading embedding model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
+        Generate embeddings as one contiguous float32 matrix.
+
+        Prefer this over ``encode``: a 384-dim vector is 1.5 KB here versus
+        roughly 10x that as a list of Python floats, and the store takes
+        the array as is.
+
+        Args:
+            texts: List of strings to embed.
+            batch_size: Number of texts the model processes per forward pass.
+            normalize: L2-normalize each vector (dot product == cosine similarity).
+
+        Returns:
+            Array of shape (len(texts), dimension), dtype float32.
+        """
+        if self.cache is None:
+            return self._encode_model(texts, batch_size, normalize)
+
+        # The cache holds raw vectors; normalization is applied on the way out.
+        found, missing = self.cache.get(self.cache_name, texts)
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        if found:
+            positions = list(found)
+            embeddings[positions] = np.stack([found[i] for i in positions])
+        if missing:
+            # Duplicate texts within the batch are encoded once.
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = self._encode_model(unique, batch_size, normalize=False)
+            self.cache.put(self.cache_name, unique, encoded)
+            row_of = {text: row for row, text in enumerate(unique)}
+            embeddings[missing] = encoded[[row_of[texts[i]] for i in missing]]
+        if normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms == 0, 1, norms)
+        return embeddings
+
+    def _token_budget_batches(self, texts: List[str], batch_size: int) -> Optional[List[np.ndarray]]:
+        # SentenceTransformer.encode already sorts by length, so own batches
+        # only pay for the extra tokenization when a token cap can grow them.
+        if self.max_batch_tokens is None or len(texts) <= batch_size:
+            return None
+        lengths = self.token_lengths(texts)
+        batches = length_batches(lengths, batch_size, self.max_batch_tokens)
+        self._stats['tokens'] += int(lengths.sum())
+        self._stats['padded_tokens'] += int(sum(lengths[batch].max() * len(batch) for batch in batches))
+        return batches
+
+    def _encode_model(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        start = time.perf_counter()
+        batches = self._token_budget_batches(texts, batch_size)
+
+        if self.workers > 1 and len(texts) > batch_size:
+            if self._pool is None:
+                print(f"Starting {self.workers} embedding worker processes...")
+                loader = partial(load_sentence_transformer, backend=self.backend, quantize=self.quantize)
+                self._pool = ParallelEncoder(self.model_name, self.workers, self.threads_per_worker, loader=loader)
+            # Shards are contiguous, so sending the texts in batch order keeps
+            # each worker's batches length-homogeneous.
+            order = np.concatenate(batches) if batches is not None else np.arange(len(texts))
+            embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+            embeddings[order] = self._pool.encode([texts[i] for i in order], batch_size=batch_size)
+            if normalize:
+                embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        elif batches is None:
+            embeddings = np.ascontiguousarray(self.model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=normalize,
+            ), dtype=np.float32)
+        else:
+            embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+            for batch in batches:
+                embeddings[batch] = self.model.encode(
+                    [texts[i] for i in batch],
+                    batch_size=len(batch),
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize,
+                )
+
+        elapsed = time.perf_counter() - start
+        self._stats['texts'] += len(texts)
+        self._stats['seconds'] += elapsed
+        if batches is not None:
+            self._stats['token_seconds'] += elapsed
+        return embeddings
+
+    def close(self):
+        """Stop the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def cache_stats(self) -> Optional[dict]:
+        """Cache hit/miss counts, or None when no cache is attached."""
+        return self.cache.stats() if self.cache else None
 
-    def encode(self, texts: List[str]) -> List[List[float]]:
+    def encode(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """
         Generate embeddings for a list of texts.
         
         Args:
             texts: List of strings to embed.
+            batch_size: Number of texts the model processes per forward pass.
             
         Returns:
             List of embedding vectors (list of floats).
         """
         # Convert numpy array to list for JSON serialization compatibility if needed
-        embeddings = self.model.encode(texts)
-        return embeddings.tolist()
+        return self.encode_array(texts, batch_size=batch_size).tolist()
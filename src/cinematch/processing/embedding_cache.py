@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+def text_key(text: str) -> str:
+    """Content address of a cleaned text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """
+    On-disk cache of embeddings keyed by (model name, hash of the text).
+
+    Vectors live in one memory-mapped float32 matrix per model; a SQLite
+    index maps each key to its row and records when it was last used, so
+    the least recently used entries can be evicted once ``max_entries`` is
+    exceeded. Evicted rows are reused by later inserts.
+    """
+    def __init__(self, path: str = "./data/embedding_cache", max_entries: Optional[int] = None):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            path: Directory holding ``index.sqlite`` and the ``*.f32`` matrices.
+            max_entries: Maximum number of cached vectors across all models
+                (unbounded by default).
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, np.memmap] = {}
+        self._db = sqlite3.connect(os.path.join(path, "index.sqlite"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS models (
+                model TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                capacity INTEGER NOT NULL,
+                next_row INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                model TEXT NOT NULL,
+                key TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, key)
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS free_rows (model TEXT NOT NULL, row INTEGER NOT NULL)")
+
+    def _file(self, model: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(model.encode('utf-8')).hexdigest()[:16] + ".f32")
+
+    def _matrix(self, model: str) -> Optional[np.memmap]:
+        """Memory map of a model's vectors (None before anything is stored for it)."""
+        if model not in self._matrices:
+            row = self._db.execute("SELECT dim, capacity FROM models WHERE model = ?", (model,)).fetchone()
+            if row is None:
+                return None
+            dim, capacity = row
+            self._matrices[model] = np.memmap(self._file(model), dtype=np.float32, mode='r+', shape=(capacity, dim))
+        return self._matrices[model]
+
+    def _allocate(self, model: str, dim: int, n: int) -> List[int]:
+        """Rows for ``n`` new vectors: evicted rows first, then fresh rows (growing the file)."""
+        row = self._db.execute("SELECT dim, capacity, next_row FROM models WHERE model = ?", (model,)).fetchone()
+        if row is None:
+            row = (dim, 0, 0)
+            self._db.execute("INSERT INTO models VALUES (?, ?, 0, 0)", (model, dim))
+        stored_dim, capacity, next_row = row
+        if stored_dim != dim:
+            raise ValueError(f"Cached vectors for {model} have dimension {stored_dim}, got {dim}")
+
+        free = [r for (r,) in self._db.execute(
+            "SELECT row FROM free_rows WHERE model = ? ORDER BY row LIMIT ?", (model, n)
+        )]
+        if free:
+            self._db.execute(
+                f"DELETE FROM free_rows WHERE model = ? AND row IN ({','.join('?' * len(free))})", (model, *free)
+            )
+        fresh = list(range(next_row, next_row + n - len(free)))
+        next_row += len(fresh)
+
+        if next_row > capacity:
+            capacity = max(next_row, capacity * 2, 1024)
+            self._matrices.pop(model, None)
+            with open(self._file(model), 'ab') as f:
+                f.truncate(capacity * dim * 4)
+        self._db.execute("UPDATE models SET capacity = ?, next_row = ? WHERE model = ?", (capacity, next_row, model))
+        return free + fresh
+
+    def _rows(self, model: str, keys) -> Dict[str, int]:
+        """Rows of the cached ``keys`` (queried in chunks below SQLite's variable limit)."""
+        keys = list(keys)
+        rows = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows.update(self._db.execute(
+                f"SELECT key, row FROM entries WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                (model, *chunk),
+            ).fetchall())
+        return rows
+
+    def get(self, model: str, texts: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            model: Embedding model name.
+            texts: Cleaned texts.
+
+        Returns:
+            A mapping from position in ``texts`` to its cached vector, and
+            the positions that missed.
+        """
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            matrix = self._matrix(model)
+            rows = self._rows(model, set(keys)) if matrix is not None else {}
+            if rows:
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE model = ? AND key = ?",
+                    [(time.time(), model, key) for key in rows],
+                )
+            found = {i: np.array(matrix[rows[key]]) for i, key in enumerate(keys) if key in rows}
+            missing = [i for i, key in enumerate(keys) if key not in rows]
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put(self, model: str, texts: List[str], embeddings: np.ndarray):
+        """Store one vector per text (texts already cached are refreshed in place)."""
+        vectors = {}
+        for text, vector in zip(texts, np.asarray(embeddings, dtype=np.float32)):
+            vectors[text_key(text)] = vector
+        if not vectors:
+            return
+        dim = len(next(iter(vectors.values())))
+        with self._lock:
+            existing = self._rows(model, vectors)
+            new_keys = [key for key in vectors if key not in existing]
+            rows = dict(existing)
+            rows.update(zip(new_keys, self._allocate(model, dim, len(new_keys))))
+            # Vectors hit the disk before the index points at them.
+            matrix = self._matrix(model)
+            order = list(rows)
+            matrix[[rows[key] for key in order]] = np.stack([vectors[key] for key in order])
+            matrix.flush()
+
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (model, key, row, last_used) VALUES (?, ?, ?, ?)",
+                [(model, key, rows[key], time.time()) for key in order],
+            )
+            self._db.execute("COMMIT")
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries beyond ``max_entries``."""
+        if self.max_entries is None:
+            return
+        (count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        victims = self._db.execute(
+            "SELECT model, key, row FROM entries ORDER BY last_used LIMIT ?", (excess,)
+        ).fetchall()
+        self._db.execute("BEGIN")
+        self._db.executemany("DELETE FROM entries WHERE model = ? AND key = ?", [(m, k) for m, k, _ in victims])
+        self._db.executemany("INSERT INTO free_rows (model, row) VALUES (?, ?)", [(m, r) for m, _, r in victims])
+        self._db.execute("COMMIT")
+        self.evictions += len(victims)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counts since the cache was opened."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self),
+        }
+
+    def close(self):
+        with self._lock:
+            for matrix in self._matrices.values():
+                matrix.flush()
+            self._matrices.clear()
+            self._db.close()
@@ -0,0 +1,473 @@
+import fcntl
+import json
+import math
+import os
+import numpy as np
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Set
+from cinematch.processing.store import SPACES, Embeddings, _first_occurrences, _movie_id, _same_metadata, distance_to_score, document_id
+
+_ID = "__id"
+_DOCUMENT = "__document"
+
+class MemmapVectorStore:
+    """
+    In-process exact-search store: a memory-mapped float32 matrix plus an
+    Arrow sidecar for IDs, documents and metadata.
+
+    Queries are a BLAS matrix product over every stored vector followed by
+    ``argpartition``, so results are exact and there is no index to build
+    or tune. Rows are append-only: re-adding an ID writes a new row and
+    retires the old one, and each ``add_documents`` call writes one Arrow
+    segment, so writes never rewrite what is already stored. Processes that
+    open the same directory read-only share the matrix's pages through the
+    OS page cache.
+
+    Every write is committed by replacing ``manifest.json``, which bumps
+    its ``generation``. A row records the generation that retired it, so a
+    reader sees exactly the rows of the manifest it loaded, and a write
+    interrupted before its manifest neither loses nor retires anything.
+    Writers (in any process) are serialized by a lock on ``write.lock``.
+
+    Offers the ``VectorStore`` interface (``add_documents``, ``query``,
+    ``query_embeddings``, ``count``, ``peek``, ``score``, ``diff_documents``,
+    ``apply_diff``, ``delete``, ``movie_ids``) with results in Chroma's
+    shape, so ``SearchService`` and the ingestion pipeline can use either.
+    """
+    def __init__(
+        self,
+        path: str = "./data/memmap_store",
+        space: Optional[str] = None,
+        read_only: bool = False,
+        embedding_function: Optional[Callable[[List[str]], Embeddings]] = None,
+        query_chunk_rows: int = 1 << 18,
+    ):
+        """
+        Open (or create) a store directory.
+
+        Args:
+            path: Directory holding ``vectors.f32``, ``norms.f32``,
+                ``retired.u32``, ``manifest.json`` and ``segments/*.arrow``.
+            space: Distance of a new store: "cosine" (default), "ip" or
+                "l2"; an existing store keeps its own.
+            read_only: Open for querying only (e.g. in worker processes).
+            embedding_function: Turns query texts into vectors, for ``query``.
+            query_chunk_rows: Rows scored per matrix product, which bounds
+                the score buffer for large stores.
+        """
+        if space is not None and space not in SPACES:
+            raise ValueError(f"Unknown distance space: {space} (expected one of {', '.join(SPACES)})")
+        self.path = path
+        self.read_only = read_only
+        self.embedding_function = embedding_function
+        self.query_chunk_rows = query_chunk_rows
+        if not read_only:
+            os.makedirs(os.path.join(path, "segments"), exist_ok=True)
+
+        manifest_path = os.path.join(path, "manifest.json")
+        if os.path.exists(manifest_path):
+            self.manifest = self._read_manifest()
+            if space is not None and space != self.manifest['space']:
+                raise ValueError(f"Store {path} already exists with space={self.manifest['space']}")
+        elif read_only:
+            raise FileNotFoundError(f"No memmap store at {path}")
+        else:
+            self.manifest = {'space': space or "cosine", 'dim': None, 'rows': 0, 'capacity': 0, 'segments': 0, 'generation': 0}
+        self._open()
+        print(f"Opened memmap vector store: {path} ({self.space}, {self.count()} documents)")
+
+    # Layout
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_manifest(self) -> Dict:
+        with open(self._file("manifest.json")) as f:
+            manifest = json.load(f)
+        if 'generation' not in manifest:
+            raise ValueError(f"Store {self.path} uses an older layout; rebuild it (e.g. with MemmapVectorStore.from_vector_store)")
+        return manifest
+
+    def _open(self):
+        """Map the matrices and load the sidecar segments listed in the manifest."""
+        import pyarrow as pa
+
+        rows, capacity, dim = self.manifest['rows'], self.manifest['capacity'], self.manifest['dim']
+        mode = 'r' if self.read_only else 'r+'
+        if capacity:
+            self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode=mode, shape=(capacity, dim))
+            self._norms = np.memmap(self._file("norms.f32"), dtype=np.float32, mode=mode, shape=(capacity,))
+            self._retired = np.memmap(self._file("retired.u32"), dtype=np.uint32, mode=mode, shape=(capacity,))
+        else:
+            self._vectors = np.empty((0, dim or 0), dtype=np.float32)
+            self._norms = np.empty(0, dtype=np.float32)
+            self._retired = np.empty(0, dtype=np.uint32)
+
+        tables = []
+        for segment in range(self.manifest['segments']):
+            source = pa.memory_map(self._file(os.path.join("segments", f"{segment:06d}.arrow")))
+            tables.append(pa.ipc.open_file(source).read_all())
+        self._table = pa.concat_tables(tables, promote_options="permissive") if tables else None
+        ids = self._table.column(_ID).to_pylist() if tables else []
+        live = self._live_mask()
+        # Later rows win: they replaced earlier ones with the same ID.
+        self._rows = {id_: row for row, id_ in enumerate(ids[:rows]) if live[row]}
+
+    def _live_mask(self) -> np.ndarray:
+        """Rows live in this manifest: never retired, or retired by a write it does not include yet."""
+        retired = self._retired[:self.manifest['rows']]
+        return (retired == 0) | (retired > self.manifest['generation'])
+
+    def _grow(self, rows: int, dim: int):
+        capacity = self.manifest['capacity']
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, 1024)
+        for name, width in (("vectors.f32", dim * 4), ("norms.f32", 4), ("retired.u32", 4)):
+            with open(self._file(name), 'ab') as f:
+                f.truncate(capacity * width)
+        self.manifest['capacity'] = capacity
+        self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode='r+', shape=(capacity, dim))
+        self._norms = np.memmap(self._file("norms.f32"), dtype=np.float32, mode='r+', shape=(capacity,))
+        self._retired = np.memmap(self._file("retired.u32"), dtype=np.uint32, mode='r+', shape=(capacity,))
+
+    def _write_manifest(self):
+        tmp = self._file("manifest.json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self._file("manifest.json"))
+
+    def refresh(self):
+        """Pick up documents added by another process since this store was opened."""
+        self.manifest = self._read_manifest()
+        self._open()
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the store's write lock, up to date with the last committed write.
+
+        Yields the generation the write commits as. Retirements tagged with
+        a later generation were left by a write that never committed its
+        manifest and are undone first.
+        """
+        if self.read_only:
+            raise PermissionError(f"Memmap store {self.path} was opened read-only")
+        with open(self._file("write.lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(self._file("manifest.json")):
+                    committed = self._read_manifest()
+                    if committed['generation'] != self.manifest['generation']:
+                        self.manifest = committed
+                        self._open()
+                generation = self.manifest['generation'] + 1
+                stray = np.flatnonzero(self._retired >= generation)
+                if len(stray):
+                    self._retired[stray] = 0
+                    self._retired.flush()
+                yield generation
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _retire(self, rows: List[int], generation: int):
+        # Readers of older manifests keep seeing these rows until they refresh.
+        if rows:
+            self._retired[rows] = generation
+            self._retired.flush()
+
+    # VectorStore interface
+
+    @property
+    def space(self) -> str:
+        return self.manifest['space']
+
+    @property
+    def max_batch_size(self) -> int:
+        """Documents per ``add_documents`` call the pipeline should aim for (one sidecar segment each)."""
+        return 50_000
+
+    def score(self, distance: float) -> float:
+        """Similarity score of a distance returned by this store (see ``distance_to_score``)."""
+        return distance_to_score(distance, self.space)
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return len(self._rows)
+
+    def add_documents(self, documents: List[str], metadatas: List[Dict], embeddings: Optional[Embeddings] = None, ids: Optional[List[str]] = None):
+        """
+        Add documents; an ID that is already stored is replaced.
+
+        Args:
+            documents: List of text content.
+            metadatas: List of metadata dictionaries.
+            embeddings: Vectors for the documents (computed with the
+                ``embedding_function`` when omitted).
+            ids: Optional list of unique IDs (``document_id(movie_id, text)``
+                by default, as in ``VectorStore``).
+
+        Raises:
+            ValueError: If ``ids`` is omitted and a metadata has no ``movie_id``.
+        """
+        if self.read_only:
+            raise PermissionError(f"Memmap store {self.path} was opened read-only")
+        if ids is None:
+            ids = [document_id(_movie_id(meta), doc) for doc, meta in zip(documents, metadatas)]
+        if not documents:
+            return
+        if embeddings is None:
+            if self.embedding_function is None:
+                raise ValueError("Embeddings are required when the store has no embedding_function")
+            embeddings = self.embedding_function(documents)
+
+        keep = _first_occurrences(ids)
+        vectors = np.asarray(embeddings, dtype=np.float32)[keep]
+        documents = [documents[i] for i in keep]
+        metadatas = [metadatas[i] for i in keep]
+        ids = [ids[i] for i in keep]
+
+        with self._writing() as generation:
+            self._append(documents, metadatas, vectors, ids, generation)
+        print(f"Upserted {len(ids)} documents to {self.path}")
+
+    def _append(self, documents: List[str], metadatas: List[Dict], vectors: np.ndarray, ids: List[str], generation: int):
+        import pyarrow as pa
+
+        dim = self.manifest['dim'] or vectors.shape[1]
+        if vectors.shape[1] != dim:
+            raise ValueError(f"Store {self.path} holds {dim}-dimensional vectors, got {vectors.shape[1]}")
+        if self.space == "cosine":
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        start = self.manifest['rows']
+        end = start + len(ids)
+        self._grow(end, dim)
+        self._vectors[start:end] = vectors
+        self._norms[start:end] = np.einsum('ij,ij->i', vectors, vectors)
+        self._retired[start:end] = 0
+        self._vectors.flush()
+        self._norms.flush()
+        self._retired.flush()
+
+        # Chroma drops None/NaN metadata values; so do we.
+        columns = {_ID: ids, _DOCUMENT: documents}
+        for key in sorted({key for meta in metadatas for key in meta}):
+            columns[key] = [
+                None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+                for value in (meta.get(key) for meta in metadatas)
+            ]
+        segment = pa.table(columns)
+        segment_path = self._file(os.path.join("segments", f"{self.manifest['segments']:06d}.arrow"))
+        with pa.OSFile(segment_path, 'wb') as sink, pa.ipc.new_file(sink, segment.schema) as writer:
+            writer.write_table(segment)
+
+        self._retire([self._rows[id_] for id_ in ids if id_ in self._rows], generation)
+
+        # The manifest is written last: it commits both the new rows and the
+        # retirement of the ones they replace.
+        self.manifest.update(dim=dim, rows=end, segments=self.manifest['segments'] + 1, generation=generation)
+        self._write_manifest()
+        self._table = segment if self._table is None else pa.concat_tables([self._table, segment], promote_options="permissive")
+        self._rows.update(zip(ids, range(start, end)))
+
+    def _stored_rows(self, where: Optional[Dict] = None) -> np.ndarray:
+        """Live rows, optionally restricted to a metadata filter."""
+        if self.manifest['rows'] == 0:
+            return np.empty(0, dtype=np.int64)
+        allowed = self._live_mask()
+        if where:
+            allowed &= self._where_mask(where)
+        return np.flatnonzero(allowed)
+
+    def diff_documents(self, movie_id: str, documents: List[str], metadatas: List[Dict]) -> Dict[str, List]:
+        """Compare one movie's current reviews with what the store holds (see ``VectorStore.diff_documents``)."""
+        ids = [document_id(movie_id, doc) for doc in documents]
+        stored = self._row_records(self._stored_rows({"movie_id": movie_id}).tolist())
+        current = {record['id']: record['metadata'] for record in stored}
+
+        new, changed = [], []
+        for i in _first_occurrences(ids):
+            if ids[i] not in current:
+                new.append(i)
+            elif not _same_metadata(current[ids[i]], metadatas[i]):
+                changed.append(i)
+        stale = sorted(set(current) - set(ids))
+        unchanged = len(set(ids) & set(current)) - len(changed)
+        return {'new': new, 'changed': changed, 'stale': stale, 'unchanged': unchanged}
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict]):
+        """Replace the metadata of stored documents without re-embedding them (their vectors are copied to new rows)."""
+        with self._writing() as generation:
+            present = [i for i, id_ in enumerate(ids) if id_ in self._rows]
+            if not present:
+                return
+            rows = [self._rows[ids[i]] for i in present]
+            documents = [record['document'] for record in self._row_records(rows)]
+            vectors = np.array(self._vectors[rows])
+            self._append(documents, [metadatas[i] for i in present], vectors, [ids[i] for i in present], generation)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """Delete documents by ID and/or metadata filter."""
+        if ids is None and where is None:
+            return
+        with self._writing() as generation:
+            rows = self._stored_rows(where)
+            if ids is not None:
+                wanted = {self._rows[id_] for id_ in ids if id_ in self._rows}
+                rows = rows[np.isin(rows, list(wanted))]
+            if not len(rows):
+                return
+            self._retire(rows.tolist(), generation)
+            self.manifest['generation'] = generation
+            self._write_manifest()
+            dropped = set(rows.tolist())
+            self._rows = {id_: row for id_, row in self._rows.items() if row not in dropped}
+
+    def apply_diff(self, movie_id: str, documents: List[str], metadatas: List[Dict], diff: Dict[str, List]):
+        """Apply the metadata updates and deletions of a diff; new documents are left to the caller to embed."""
+        if diff['changed']:
+            self.update_metadatas(
+                [document_id(movie_id, documents[i]) for i in diff['changed']],
+                [metadatas[i] for i in diff['changed']],
+            )
+        if diff['stale']:
+            self.delete(diff['stale'])
+
+    def movie_ids(self) -> Set[str]:
+        """IDs of every movie with at least one stored document."""
+        if self._table is None or "movie_id" not in self._table.column_names:
+            return set()
+        column = self._table.column("movie_id")
+        return {movie_id for movie_id in column.take(self._stored_rows()).to_pylist() if movie_id}
+
+    def _where_mask(self, where: Dict) -> np.ndarray:
+        """Rows matching a metadata filter: equality on one or more keys, or ``$and`` of such filters."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        rows = self.manifest['rows']
+        mask = np.ones(rows, dtype=bool)
+        for key, value in where.items():
+            if key == "$and":
+                for clause in value:
+                    mask &= self._where_mask(clause)
+                continue
+            if isinstance(value, dict):
+                if set(value) != {"$eq"}:
+                    raise ValueError(f"Unsupported filter for {key}: {value} (only equality)")
+                value = value["$eq"]
+            if key not in self._table.column_names:
+                return np.zeros(rows, dtype=bool)
+            try:
+                matches = pc.fill_null(pc.equal(self._table.column(key), value), False)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                return np.zeros(rows, dtype=bool)  # e.g. a number against a string column
+            mask &= matches.to_numpy(zero_copy_only=False)[:rows]
+        return mask
+
+    def _row_records(self, rows: List[int]) -> List[Dict]:
+        records = self._table.take(rows).to_pylist() if rows else []
+        return [
+            {
+                'id': record.pop(_ID),
+                'document': record.pop(_DOCUMENT),
+                'metadata': {key: value for key, value in record.items() if value is not None},
+            }
+            for record in records
+        ]
+
+    def query_embeddings(self, embeddings: Embeddings, n_results: int = 5, where: Optional[Dict] = None):
+        """
+        Exact top-``n_results`` search for each query vector.
+
+        Args:
+            embeddings: Query vectors, e.g. a float32 array of shape (q, dim).
+            n_results: Number of results to return per query.
+            where: Optional metadata filter (equality, e.g. {"year": "1999"}).
+
+        Returns:
+            Results in Chroma's shape (``ids``, ``distances``, ``metadatas``,
+            ``documents``; one list per query vector), nearest first.
+        """
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if self.space == "cosine":
+            queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        rows = self.manifest['rows']
+        if rows == 0 or n_results <= 0:
+            return {key: [[] for _ in queries] for key in ('ids', 'distances', 'metadatas', 'documents')}
+        allowed = self._live_mask()
+        if where:
+            allowed &= self._where_mask(where)
+
+        # A selective filter only reads the matching rows; otherwise every
+        # row is scored and the excluded ones are masked.
+        selected = np.flatnonzero(allowed) if allowed.sum() <= rows // 4 else None
+        total = rows if selected is None else len(selected)
+
+        # Best scores (higher is better) and their rows, merged chunk by chunk.
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, total, self.query_chunk_rows):
+            end = min(start + self.query_chunk_rows, total)
+            block = slice(start, end) if selected is None else selected[start:end]
+            scores = queries @ self._vectors[block].T
+            if self.space == "l2":
+                scores = 2 * scores - self._norms[block]  # -||v - q||^2 up to the constant ||q||^2
+            if selected is None:
+                scores[:, ~allowed[block]] = -np.inf
+            k = min(n_results, end - start)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start if selected is None else selected[start:end][top]], axis=1)
+            if best_scores.shape[1] > n_results:
+                keep = np.argpartition(-best_scores, n_results - 1, axis=1)[:, :n_results]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        results = {'ids': [], 'distances': [], 'metadatas': [], 'documents': []}
+        for query, scores, found in zip(queries, best_scores, best_rows):
+            order = np.argsort(-scores, kind='stable')
+            order = order[np.isfinite(scores[order])]
+            if self.space == "l2":
+                distances = float(query @ query) - scores[order]
+            else:
+                distances = 1 - scores[order]
+            records = self._row_records(found[order].tolist())
+            results['ids'].append([record['id'] for record in records])
+            results['distances'].append(distances.astype(float).tolist())
+            results['metadatas'].append([record['metadata'] for record in records])
+            results['documents'].append([record['document'] for record in records])
+        return results
+
+    def query(self, query_text: str, n_results: int = 5, where: Optional[Dict] = None):
+        """Query with a text, embedded by the store's ``embedding_function``."""
+        if self.embedding_function is None:
+            raise ValueError("query() needs an embedding_function; use query_embeddings() with precomputed vectors")
+        return self.query_embeddings(self.embedding_function([query_text]), n_results=n_results, where=where)
+
+    def peek(self, limit: int = 5):
+        """Return first N documents."""
+        rows = sorted(self._rows.values())[:limit]
+        records = self._row_records(rows)
+        return {
+            'ids': [record['id'] for record in records],
+            'embeddings': np.array(self._vectors[rows]),
+            'documents': [record['document'] for record in records],
+            'metadatas': [record['metadata'] for record in records],
+        }
+
+    @classmethod
+    def from_vector_store(cls, store, path: str, batch_size: Optional[int] = None) -> "MemmapVectorStore":
+        """Copy every document of a Chroma ``VectorStore`` (vectors included) into a new memmap store."""
+        target = cls(path, space=store.space)
+        step = batch_size or store.max_batch_size
+        for offset in range(0, store.count(), step):
+            batch = store.collection.get(include=["embeddings", "documents", "metadatas"], limit=step, offset=offset)
+            target.add_documents(
+                documents=batch['documents'],
+                metadatas=[meta or {} for meta in batch['metadatas']],
+                embeddings=np.asarray(batch['embeddings'], dtype=np.float32),
+                ids=batch['ids'],
+            )
+        return target
@@ -0,0 +1,92 @@
+import os
+import platform
+from typing import Optional
+
+ONNX_MODELS_DIR = "./data/onnx_models"
+QUANTIZATION_CONFIGS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+def default_quantization_config() -> str:
+    """Dynamic-quantization preset matching this CPU's instruction set."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        flags = ""
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+def _session_kwargs(threads: Optional[int]) -> dict:
+    if not threads:
+        return {}
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    return {"session_options": options}
+
+def load_onnx_model(
+    model_name: str,
+    quantize: bool = False,
+    quantization_config: Optional[str] = None,
+    threads: Optional[int] = None,
+    models_dir: str = ONNX_MODELS_DIR,
+):
+    """
+    Load a sentence-transformers model on the ONNX Runtime CPU backend.
+
+    The model is exported to ONNX (and, with ``quantize``, to an int8
+    dynamically quantized copy) the first time and reused from
+    ``models_dir`` afterwards. The fp32 export produces the same vectors as
+    the PyTorch model up to float rounding; int8 trades a little accuracy
+    for speed.
+
+    Args:
+        model_name: The name of the HuggingFace model to use.
+        quantize: Load the int8 dynamically quantized variant.
+        quantization_config: "arm64", "avx2", "avx512" or "avx512_vnni"
+            (detected from the CPU by default).
+        threads: ONNX Runtime intra-op threads (all cores by default).
+        models_dir: Where exported models are kept.
+
+    Returns:
+        A SentenceTransformer with the same ``encode`` API as the PyTorch one.
+
+    Raises:
+        ValueError: If ``quantization_config`` is not a known preset.
+        ImportError: If onnxruntime is not installed.
+        OSError: If the model can be neither found nor exported.
+    """
+    if quantization_config is not None and quantization_config not in QUANTIZATION_CONFIGS:
+        raise ValueError(f"Unknown quantization config: {quantization_config} (expected one of {', '.join(QUANTIZATION_CONFIGS)})")
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The onnx backend needs onnxruntime: pip install sentence-transformers[onnx]") from e
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    export_dir = os.path.join(models_dir, model_name.replace('/', '__'))
+    if not os.path.exists(os.path.join(export_dir, "onnx", "model.onnx")):
+        print(f"Exporting {model_name} to ONNX in {export_dir}...")
+        SentenceTransformer(model_name, backend="onnx", device="cpu").save_pretrained(export_dir)
+
+    file_name = "onnx/model.onnx"
+    if quantize:
+        config = quantization_config or default_quantization_config()
+        file_name = f"onnx/model_qint8_{config}.onnx"
+        if not os.path.exists(os.path.join(export_dir, file_name)):
+            print(f"Quantizing {model_name} to int8 ({config})...")
+            fp32 = SentenceTransformer(export_dir, backend="onnx", device="cpu")
+            export_dynamic_quantized_onnx_model(fp32, config, export_dir)
+
+    return SentenceTransformer(
+        export_dir,
+        backend="onnx",
+        device="cpu",
+        model_kwargs={"file_name": file_name, **_session_kwargs(threads)},
+    )
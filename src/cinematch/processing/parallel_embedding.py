@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+# Set in each worker process by _init_worker.
+_worker_model = None
+
+def load_sentence_transformer(model_name: str, threads: Optional[int], backend: str = "torch", quantize: bool = False):
+    """Default worker loader: a SentenceTransformer pinned to ``threads`` torch (or ONNX Runtime) threads."""
+    if backend == "onnx":
+        from cinematch.processing.onnx_backend import load_onnx_model
+        return load_onnx_model(model_name, quantize=quantize, threads=threads)
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if threads:
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    return SentenceTransformer(model_name, device="cpu")
+
+def _init_worker(loader: Callable, model_name: str, threads: Optional[int]):
+    global _worker_model
+    if threads:
+        # Also caps the BLAS/OpenMP pools used outside torch (tokenizers, numpy).
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[var] = str(threads)
+        os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _worker_model = loader(model_name, threads)
+
+def _encode_shard(texts: List[str], batch_size: int) -> np.ndarray:
+    embeddings = _worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+def default_threads_per_worker(workers: int) -> int:
+    """Split the machine's cores evenly between workers (at least one thread each)."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+class ParallelEncoder:
+    """
+    Pool of worker processes that each hold their own copy of the model.
+
+    A batch is split into shards of at most ``shard_size`` texts (smaller
+    when needed to give every worker a share); the shards are encoded
+    concurrently and reassembled in input order.
+    """
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        workers: int = 2,
+        threads_per_worker: Optional[int] = None,
+        shard_size: int = 256,
+        loader: Callable = load_sentence_transformer,
+        start_method: str = "spawn",
+    ):
+        """
+        Start the worker processes (each loads the model once).
+
+        Args:
+            model_name: The name of the HuggingFace model to use.
+            workers: Number of worker processes.
+            threads_per_worker: Torch threads per worker; defaults to the
+                cores divided evenly between the workers.
+            shard_size: Texts sent to a worker per task.
+            loader: Module-level ``(model_name, threads) -> model`` used in
+                each worker; the model needs an ``encode`` method.
+            start_method: Multiprocessing start method; "spawn" avoids
+                forking a process that already runs torch threads.
+        """
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or default_threads_per_worker(workers)
+        self.shard_size = shard_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(loader, model_name, self.threads_per_worker),
+        )
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts across the worker processes.
+
+        Args:
+            texts: List of strings to embed.
+            batch_size: Number of texts each worker processes per forward pass.
+
+        Returns:
+            Float32 array of shape (len(texts), dimension), in input order.
+        """
+        # Small batches are still spread over every worker.
+        size = max(1, min(self.shard_size, -(-len(texts) // self.workers)))
+        shards = [texts[start:start + size] for start in range(0, len(texts), size)]
+        if not shards:
+            return np.empty((0, 0), dtype=np.float32)
+        # map() yields results in submission order, whichever worker finishes first.
+        return np.concatenate(list(self._executor.map(_encode_shard, shards, [batch_size] * len(shards))))
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,19 +1,34 @@
 import argparse
-import pandas as pd
+import numpy as np
 import json
 import os
 import glob
-from cinematch.processing.cleaning import clean_text
+import time
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from cinematch.processing.cleaning import clean_texts
+from cinematch.processing.dedup import dedupe_records
 from cinematch.processing.embedding import EmbeddingModel
+from cinematch.processing.embedding_cache import EmbeddingCache
+from cinematch.processing.registry import get_embedding_model, get_vector_store
 from cinematch.processing.store import VectorStore
+from cinematch.processing.streaming import StreamingPipeline
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_DIR = os.path.join(BASE_DIR, "tests", "output")
+# Texts handed to the embedding model per encode call: enough for several
+# forward passes, so the worker pool and token-budgeted batches have work
+# to spread, while the embed stage still streams.
+ENCODE_SIZE = 4096
 
-def load_metadata(movie_name: str):
+def load_metadata(movie_name: str, output_dir: str = OUTPUT_DIR):
     """Finds and loads the JSON metadata file for a movie."""
     # Pattern match for resilience (e.g., checks imdb_data_The_Matrix.json)
-    pattern = os.path.join(OUTPUT_DIR, "json", f"imdb_data_{movie_name.replace(' ', '_')}.json")
+    pattern = os.path.join(output_dir, "json", f"imdb_data_{movie_name.replace(' ', '_')}.json")
     files = glob.glob(pattern)
     if not files:
         # Try without replacement or fuzzy if needed, for now strict
@@ -23,79 +38,462 @@ def load_metadata(movie_name: str):
     with open(files[0], 'r') as f:
         return json.load(f)
 
-def load_reviews(movie_name: str):
+def load_reviews(movie_name: str, output_dir: str = OUTPUT_DIR):
     """Finds and loads the CSV reviews file."""
-    pattern = os.path.join(OUTPUT_DIR, "csv", f"imdb_reviews_{movie_name.replace(' ', '_')}.csv")
+    pattern = os.path.join(output_dir, "csv", f"imdb_reviews_{movie_name.replace(' ', '_')}.csv")
     files = glob.glob(pattern)
     if not files:
         print(f"Reviews file not found for: {pattern}")
         return None
         
+    import pandas as pd  # ~0.6s to import, so only when there is a CSV to read
     return pd.read_csv(files[0])
 
-def run_pipeline(movie_name: str):
+def discover_movies(output_dir: str = OUTPUT_DIR) -> List[str]:
+    """Names of every movie that has both a metadata JSON and a reviews CSV."""
+    prefix = "imdb_data_"
+    movies = []
+    for path in sorted(glob.glob(os.path.join(output_dir, "json", f"{prefix}*.json"))):
+        safe_name = os.path.basename(path)[len(prefix):-len(".json")]
+        if os.path.exists(os.path.join(output_dir, "csv", f"imdb_reviews_{safe_name}.csv")):
+            movies.append(safe_name.replace('_', ' '))
+    return movies
+
+def review_records(movie_name: str, metadata: Dict, reviews_df: "pd.DataFrame", workers: int = 1) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (cleaned review, metadata) pairs for one movie, skipping very short reviews.
+
+    The whole content column is cleaned in one ``clean_texts`` call and the
+    metadata is assembled column-wise; ``workers`` > 1 spreads the cleaning
+    of very large frames over processes.
+    """
+    import pandas as pd
+
+    def column(name, default):
+        return reviews_df[name] if name in reviews_df else default
+
+    cleaned = pd.Series(clean_texts(column('content', [''] * len(reviews_df)), workers=workers), index=reviews_df.index)
+    keep = (cleaned.str.len() >= 20).to_numpy()  # Skip very short reviews
+
+    # Construct metadata: the movie-level fields once, the per-review ones as columns
+    movie_meta = {
+        "source": "imdb",
+        "movie_id": metadata.get('imdb_id'),
+        "movie_title": metadata.get('title', movie_name),
+        "year": str(metadata.get('year', '')),
+    }
+    columns = pd.DataFrame({
+        "review_title": column('title', ''),
+        "review_type": column('type', 'user'),
+        "original_index": reviews_df.index,
+    }, index=reviews_df.index)[keep]
+    for text, review_title, review_type, original_index in zip(
+        cleaned[keep].tolist(),
+        columns["review_title"].tolist(),
+        columns["review_type"].tolist(),
+        columns["original_index"].tolist(),
+    ):
+        yield text, {
+            **movie_meta,
+            "review_title": review_title,
+            "review_type": review_type,
+            "original_index": original_index,
+        }
+
+def chunk_records(records: List[Tuple[str, Dict]], chunker: Callable[[List[str]], List[List[str]]]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Split long reviews into chunks, one record per chunk.
+
+    ``chunker`` maps a list of texts to the chunks of each (e.g.
+    ``EmbeddingModel.chunk``); chunk records keep the review's metadata plus
+    ``chunk_index`` and ``chunk_count``.
+    """
+    texts = [text for text, _ in records]
+    for (_, meta), chunks in zip(records, chunker(texts)):
+        for index, chunk in enumerate(chunks):
+            yield chunk, {**meta, "chunk_index": index, "chunk_count": len(chunks)}
+
+def iter_movies(movie_names: Iterable[str], output_dir: str = OUTPUT_DIR) -> Iterator[Tuple[str, Dict, "pd.DataFrame"]]:
+    """
+    Load (name, metadata, reviews) one movie at a time.
+
+    Movies with missing files are skipped, and so are movies without an
+    IMDb ID: the ID scopes each movie's documents in the store, so ID-less
+    movies cannot be synced without touching each other's reviews.
+    """
+    for movie_name in movie_names:
+        metadata = load_metadata(movie_name, output_dir)
+        reviews_df = load_reviews(movie_name, output_dir)
+        if metadata is None or reviews_df is None:
+            continue
+        if not metadata.get('imdb_id'):
+            print(f"⚠️ Skipping {movie_name}: no IMDb ID in its metadata.")
+            continue
+        yield movie_name, metadata, reviews_df
+
+def iter_corpus_records(movie_names: Iterable[str], output_dir: str = OUTPUT_DIR) -> Iterator[Tuple[str, Dict]]:
+    """Stream review records from every movie, loading one movie's files at a time."""
+    for movie_name, metadata, reviews_df in iter_movies(movie_names, output_dir):
+        yield from review_records(movie_name, metadata, reviews_df)
+
+def sync_movie_records(
+    movie_name: str,
+    metadata: Dict,
+    reviews_df: "pd.DataFrame",
+    vector_store: VectorStore,
+    totals: Dict[str, int],
+    chunker: Optional[Callable[[List[str]], List[List[str]]]] = None,
+    dedup_threshold: Optional[float] = None,
+    clean_workers: int = 1,
+) -> List[Tuple[str, Dict]]:
+    """
+    Diff one movie against the store and return only the reviews that need embedding.
+
+    Metadata changes and deletions are applied to the store on the way;
+    ``totals`` collects the per-kind counts and the movie IDs seen. With a
+    ``dedup_threshold`` near-duplicate reviews of a movie are collapsed
+    first (see ``dedupe_records``; counts go to ``totals['dedup']``), and
+    with a ``chunker`` reviews are split (see ``chunk_records``) before diffing.
+    ``clean_workers`` > 1 cleans very large review frames in that many
+    processes (see ``review_records``).
+
+    Raises:
+        ValueError: If the movie has no IMDb ID to scope the diff by.
+    """
+    movie_id = metadata.get('imdb_id')
+    if not movie_id:
+        raise ValueError(f"{movie_name} has no IMDb ID; its reviews cannot be synced.")
+    records = list(review_records(movie_name, metadata, reviews_df, workers=clean_workers))
+    if dedup_threshold is not None:
+        records, stats = dedupe_records(records, dedup_threshold)
+        dedup = totals.setdefault('dedup', {})
+        for key, value in stats.items():
+            dedup[key] = dedup.get(key, 0) + value
+    if chunker is not None:
+        records = list(chunk_records(records, chunker))
+    documents = [text for text, _ in records]
+    metadatas = [meta for _, meta in records]
+
+    diff = vector_store.diff_documents(movie_id, documents, metadatas)
+    vector_store.apply_diff(movie_id, documents, metadatas, diff)
+    totals['movie_ids'].add(movie_id)
+    totals['updated'] += len(diff['changed'])
+    totals['deleted'] += len(diff['stale'])
+    totals['unchanged'] += diff['unchanged']
+    return [records[i] for i in diff['new']]
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of ``size`` items (the last one may be shorter)."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def report_cache(embed_model: EmbeddingModel):
+    stats = embed_model.cache_stats()
+    if stats:
+        print(f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions, {stats['entries']} entries.")
+
+def report_dedup(stats: Dict[str, int], dimension: int):
+    if stats.get('reviews'):
+        vector_bytes = stats['duplicates'] * dimension * 4
+        print(f"Near-duplicates: {stats['duplicates']} of {stats['reviews']} reviews suppressed "
+              f"({stats['duplicates'] / stats['reviews']:.0%} fewer to embed, {stats['chars_saved']:,} characters, "
+              f"~{vector_bytes / 1024:.0f} KiB of vectors not stored).")
+
+def report_encoding(embed_model: EmbeddingModel):
+    stats = embed_model.encode_stats()
+    if stats['texts']:
+        print(f"Encoded {stats['texts']} texts at {stats['texts_per_sec']:.0f} texts/sec.")
+    if stats['tokens']:
+        print(f"Token-budgeted batches: {stats['tokens']} tokens at {stats['tokens_per_sec']:.0f} tokens/sec "
+              f"({stats['padding']:.0%} padding).")
+
+def ingest_movies(
+    movie_names: Iterable[str],
+    totals: Dict,
+    output_dir: str = OUTPUT_DIR,
+    batch_size: int = 32,
+    embed_model: Optional[EmbeddingModel] = None,
+    vector_store: Optional[VectorStore] = None,
+    chunk_overlap: int = 32,
+    dedup_threshold: Optional[float] = 0.8,
+    queue_size: int = 4,
+    encode_size: int = ENCODE_SIZE,
+    clean_workers: int = 1,
+) -> StreamingPipeline:
+    """
+    Stream movies through read → clean → embed → write stages running concurrently.
+
+    Each stage has its own thread and hands its output on through a queue
+    of at most ``queue_size`` items (movies, per-movie record lists, encode
+    batches), so files are read and the store is written while the model
+    encodes, and memory stays bounded by the queues rather than the corpus.
+    The clean stage also diffs each movie against the store (see
+    ``sync_movie_records``), so only new chunks reach the model; the write
+    stage upserts once enough have accumulated to fill the store's maximum
+    batch size.
+
+    Args:
+        movie_names: Movies to ingest.
+        totals: Filled with ``movie_ids``, ``added``, ``updated``,
+            ``deleted``, ``unchanged`` and ``dedup`` counts.
+        batch_size: Texts per forward pass of the model.
+        queue_size: Items buffered between two stages.
+        encode_size: Texts per ``encode_array`` call (the embed stage's
+            unit of work); it must span several forward passes for the
+            worker pool or ``max_batch_tokens`` batching to take effect.
+        clean_workers: Processes that clean each movie's reviews (worth it
+            only for very large review files).
+
+    Returns:
+        The finished pipeline, for its per-stage metrics (``report()``).
+    """
+    embed_model = embed_model or get_embedding_model()
+    vector_store = vector_store or get_vector_store()
+    chunker = partial(embed_model.chunk, overlap=chunk_overlap)
+    upsert_size = vector_store.max_batch_size
+    for key, default in (('movie_ids', set()), ('added', 0), ('updated', 0), ('deleted', 0), ('unchanged', 0), ('dedup', {})):
+        totals.setdefault(key, default)
+
+    def read(names):
+        yield from iter_movies(names, output_dir)
+
+    def clean(movies):
+        for movie in movies:
+            records = sync_movie_records(
+                *movie, vector_store, totals, chunker=chunker, dedup_threshold=dedup_threshold, clean_workers=clean_workers,
+            )
+            if records:
+                yield records
+
+    def embed(movie_records):
+        for batch in batched((record for records in movie_records for record in records), encode_size):
+            texts = [text for text, _ in batch]
+            yield texts, [meta for _, meta in batch], embed_model.encode_array(texts, batch_size=batch_size)
+
+    def write(batches):
+        documents, metadatas, embeddings = [], [], []  # embeddings: one float32 block per encode batch
+        for texts, metas, vectors in batches:
+            documents.extend(texts)
+            metadatas.extend(metas)
+            embeddings.append(vectors)
+            if len(documents) >= upsert_size:
+                vector_store.add_documents(documents=documents, metadatas=metadatas, embeddings=np.concatenate(embeddings))
+                yield len(documents)
+                documents, metadatas, embeddings = [], [], []
+        if documents:
+            vector_store.add_documents(documents=documents, metadatas=metadatas, embeddings=np.concatenate(embeddings))
+            yield len(documents)
+
+    pipeline = StreamingPipeline([("read", read), ("clean", clean), ("embed", embed), ("write", write)], queue_size=queue_size)
+    for stored in pipeline.run(movie_names):
+        totals['added'] += stored
+    return pipeline
+
+def run_pipeline(
+    movie_name: str,
+    embed_model: Optional[EmbeddingModel] = None,
+    chunk_overlap: int = 32,
+    dedup_threshold: Optional[float] = 0.8,
+    queue_size: int = 4,
+    vector_store: Optional[VectorStore] = None,
+    batch_size: int = 32,
+    encode_size: int = ENCODE_SIZE,
+    clean_workers: int = 1,
+):
     print(f"Starting pipeline for: {movie_name}")
     
-    # 1. Load Data
-    metadata = load_metadata(movie_name)
-    reviews_df = load_reviews(movie_name)
+    # 1. Initialize Models
+    embed_model = embed_model or get_embedding_model()
+    vector_store = vector_store or get_vector_store()
     
-    if metadata is None or reviews_df is None:
+    # 2. Stream the movie's reviews through clean, embed and the VectorDB sync
+    totals = {}
+    pipeline = ingest_movies(
+        [movie_name],
+        totals,
+        batch_size=batch_size,
+        embed_model=embed_model,
+        vector_store=vector_store,
+        chunk_overlap=chunk_overlap,
+        dedup_threshold=dedup_threshold,
+        queue_size=queue_size,
+        encode_size=encode_size,
+        clean_workers=clean_workers,
+    )
+    
+    if not totals['movie_ids']:
         print("Aborting: Missing data files.")
         return
 
-    # 2. Initialize Models
-    embed_model = EmbeddingModel()
-    vector_store = VectorStore()
-    
-    # 3. Process Reviews
-    documents = []
-    metadatas = []
-    
-    print(f"Processing {len(reviews_df)} reviews...")
-    
-    for idx, row in reviews_df.iterrows():
-        raw_text = str(row.get('content', ''))
-        cleaned_text = clean_text(raw_text)
-        
-        if len(cleaned_text) < 20:  # Skip very short reviews
-            continue
-            
-        documents.append(cleaned_text)
-        
-        # Construct metadata
-        meta = {
-            "source": "imdb",
-            "movie_id": metadata.get('imdb_id', 'unknown'),
-            "movie_title": metadata.get('title', movie_name),
-            "year": str(metadata.get('year', '')),
-            "review_title": row.get('title', ''),
-            "review_type": row.get('type', 'user'),
-            "original_index": idx
-        }
-        metadatas.append(meta)
+    report_cache(embed_model)
+    report_dedup(totals['dedup'], embed_model.dimension)
+    report_encoding(embed_model)
+    print(pipeline.report())
+    print(f"Successfully processed {movie_name}: "
+          f"{totals['added']} added, {totals['updated']} updated, {totals['deleted']} deleted, {totals['unchanged']} unchanged.")
 
-    if not documents:
-        print("No valid reviews found to process.")
-        return
+def run_corpus_pipeline(
+    output_dir: str = OUTPUT_DIR,
+    batch_size: int = 32,
+    embed_model: Optional[EmbeddingModel] = None,
+    vector_store: Optional[VectorStore] = None,
+    prune: bool = True,
+    chunk_overlap: int = 32,
+    dedup_threshold: Optional[float] = 0.8,
+    queue_size: int = 4,
+    encode_size: int = ENCODE_SIZE,
+    clean_workers: int = 1,
+) -> Dict[str, int]:
+    """
+    Ingest every movie in ``output_dir`` with a single model load.
 
-    # 4. Generate Embeddings
-    print("Generating embeddings...")
-    embeddings = embed_model.encode(documents)
-    
-    # 5. Store in VectorDB
-    print("Storing in ChromaDB...")
-    vector_store.add_documents(
-        documents=documents,
-        metadatas=metadatas,
-        embeddings=embeddings
+    Movies stream through concurrent read, clean, embed and write stages
+    (see ``ingest_movies``). Reviews longer than the model's token limit
+    are split into overlapping chunks, and each movie is diffed against the
+    store first, so only new chunks are embedded. Metadata changes are
+    updated in place and reviews that disappeared are deleted.
+
+    Args:
+        output_dir: Directory with the scraper's ``json/`` and ``csv/`` output.
+        batch_size: Texts per forward pass of the model.
+        embed_model: Model to use (the process-wide shared one by default).
+        vector_store: Store to use (the process-wide shared one by default).
+        prune: Also delete documents of movies no longer in ``output_dir``.
+        chunk_overlap: Tokens shared by consecutive chunks of a long review.
+        dedup_threshold: Shingle similarity at which reviews of the same
+            movie count as near-duplicates and only one is kept (None
+            keeps them all).
+        queue_size: Items buffered between two pipeline stages.
+        encode_size: Texts per encode call (see ``ingest_movies``).
+        clean_workers: Processes that clean each movie's reviews.
+
+    Returns:
+        Number of movies found, documents added, updated, deleted
+        (including pruned ones) and unchanged, and near-duplicate reviews
+        suppressed.
+    """
+    movie_names = discover_movies(output_dir)
+    print(f"Starting corpus pipeline for {len(movie_names)} movies in {output_dir}")
+    if not movie_names:
+        return {'movies': 0, 'documents': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'duplicates': 0}
+
+    embed_model = embed_model or get_embedding_model()
+    vector_store = vector_store or get_vector_store()
+    totals = {}
+    start = time.perf_counter()
+
+    pipeline = ingest_movies(
+        movie_names,
+        totals,
+        output_dir=output_dir,
+        batch_size=batch_size,
+        embed_model=embed_model,
+        vector_store=vector_store,
+        chunk_overlap=chunk_overlap,
+        dedup_threshold=dedup_threshold,
+        queue_size=queue_size,
+        encode_size=encode_size,
+        clean_workers=clean_workers,
     )
-    
-    print(f"Successfully processed {len(documents)} reviews for {movie_name}.")
+
+    if prune:
+        for movie_id in vector_store.movie_ids() - totals['movie_ids']:
+            before = vector_store.count()
+            vector_store.delete(where={"movie_id": movie_id})
+            totals['deleted'] += before - vector_store.count()
+
+    elapsed = time.perf_counter() - start
+    stored = totals['added']
+    rate = stored / elapsed if elapsed > 0 else 0.0
+    report_cache(embed_model)
+    report_dedup(totals['dedup'], embed_model.dimension)
+    report_encoding(embed_model)
+    print(pipeline.report())
+    print(f"Successfully processed {stored} chunks from {len(movie_names)} movies in {elapsed:.1f}s ({rate:.0f} chunks/sec); "
+          f"{totals['updated']} updated, {totals['deleted']} deleted, {totals['unchanged']} unchanged.")
+    return {
+        'movies': len(movie_names),
+        'documents': stored,
+        'updated': totals['updated'],
+        'deleted': totals['deleted'],
+        'unchanged': totals['unchanged'],
+        'duplicates': totals['dedup'].get('duplicates', 0),
+    }
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ingest movie data into Vector DB")
-    parser.add_argument("--movie", type=str, required=True, help="Name of the movie (e.g., 'The Matrix')")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--movie", type=str, help="Name of the movie (e.g., 'The Matrix')")
+    target.add_argument("--all", action="store_true", help="Ingest every movie in the output directory with one model load")
+    parser.add_argument("--output-dir", type=str, default=OUTPUT_DIR, help="Scraper output directory (with json/ and csv/)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per forward pass of the embedding model")
+    parser.add_argument("--encode-size", type=int, default=ENCODE_SIZE, help="Texts per encode call, spread over the workers and token-budgeted batches")
+    parser.add_argument("--no-prune", action="store_true", help="In --all mode, keep documents of movies missing from the output directory")
+    parser.add_argument("--cache-dir", type=str, help="Reuse embeddings of unchanged reviews from this cache directory")
+    parser.add_argument("--cache-max-entries", type=int, help="Evict least recently used cache entries beyond this many")
+    parser.add_argument("--workers", type=int, default=1, help="Encode batches across this many worker processes")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch", help="Embedding inference backend")
+    parser.add_argument("--quantize", action="store_true", help="Use the int8 quantized model (onnx backend)")
+    parser.add_argument("--chunk-overlap", type=int, default=32, help="Tokens shared by consecutive chunks of long reviews")
+    parser.add_argument("--max-batch-tokens", type=int, help="Cap on padded tokens per encode batch (short texts then go in larger batches)")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8, help="Similarity at which a movie's reviews count as near-duplicates")
+    parser.add_argument("--no-dedup", action="store_true", help="Embed every review, even near-duplicates")
+    parser.add_argument("--clean-workers", type=int, default=1, help="Processes that clean each movie's reviews (for very large review files)")
+    parser.add_argument("--queue-size", type=int, default=4, help="Items buffered between the read/clean/embed/write stages")
+    parser.add_argument("--space", choices=["cosine", "ip", "l2"], help="Distance of a newly created collection (default cosine)")
+    parser.add_argument("--hnsw-m", type=int, help="HNSW graph degree of a newly created collection")
+    parser.add_argument("--ef-construction", type=int, help="HNSW build candidate list size of a newly created collection")
+    parser.add_argument("--memmap-store", type=str, help="Ingest into a memmap exact-search store at this path instead of ChromaDB")
+    parser.add_argument("--threads-per-worker", type=int, help="Torch threads per worker process (default: cores / workers)")
     args = parser.parse_args()
     
-    run_pipeline(args.movie)
+    cache = EmbeddingCache(args.cache_dir, max_entries=args.cache_max_entries) if args.cache_dir else None
+    embed_model = get_embedding_model(
+        cache=cache,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        backend=args.backend,
+        quantize=args.quantize,
+        max_batch_tokens=args.max_batch_tokens,
+    )
+
+    dedup_threshold = None if args.no_dedup else args.dedup_threshold
+    if args.memmap_store:
+        from cinematch.processing.memmap_store import MemmapVectorStore
+        vector_store = MemmapVectorStore(args.memmap_store, space=args.space)
+    else:
+        index_options = {'space': args.space, 'm': args.hnsw_m, 'ef_construction': args.ef_construction}
+        vector_store = get_vector_store(**{key: value for key, value in index_options.items() if value is not None})
+    try:
+        if args.all:
+            run_corpus_pipeline(
+                args.output_dir,
+                batch_size=args.batch_size,
+                encode_size=args.encode_size,
+                clean_workers=args.clean_workers,
+                embed_model=embed_model,
+                vector_store=vector_store,
+                prune=not args.no_prune,
+                chunk_overlap=args.chunk_overlap,
+                dedup_threshold=dedup_threshold,
+                queue_size=args.queue_size,
+            )
+        else:
+            run_pipeline(
+                args.movie,
+                batch_size=args.batch_size,
+                encode_size=args.encode_size,
+                clean_workers=args.clean_workers,
+                embed_model=embed_model,
+                vector_store=vector_store,
+                chunk_overlap=args.chunk_overlap,
+                dedup_threshold=dedup_threshold,
+                queue_size=args.queue_size,
+            )
+    finally:
+        embed_model.close()
@@ -0,0 +1,77 @@
+import inspect
+import os
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+# Process-wide shared instances. Nothing heavy is imported until the first
+# get_* call that needs it: sentence-transformers/torch with the first model,
+# chromadb with the first client.
+_lock = threading.RLock()
+_instances: Dict[Tuple[Hashable, ...], object] = {}
+
+def _get(key: Tuple[Hashable, ...], factory: Callable[[], object]):
+    instance = _instances.get(key)
+    if instance is None:
+        with _lock:
+            # Another thread may have built it while we waited for the lock.
+            instance = _instances.get(key)
+            if instance is None:
+                instance = _instances[key] = factory()
+    return instance
+
+def _options_key(factory: Callable, options: Dict) -> Tuple[Hashable, ...]:
+    # Options left at the constructor's default build the same instance as
+    # omitting them, so they must not make a separate cache entry.
+    parameters = inspect.signature(factory).parameters
+    return tuple(sorted(
+        (key, value) for key, value in options.items()
+        if key not in parameters or parameters[key].default is inspect.Parameter.empty or value != parameters[key].default
+    ))
+
+def get_embedding_model(model_name: str = 'all-MiniLM-L6-v2', **options):
+    """
+    The shared EmbeddingModel for ``model_name`` and ``options``.
+
+    Args:
+        model_name: The name of the HuggingFace model to use.
+        **options: Other ``EmbeddingModel`` arguments (cache, workers,
+            backend, quantize...); each distinct combination is loaded once.
+    """
+    from cinematch.processing.embedding import EmbeddingModel
+
+    def load():
+        return EmbeddingModel(model_name, **options)
+
+    return _get(('embedding_model', model_name, _options_key(EmbeddingModel, options)), load)
+
+def get_chroma_client(persistent_path: str = "./data/chroma_db"):
+    """The shared ChromaDB client for a database directory."""
+    def connect():
+        import chromadb
+        os.makedirs(persistent_path, exist_ok=True)
+        return chromadb.PersistentClient(path=persistent_path)
+
+    return _get(('chroma_client', os.path.abspath(persistent_path)), connect)
+
+def get_vector_store(collection_name: str = "cinematch_reviews", persistent_path: str = "./data/chroma_db", **options):
+    """
+    The shared VectorStore for a collection (backed by the shared client).
+
+    Args:
+        **options: Index settings for ``VectorStore`` (space, m,
+            ef_construction, ef_search).
+    """
+    from cinematch.processing.store import VectorStore
+
+    def connect():
+        return VectorStore(collection_name=collection_name, persistent_path=persistent_path, **options)
+
+    return _get(('vector_store', collection_name, os.path.abspath(persistent_path), _options_key(VectorStore, options)), connect)
+
+def clear():
+    """Forget every shared instance, stopping embedding worker pools (mainly for tests)."""
+    with _lock:
+        for key, instance in _instances.items():
+            if key[0] == 'embedding_model':
+                instance.close()
+        _instances.clear()
@@ -1,51 +1,284 @@
-import chromadb
-import uuid
-from typing import List, Dict, Optional
-import os
+import math
+import numpy as np
+from typing import Callable, List, Dict, Optional, Set, Union
+from cinematch.processing.embedding_cache import text_key
+from cinematch.processing.registry import get_chroma_client
+
+Embeddings = Union[np.ndarray, List[List[float]]]
+
+SPACES = ("cosine", "ip", "l2")
+
+def distance_to_score(distance: float, space: str) -> float:
+    """
+    Similarity score from a Chroma distance; 1 is an exact match.
+
+    ``cosine`` and ``ip`` distances are ``1 - similarity``. ``l2`` distances
+    are squared, which for unit vectors (what the sentence-transformers
+    models produce) is ``2 - 2 * cosine``, so all three spaces give the
+    cosine similarity of normalized embeddings.
+    """
+    if space == "l2":
+        return 1 - distance / 2
+    return 1 - distance
+
+def document_id(movie_id: str, text: str) -> str:
+    """Stable ID of a review: its movie ID plus a hash of the cleaned text."""
+    return f"{movie_id}:{text_key(text)[:16]}"
+
+def _movie_id(metadata: Dict) -> str:
+    # Default IDs are scoped by movie; a shared placeholder would let one
+    # ID-less movie's sync delete another's documents.
+    movie_id = metadata.get('movie_id')
+    if not movie_id:
+        raise ValueError("Cannot derive a document ID from metadata without a movie_id; pass ids explicitly.")
+    return movie_id
+
+def _same_metadata(stored: Dict, metadata: Dict) -> bool:
+    # Chroma drops None/NaN values, so they are ignored on our side too.
+    present = {
+        k: v for k, v in metadata.items()
+        if v is not None and not (isinstance(v, float) and math.isnan(v))
+    }
+    return stored == present
+
+def _first_occurrences(ids: List[str]) -> List[int]:
+    seen = set()
+    positions = []
+    for i, id_ in enumerate(ids):
+        if id_ not in seen:
+            seen.add(id_)
+            positions.append(i)
+    return positions
 
 class VectorStore:
     """
     Wrapper for ChromaDB to manage vector storage and retrieval.
     """
-    def __init__(self, collection_name: str = "cinematch_reviews", persistent_path: str = "./data/chroma_db"):
+    def __init__(
+        self,
+        collection_name: str = "cinematch_reviews",
+        persistent_path: str = "./data/chroma_db",
+        space: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ):
         """
         Initialize ChromaDB client and collection.
+
+        The client is shared by every store on the same path in this process
+        (prefer ``registry.get_vector_store`` to share the store itself).
+
+        The distance space, ``m`` and ``ef_construction`` are fixed when a
+        collection is created; asking for different ones on an existing
+        collection raises ValueError (re-ingest into a new collection
+        instead). ``ef_search`` can be changed at any time.
         
         Args:
             collection_name: Name of the collection to use.
             persistent_path: Path to store database files.
+            space: Distance of a new collection: "cosine" (default), "ip"
+                or "l2".
+            m: HNSW graph degree (Chroma's ``max_neighbors``, default 16).
+            ef_construction: HNSW candidate list size while building
+                (default 100).
+            ef_search: HNSW candidate list size while querying (default 100).
         """
-        # Ensure data directory exists
-        os.makedirs(persistent_path, exist_ok=True)
-        
-        self.client = chromadb.PersistentClient(path=persistent_path)
-        self.collection = self.client.get_or_create_collection(name=collection_name)
-        print(f"Connected to ChromaDB collection: {collection_name}")
+        if space is not None and space not in SPACES:
+            raise ValueError(f"Unknown distance space: {space} (expected one of {', '.join(SPACES)})")
+        requested = {'space': space, 'max_neighbors': m, 'ef_construction': ef_construction, 'ef_search': ef_search}
+        hnsw = {key: value for key, value in requested.items() if value is not None}
+
+        self.client = get_chroma_client(persistent_path)
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name,
+            configuration={'hnsw': {'space': "cosine", **hnsw}},
+        )
+        current = self.hnsw_config
+        fixed = {key: value for key, value in hnsw.items() if key != 'ef_search' and current.get(key) != value}
+        if fixed:
+            settings = ", ".join(f"{key}={current.get(key)}" for key in fixed)
+            raise ValueError(f"Collection {collection_name} already exists with {settings}; use a new collection for other settings")
+        if ef_search is not None and current.get('ef_search') != ef_search:
+            self.set_ef_search(ef_search)
+        print(f"Connected to ChromaDB collection: {collection_name} ({self.space})")
 
-    def add_documents(self, documents: List[str], metadatas: List[Dict], embeddings: Optional[List[List[float]]] = None, ids: Optional[List[str]] = None):
+    @property
+    def hnsw_config(self) -> Dict:
+        """The collection's HNSW settings (space, max_neighbors, ef_construction, ef_search...)."""
+        return dict((self.collection.configuration or {}).get('hnsw') or {})
+
+    @property
+    def space(self) -> str:
+        """Distance the collection was created with."""
+        return self.hnsw_config.get('space', "l2")
+
+    def set_ef_search(self, ef_search: int):
+        """
+        Change the query-time HNSW candidate list size (recall vs latency).
+
+        Chroma reads it when a process first loads the index, so a change
+        made after this process has queried the collection only applies to
+        processes started later.
+        """
+        self.collection.modify(configuration={'hnsw': {'ef_search': ef_search}})
+
+    def score(self, distance: float) -> float:
+        """Similarity score of a distance returned by this collection (see ``distance_to_score``)."""
+        return distance_to_score(distance, self.space)
+
+    @property
+    def max_batch_size(self) -> int:
+        """Largest number of records the client accepts in one upsert."""
+        return self.client.get_max_batch_size()
+
+    def add_documents(self, documents: List[str], metadatas: List[Dict], embeddings: Optional[Embeddings] = None, ids: Optional[List[str]] = None):
         """
-        Add documents to the collection.
+        Add documents to the collection, in chunks of at most ``max_batch_size``.
         
         Args:
             documents: List of text content.
             metadatas: List of metadata dictionaries.
-            embeddings: Optional list of embedding vectors.
-            ids: Optional list of unique IDs.
+            embeddings: Optional embedding vectors; a float32 array of shape
+                (n, dim) is passed through without conversion.
+            ids: Optional list of unique IDs. By default each document gets
+                ``document_id(movie_id, text)``, so re-adding the same review
+                overwrites it instead of duplicating it.
+
+        Raises:
+            ValueError: If ``ids`` is omitted and a metadata has no ``movie_id``.
         """
         if ids is None:
-            ids = [str(uuid.uuid4()) for _ in range(len(documents))]
+            ids = [document_id(_movie_id(meta), doc) for doc, meta in zip(documents, metadatas)]
             
         if not documents:
             return
 
-        self.collection.upsert(
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            ids=ids
-        )
+        keep = _first_occurrences(ids)
+        if len(keep) < len(ids):
+            # A single upsert may not repeat an ID; the first copy wins.
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            ids = [ids[i] for i in keep]
+            if embeddings is not None:
+                embeddings = embeddings[keep] if isinstance(embeddings, np.ndarray) else [embeddings[i] for i in keep]
+
+        step = self.max_batch_size
+        for start in range(0, len(documents), step):
+            end = start + step
+            self.collection.upsert(
+                documents=documents[start:end],
+                embeddings=embeddings[start:end] if embeddings is not None else None,
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
         print(f"Upserted {len(documents)} documents to {self.collection.name}")
 
+    def diff_documents(self, movie_id: str, documents: List[str], metadatas: List[Dict]) -> Dict[str, List]:
+        """
+        Compare one movie's current reviews with what the collection holds.
+
+        Args:
+            movie_id: IMDb ID the documents belong to.
+            documents: The movie's cleaned reviews, as they are now.
+            metadatas: Metadata for each document.
+
+        Returns:
+            ``new``: positions of documents not stored yet,
+            ``changed``: positions of stored documents whose metadata differs,
+            ``stale``: IDs stored for this movie that are no longer present,
+            ``unchanged``: number of documents already up to date.
+        """
+        ids = [document_id(movie_id, doc) for doc in documents]
+        stored = self.collection.get(where={"movie_id": movie_id}, include=["metadatas"])
+        current = dict(zip(stored['ids'], stored['metadatas']))
+
+        new, changed = [], []
+        for i in _first_occurrences(ids):
+            if ids[i] not in current:
+                new.append(i)
+            elif not _same_metadata(current[ids[i]], metadatas[i]):
+                changed.append(i)
+        stale = sorted(set(current) - set(ids))
+        unchanged = len(set(ids) & set(current)) - len(changed)
+        return {'new': new, 'changed': changed, 'stale': stale, 'unchanged': unchanged}
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict]):
+        """Replace the metadata of stored documents without re-embedding them."""
+        step = self.max_batch_size
+        for start in range(0, len(ids), step):
+            self.collection.update(ids=ids[start:start + step], metadatas=metadatas[start:start + step])
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """Delete documents by ID and/or metadata filter."""
+        if ids is not None:
+            step = self.max_batch_size
+            for start in range(0, len(ids), step):
+                self.collection.delete(ids=ids[start:start + step], where=where)
+        elif where is not None:
+            self.collection.delete(where=where)
+
+    def movie_ids(self) -> Set[str]:
+        """IDs of every movie with at least one stored document."""
+        movie_ids = set()
+        step = self.max_batch_size
+        for offset in range(0, self.count(), step):
+            stored = self.collection.get(include=["metadatas"], limit=step, offset=offset)
+            movie_ids.update(meta['movie_id'] for meta in stored['metadatas'] if meta and meta.get('movie_id'))
+        return movie_ids
+
+    def apply_diff(self, movie_id: str, documents: List[str], metadatas: List[Dict], diff: Dict[str, List]):
+        """Apply the metadata updates and deletions of a diff; new documents are left to the caller to embed."""
+        if diff['changed']:
+            self.update_metadatas(
+                [document_id(movie_id, documents[i]) for i in diff['changed']],
+                [metadatas[i] for i in diff['changed']],
+            )
+        if diff['stale']:
+            self.delete(diff['stale'])
+
+    def sync_documents(
+        self,
+        movie_id: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        embed: Optional[Callable[[List[str]], Embeddings]] = None,
+    ) -> Dict[str, int]:
+        """
+        Make the collection hold exactly this movie's current reviews.
+
+        New reviews are embedded and upserted, reviews whose metadata
+        changed are updated in place and reviews that are gone are
+        deleted; unchanged reviews are not touched (or re-embedded).
+
+        Args:
+            movie_id: IMDb ID the documents belong to.
+            documents: The movie's cleaned reviews.
+            metadatas: Metadata for each document.
+            embed: Turns a list of texts into embeddings (e.g.
+                ``EmbeddingModel.encode_array``); the collection's own
+                embedding function is used when omitted.
+
+        Returns:
+            Number of documents added, updated, deleted and unchanged.
+        """
+        diff = self.diff_documents(movie_id, documents, metadatas)
+        self.apply_diff(movie_id, documents, metadatas, diff)
+        if diff['new']:
+            new_documents = [documents[i] for i in diff['new']]
+            self.add_documents(
+                documents=new_documents,
+                metadatas=[metadatas[i] for i in diff['new']],
+                embeddings=embed(new_documents) if embed else None,
+                ids=[document_id(movie_id, doc) for doc in new_documents],
+            )
+        return {
+            'added': len(diff['new']),
+            'updated': len(diff['changed']),
+            'deleted': len(diff['stale']),
+            'unchanged': diff['unchanged'],
+        }
+
     def query(self, query_text: str, n_results: int = 5, where: Optional[Dict] = None):
         """
         Query the collection for similar documents.
@@ -64,6 +297,24 @@ class VectorStore:
             where=where
         )
 
+    def query_embeddings(self, embeddings: Embeddings, n_results: int = 5, where: Optional[Dict] = None):
+        """
+        Query the collection with precomputed embeddings.
+
+        Args:
+            embeddings: Query vectors, e.g. a float32 array of shape (q, dim).
+            n_results: Number of results to return per query.
+            where: Optional filtering criteria.
+
+        Returns:
+            Query results dictionary (one result list per query vector).
+        """
+        return self.collection.query(
+            query_embeddings=embeddings,
+            n_results=n_results,
+            where=where
+        )
+
     def count(self):
         """Return total number of documents in collection."""
         return self.collection.count()
@@ -0,0 +1,181 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Stage = Tuple[str, Callable[[Iterator], Iterator]]
+
+_DONE = object()
+
+class StageStats:
+    """Counters of one stage: items, and where its thread spent the run."""
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.starved = 0.0   # waiting for input
+        self.blocked = 0.0   # waiting for room downstream (backpressure)
+        self.elapsed = 0.0
+        self.depth_sum = 0   # output queue depth, sampled after each put
+        self.depth_max = 0
+
+    @property
+    def busy(self) -> float:
+        return max(self.elapsed - self.starved - self.blocked, 0.0)
+
+    def to_dict(self) -> Dict:
+        return {
+            'stage': self.name,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'busy_seconds': self.busy,
+            'starved_seconds': self.starved,
+            'blocked_seconds': self.blocked,
+            'items_per_busy_sec': self.items_in / self.busy if self.busy else 0.0,
+            'queue_depth_mean': self.depth_sum / self.items_out if self.items_out else 0.0,
+            'queue_depth_max': self.depth_max,
+        }
+
+class StreamingPipeline:
+    """
+    A chain of generator stages, each in its own thread, joined by bounded queues.
+
+    A stage is ``(name, func)`` where ``func`` takes an iterator of inputs
+    and yields outputs, so it can batch, filter or fan out as it likes.
+    Queues hold at most ``queue_size`` items, so a slow stage makes the ones
+    before it wait instead of piling up data in memory. Every stage records
+    how long it was busy, starved (waiting for input) and blocked (waiting
+    for room downstream); the busiest stage is the bottleneck.
+    """
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        """
+        Args:
+            stages: ``(name, func)`` pairs, in order.
+            queue_size: Items buffered between two stages.
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats = [StageStats(name) for name, _ in stages]
+
+    def run(self, source: Iterable) -> Iterator:
+        """
+        Feed ``source`` to the first stage and yield the last stage's outputs.
+
+        An exception in any stage stops the others and is re-raised here;
+        closing the generator early stops them too.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def put(index: int, item) -> bool:
+            while not stop.is_set():
+                try:
+                    queues[index].put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def receive(index: int) -> Iterator:
+            stats = self.stats[index]
+            while True:
+                start = time.perf_counter()
+                while True:
+                    if stop.is_set():
+                        return
+                    try:
+                        item = queues[index - 1].get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        continue
+                stats.starved += time.perf_counter() - start
+                if item is _DONE:
+                    return
+                stats.items_in += 1
+                yield item
+
+        def counted(items: Iterable) -> Iterator:
+            stats = self.stats[0]
+            iterator = iter(items)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    stats.starved += time.perf_counter() - start
+                stats.items_in += 1
+                yield item
+
+        def work(index: int, func: Callable[[Iterator], Iterator]):
+            stats = self.stats[index]
+            start = time.perf_counter()
+            outputs = None
+            try:
+                outputs = func(counted(source) if index == 0 else receive(index))
+                for item in outputs:
+                    put_start = time.perf_counter()
+                    if not put(index, item):
+                        break
+                    stats.blocked += time.perf_counter() - put_start
+                    stats.items_out += 1
+                    depth = queues[index].qsize()
+                    stats.depth_sum += depth
+                    stats.depth_max = max(stats.depth_max, depth)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                if hasattr(outputs, 'close'):
+                    outputs.close()
+                put(index, _DONE)
+                stats.elapsed = time.perf_counter() - start
+
+        threads = [
+            threading.Thread(target=work, args=(index, func), name=f"stage-{name}", daemon=True)
+            for index, (name, func) in enumerate(self.stages)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while not errors:
+                try:
+                    item = queues[-1].get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        break
+                    continue
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
+    def bottleneck(self) -> Optional[StageStats]:
+        """The stage that was busy the longest."""
+        ran = [stats for stats in self.stats if stats.elapsed]
+        return max(ran, key=lambda stats: stats.busy) if ran else None
+
+    def report(self) -> str:
+        """Per-stage throughput, time split and output queue depth."""
+        lines = [f"{'stage':<10} {'in':>8} {'out':>8} {'items/s':>9} {'busy':>6} {'starved':>8} {'blocked':>8} {'queue':>9}"]
+        for stats in self.stats:
+            row = stats.to_dict()
+            share = lambda seconds: f"{seconds / stats.elapsed:.0%}" if stats.elapsed else "-"
+            lines.append(
+                f"{stats.name:<10} {stats.items_in:>8} {stats.items_out:>8} {row['items_per_busy_sec']:>9.1f} "
+                f"{share(stats.busy):>6} {share(stats.starved):>8} {share(stats.blocked):>8} "
+                f"{row['queue_depth_mean']:>4.1f}/{stats.depth_max:<4}"
+            )
+        bottleneck = self.bottleneck()
+        if bottleneck:
+            lines.append(f"Bottleneck: {bottleneck.name} (busy {bottleneck.busy:.1f}s of {bottleneck.elapsed:.1f}s)")
+        return "\n".join(lines)
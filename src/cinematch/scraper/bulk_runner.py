@@ -1,19 +1,59 @@
 import argparse
 import time
 import random
-import requests
-from bs4 import BeautifulSoup
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+from cinematch.scraper.rate_limiter import HostRateLimiter
+from cinematch.scraper.http_cache import ResponseCache
+from cinematch.scraper.transport import Transport
+from cinematch.scraper.resolution_cache import ResolutionCache
+from cinematch.scraper.title_index import TitleIndex
+from cinematch.scraper.job_manifest import JobManifest, PENDING, RESOLVED, DETAILS_DONE, REVIEWS_DONE
+from cinematch.scraper.dataset_store import DatasetWriter, compact
+from cinematch.scraper.metrics import ScrapeMetrics
+from cinematch.scraper.refresh_scheduler import RefreshScheduler, ReviewCounter, load_from_dataset, load_from_json_dir, load_from_manifest
+from cinematch.scraper.utils import make_soup
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 class BulkScraper:
-    def __init__(self):
-        self.scraper = IMDbScraperDDGS()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.5'
-        }
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None, cache: Optional[ResponseCache] = None, pool_size: int = 16, resolution_cache: Optional[ResolutionCache] = None, title_index: Optional[TitleIndex] = None, manifest: Optional[JobManifest] = None, dataset_writer: Optional[DatasetWriter] = None, review_limit: Optional[int] = None, metrics: Optional[ScrapeMetrics] = None, metrics_path: Optional[Path] = None):
+        """
+        Args:
+            rate_limits: Optional per-host request rates (requests/second)
+                used by the concurrent mode. Defaults to the polite rates
+                in ``rate_limiter.DEFAULT_HOST_RATES``.
+            cache: Optional on-disk response cache shared by all workers.
+            pool_size: Keep-alive connections per host in the shared transport.
+            resolution_cache: Optional persistent title -> IMDb ID cache.
+            title_index: Optional offline IMDb title index tried before DDGS.
+            manifest: Optional durable job manifest. When set, runs are
+                resumable per stage instead of skipping on existing JSON files.
+            dataset_writer: Optional columnar dataset writer. When set, movies
+                are appended to it instead of written as JSON + CSV files.
+            review_limit: When set, user reviews are harvested from IMDb's
+                paginated review pages (up to this many per title) instead
+                of taken from DDGS search snippets. Manifest runs only.
+            metrics: Metrics sink shared by the transport and all workers
+                (a fresh one by default); summarised at the end of ``run``.
+            metrics_path: Optional JSON-lines file the final metrics
+                snapshot of each run is appended to.
+        """
+        self.rate_limiter = HostRateLimiter(rate_limits)
+        self.cache = cache
+        self.resolution_cache = resolution_cache
+        self.title_index = title_index
+        self.manifest = manifest
+        self.dataset_writer = dataset_writer
+        self.save_format = 'dataset' if dataset_writer else 'both'
+        self.review_limit = review_limit
+        self.metrics = metrics or ScrapeMetrics()
+        self.metrics_path = metrics_path
+        self.transport = Transport(rate_limiter=self.rate_limiter, cache=cache, pool_maxsize=pool_size, metrics=self.metrics)
+        self.scraper = IMDbScraperDDGS(transport=self.transport, resolution_cache=resolution_cache, title_index=title_index, dataset_writer=dataset_writer)
+        self._local = threading.local()
 
     def fetch_top_movies(self, limit: int = 50) -> List[str]:
         """
@@ -24,9 +64,9 @@ class BulkScraper:
         titles = []
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Modern IMDb Chart Selectors
             # Look for <h3> inside logic (ipc-title__text)
@@ -63,47 +103,342 @@ class BulkScraper:
         print(f"✅ Found {len(titles)} titles to scrape.")
         return titles
 
-    def run(self, limit: int = 10, delay_range: tuple = (2, 5)):
+    def _worker_scraper(self) -> IMDbScraperDDGS:
+        """Return this thread's scraper (DDGS clients are not shared between threads)."""
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = IMDbScraperDDGS(transport=self.transport, resolution_cache=self.resolution_cache, title_index=self.title_index, dataset_writer=self.dataset_writer)
+            self._local.scraper = scraper
+        return scraper
+
+    def _process_title(self, scraper: IMDbScraperDDGS, title: str) -> str:
+        """
+        Scrape and save a single title.
+
+        Returns:
+            'skipped', 'saved' or 'failed'.
+        """
+        # Check for existing
+        safe_title = title.replace(' ', '_')
+        if Path(f"data/json/imdb_data_{safe_title}.json").exists():
+            print(f"⏭️  Skipping {title} (Already exists)")
+            return 'skipped'
+
+        # Scrape
+        data = scraper.scrape_comprehensive_movie_data(title)
+
+        if 'error' not in data:
+            scraper.save_movie_data(data, format=self.save_format)
+            return 'saved'
+
+        print(f"❌ Failed to scrape {title}: {data['error']}")
+        return 'failed'
+
+    def _process_job(self, scraper: IMDbScraperDDGS, job: Dict) -> str:
+        """
+        Run the outstanding stages of a manifest job, recording each completed stage.
+
+        Returns:
+            'saved' or 'failed'.
+        """
+        title = job['title']
+        stage = job['stage']
+        movie_data = job['payload']
+
+        try:
+            if stage == PENDING:
+                with self.metrics.timer('stage_seconds', stage='search'):
+                    movie_info = scraper.searcher.improved_search_movie(title)
+                if not movie_info:
+                    raise RuntimeError(f'Movie "{title}" not found')
+                movie_data = {'search_info': movie_info}
+                self.manifest.advance(title, RESOLVED, imdb_id=movie_info['imdb_id'], payload=movie_data)
+                stage = RESOLVED
+
+            if stage == RESOLVED:
+                with self.metrics.timer('stage_seconds', stage='details'):
+                    details = scraper.get_movie_details(movie_data['search_info']['imdb_id'])
+                if 'error' in details:
+                    raise RuntimeError(details['error'])
+                details['search_info'] = movie_data['search_info']
+                movie_data = details
+                self.manifest.advance(title, DETAILS_DONE, payload=movie_data)
+                stage = DETAILS_DONE
+
+            if stage == DETAILS_DONE:
+                search_info = movie_data.pop('search_info')
+                harvested = None
+                if self.review_limit:
+                    # Streamed page by page into the outputs while saving; only counts are kept
+                    counter = ReviewCounter(movie_data.get('scraped_at'))
+                    harvested = counter.wrap(scraper.harvest_reviews(search_info['imdb_id'], max_reviews=self.review_limit))
+                else:
+                    with self.metrics.timer('stage_seconds', stage='user_reviews'):
+                        movie_data['user_reviews'] = scraper.get_reviews_via_ddgs(title, 15)
+                with self.metrics.timer('stage_seconds', stage='featured_reviews'):
+                    movie_data['featured_reviews'] = scraper.get_featured_reviews_via_ddgs(title, 10)
+                movie_data['search_info'] = search_info
+                with self.metrics.timer('stage_seconds', stage='user_reviews' if harvested is not None else 'save'):
+                    scraper.save_movie_data(movie_data, format=self.save_format, user_reviews=harvested)
+                if harvested is not None:
+                    movie_data['user_review_count'] = counter.count
+                    movie_data['review_velocity'] = counter.velocity
+                self.manifest.advance(title, REVIEWS_DONE, payload=movie_data, scraped_at=movie_data.get('scraped_at'))
+
+            return 'saved'
+
+        except Exception as e:
+            print(f"❌ Failed to scrape {title} at stage '{stage}': {e}")
+            self.manifest.fail(title, str(e))
+            return 'failed'
+
+        finally:
+            self.manifest.release(title)
+
+    def _import_existing(self, titles: List[str]):
+        """Mark pending titles that already have a saved JSON file as complete."""
+        for title in titles:
+            job = self.manifest.get(title)
+            path = Path(f"data/json/imdb_data_{title.replace(' ', '_')}.json")
+            if job and job['state'] == PENDING and path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    movie_data = json.load(f)
+                self.manifest.advance(title, REVIEWS_DONE, imdb_id=movie_data.get('imdb_id'), scraped_at=movie_data.get('scraped_at'))
+
+    def _sleep(self, delay_range: tuple):
+        """Respectful delay between movies, recorded as the 'sleep' stage."""
+        sleep_time = random.uniform(*delay_range)
+        print(f"💤 Sleeping for {sleep_time:.1f}s...")
+        with self.metrics.timer('stage_seconds', stage='sleep'):
+            time.sleep(sleep_time)
+
+    @staticmethod
+    def _report_throughput(counts: Dict[str, int], elapsed: float):
+        """Print a run summary including throughput in movies per minute."""
+        scraped = counts['saved'] + counts['failed']
+        per_minute = scraped / (elapsed / 60) if elapsed > 0 else 0.0
+        print(
+            f"\n📈 Done in {elapsed:.1f}s: {counts['saved']} saved, "
+            f"{counts['failed']} failed, {counts['skipped']} skipped "
+            f"({per_minute:.2f} movies/min)"
+        )
+
+    def run(self, limit: int = 10, delay_range: tuple = (2, 5), workers: int = 1, resume_all: bool = False) -> Dict[str, int]:
         """
         Run the bulk scraping process.
+
+        Args:
+            limit: Number of movies to scrape.
+            delay_range: Sleep range (seconds) between movies in sequential mode.
+            workers: Number of concurrent workers. With more than one worker
+                the fixed sleeps are replaced by per-host token-bucket limits.
+            resume_all: With a manifest, also finish every title left
+                outstanding by earlier runs, not just this run's titles.
+
+        Returns:
+            Counts of 'saved', 'failed' and 'skipped' titles.
         """
-        print(f"🚀 Starting Bulk Scrape (Limit: {limit})")
+        print(f"🚀 Starting Bulk Scrape (Limit: {limit}, Workers: {workers})")
         
         # 1. Get List
         titles = self.fetch_top_movies(limit)
-        
+        return self._scrape(titles, workers, delay_range, resume_all)
+
+    def refresh(self, budget: int, scheduler: Optional[RefreshScheduler] = None, source: str = 'manifest', delay_range: tuple = (2, 5), workers: int = 1) -> Dict[str, int]:
+        """
+        Re-scrape the stalest, most valuable titles that fit in a request budget.
+
+        Only the planned titles are claimed from the manifest; jobs left
+        outstanding by earlier runs are not touched, so the budget holds.
+
+        Args:
+            budget: Maximum number of requests to spend on this refresh.
+            scheduler: Ranking policy (defaults to ``RefreshScheduler()``).
+            source: Where saved movie data is read from: 'manifest', 'json'
+                (``data/json``) or 'dataset' (the columnar datasets).
+            delay_range: Sleep range (seconds) between movies with one worker.
+            workers: Number of concurrent workers.
+
+        Returns:
+            Counts of 'saved', 'failed' and 'skipped' titles.
+        """
+        if not self.manifest:
+            raise ValueError("Refreshing requires a job manifest")
+        scheduler = scheduler or RefreshScheduler()
+
+        if source == 'manifest':
+            entries = load_from_manifest(self.manifest)
+        elif source == 'json':
+            entries = load_from_json_dir()
+        elif source == 'dataset':
+            entries = load_from_dataset(self.dataset_writer.root if self.dataset_writer else Path("data/dataset"))
+        else:
+            raise ValueError(f"Unknown refresh source: {source}")
+
+        plan = scheduler.plan(entries, budget)
+        print(f"🔄 Refreshing {len(plan)} of {len(entries)} saved titles (budget: {budget} requests)")
+        for entry in plan:
+            age = (scheduler.now - entry['scraped_at']).days
+            print(f"   • {entry['title']} (age {age}d, priority {entry['priority']:.2f})")
+            if entry['imdb_id']:
+                # The ID is known: resume after the search stage
+                search_info = {'imdb_id': entry['imdb_id'], 'title': entry['title']}
+                self.manifest.requeue(entry['title'], RESOLVED, imdb_id=entry['imdb_id'], payload={'search_info': search_info})
+            else:
+                self.manifest.requeue(entry['title'])
+
+        return self._scrape([entry['title'] for entry in plan], workers, delay_range)
+
+    def _scrape(self, titles: List[str], workers: int, delay_range: tuple, resume_all: bool = False) -> Dict[str, int]:
+        """Scrape ``titles`` with the configured mode and print the run summary."""
+        counts = {'saved': 0, 'failed': 0, 'skipped': 0}
+        start = time.perf_counter()
+
         # 2. Iterate
+        try:
+            if self.manifest:
+                self._run_manifest(titles, workers, delay_range, counts, resume_all)
+            elif workers > 1:
+                self._run_concurrent(titles, workers, counts)
+            else:
+                self._run_sequential(titles, delay_range, counts)
+        finally:
+            if self.dataset_writer:
+                self.dataset_writer.flush()
+
+        self._report_throughput(counts, time.perf_counter() - start)
+        if self.cache:
+            print(f"🗄️  HTTP cache hit rate: {self.cache.hit_rate():.0%} ({self.cache.stats})")
+        if self.resolution_cache:
+            print(f"🔖 Resolution cache hit rate: {self.resolution_cache.hit_rate():.0%} ({self.resolution_cache.stats})")
+        if self.manifest:
+            print(f"📋 Manifest: {self.manifest.summary()}")
+        if self.dataset_writer:
+            print(f"🧱 Dataset: {self.dataset_writer.movies_written} movies appended to {self.dataset_writer.root}")
+        for status, count in counts.items():
+            self.metrics.inc('titles_total', count, status=status)
+        print(self.metrics.report())
+        if self.metrics_path:
+            self.metrics.write_jsonl(self.metrics_path)
+            print(f"📝 Metrics snapshot appended to: {self.metrics_path}")
+        return counts
+
+    def _run_sequential(self, titles: List[str], delay_range: tuple, counts: Dict[str, int]):
         for i, title in enumerate(titles, 1):
             print(f"\n[{i}/{len(titles)}] Processing: {title}")
             
             try:
-                # Check for existing
-                safe_title = title.replace(' ', '_')
-                if Path(f"data/json/imdb_data_{safe_title}.json").exists():
-                    print(f"⏭️  Skipping {title} (Already exists)")
+                status = self._process_title(self.scraper, title)
+                counts[status] += 1
+                if status == 'skipped':
                     continue
                 
-                # Scrape
-                data = self.scraper.scrape_comprehensive_movie_data(title)
-                
-                if 'error' not in data:
-                    self.scraper.save_movie_data(data, format='both')
-                else:
-                    print(f"❌ Failed to scrape {title}: {data['error']}")
-                
                 # Respectful Delay
-                sleep_time = random.uniform(*delay_range)
-                print(f"💤 Sleeping for {sleep_time:.1f}s...")
-                time.sleep(sleep_time)
+                self._sleep(delay_range)
                 
             except Exception as e:
                 print(f"❌ Critical error on {title}: {e}")
+                counts['failed'] += 1
                 continue
 
+    def _run_concurrent(self, titles: List[str], workers: int, counts: Dict[str, int]):
+        def task(title: str) -> str:
+            return self._process_title(self._worker_scraper(), title)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+            futures = {pool.submit(task, title): title for title in titles}
+            for done, future in enumerate(as_completed(futures), 1):
+                title = futures[future]
+                try:
+                    status = future.result()
+                except Exception as e:
+                    print(f"❌ Critical error on {title}: {e}")
+                    status = 'failed'
+                counts[status] += 1
+                print(f"[{done}/{len(titles)}] {title}: {status}")
+
+    def _run_manifest(self, titles: List[str], workers: int, delay_range: tuple, counts: Dict[str, int], resume_all: bool = False):
+        """
+        Let workers claim outstanding jobs among ``titles`` until none are left.
+
+        With ``resume_all`` every outstanding job in the manifest is claimable,
+        including titles left over from earlier runs.
+        """
+        self.manifest.add_titles(titles)
+        self._import_existing(titles)
+        self.manifest.reset_claims()
+        counts['skipped'] = sum(1 for t in titles if self.manifest.get(t)['state'] == REVIEWS_DONE)
+        counts_lock = threading.Lock()
+        scope = None if resume_all else titles
+
+        def worker(worker_id: str):
+            scraper = self._worker_scraper()
+            while True:
+                job = self.manifest.claim(worker_id, scope)
+                if job is None:
+                    return
+                print(f"\n▶️  [{worker_id}] {job['title']} (from stage: {job['stage']})")
+                status = self._process_job(scraper, job)
+                with counts_lock:
+                    counts[status] += 1
+
+                if workers == 1:
+                    # Respectful Delay
+                    self._sleep(delay_range)
+
+        if workers == 1:
+            worker("worker-0")
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+            for future in [pool.submit(worker, f"worker-{i}") for i in range(workers)]:
+                future.result()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Bulk scrape IMDb movies")
     parser.add_argument("--limit", type=int, default=10, help="Number of movies to scrape")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent workers (rate limited per host)")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Enable the on-disk HTTP response cache in this directory")
+    parser.add_argument("--replay", action="store_true", help="Serve IMDb pages only from the response cache (no network)")
+    parser.add_argument("--title-index", type=Path, default=None, help="Offline title index directory (see cinematch.scraper.title_index)")
+    parser.add_argument("--manifest", type=Path, default=Path("data/scrape_manifest.sqlite"), help="Job manifest used to resume interrupted runs")
+    parser.add_argument("--no-manifest", action="store_true", help="Skip titles by existing JSON files instead of using the manifest")
+    parser.add_argument("--retry-failed", action="store_true", help="Give titles marked as failed in the manifest another set of retries")
+    parser.add_argument("--resume-all", action="store_true", help="Also finish every title left outstanding in the manifest by earlier runs")
+    parser.add_argument("--output", choices=["files", "dataset"], default="files", help="Save JSON + CSV files per movie, or append to columnar datasets")
+    parser.add_argument("--dataset-dir", type=Path, default=Path("data/dataset"), help="Root directory of the columnar datasets")
+    parser.add_argument("--file-format", choices=["parquet", "arrow"], default="parquet", help="Dataset file format")
+    parser.add_argument("--compact", action="store_true", help="Compact the datasets after the run")
+    parser.add_argument("--review-limit", type=int, default=None, help="Harvest up to this many full IMDb reviews per title instead of DDGS snippets")
+    parser.add_argument("--metrics-jsonl", type=Path, default=None, help="Append the run's metrics snapshot to this JSON-lines file")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port at /metrics during the run")
+    parser.add_argument("--refresh-budget", type=int, default=None, help="Instead of a new crawl, refresh the stalest saved titles within this many requests")
+    parser.add_argument("--refresh-source", choices=["manifest", "json", "dataset"], default="manifest", help="Where saved movies are read from for --refresh-budget")
+    parser.add_argument("--no-resolution-cache", action="store_true", help="Always search DDGS for IMDb IDs instead of reusing past resolutions")
     args = parser.parse_args()
     
-    scraper = BulkScraper()
-    scraper.run(limit=args.limit)
+    cache = None
+    if args.cache_dir or args.replay:
+        cache = ResponseCache(args.cache_dir or Path("data/http_cache"), replay=args.replay)
+
+    resolution_cache = None if args.no_resolution_cache else ResolutionCache()
+    title_index = TitleIndex(args.title_index) if args.title_index else None
+    manifest = None if args.no_manifest else JobManifest(args.manifest)
+    if manifest and args.retry_failed:
+        print(f"🔁 Retrying {manifest.retry_failed()} failed titles")
+
+    dataset_writer = DatasetWriter(args.dataset_dir, file_format=args.file_format) if args.output == "dataset" else None
+
+    metrics = ScrapeMetrics()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        print(f"📡 Prometheus metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+
+    scraper = BulkScraper(cache=cache, pool_size=max(16, args.workers), resolution_cache=resolution_cache, title_index=title_index, manifest=manifest, dataset_writer=dataset_writer, review_limit=args.review_limit, metrics=metrics, metrics_path=args.metrics_jsonl)
+    if args.refresh_budget is not None:
+        scraper.refresh(args.refresh_budget, source=args.refresh_source, workers=args.workers)
+    else:
+        scraper.run(limit=args.limit, workers=args.workers, resume_all=args.resume_all)
+
+    if dataset_writer and args.compact:
+        print(f"🧹 Compacted dataset rows: {compact(args.dataset_dir)}")
@@ -0,0 +1,456 @@
+"""
+dataset_store.py
+----------------
+
+Append-only columnar storage for scraped movies.
+
+Instead of one JSON file plus three CSVs per movie, movies, cast and
+reviews are appended to three typed datasets (Parquet or Arrow IPC):
+
+    <root>/movies/scrape_month=2026-10/part-....parquet
+    <root>/cast/scrape_month=2026-10/part-....parquet
+    <root>/reviews/scrape_month=2026-10/part-....parquet
+
+Rows are buffered in memory and written as one part file per table and
+partition on ``flush``. Nested fields keep their structure (genres and
+keywords are list columns, details / box office / tech specs are map
+columns) rather than being JSON-encoded into cells. ``compact`` merges
+the part files of each table and drops rows superseded by a later scrape
+of the same movie, and ``read_table`` loads only the requested columns.
+
+Requires the optional ``pyarrow`` dependency.
+"""
+
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DEFAULT_DATASET_DIR = Path("data/dataset")
+TABLES = ("movies", "cast", "reviews")
+PARTITION_KEY = "scrape_month"
+
+_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+_DATASET_FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+_COUNT_RE = re.compile(r'^([\d.,]+)\s*([KMB]?)$', re.I)
+_MULTIPLIERS = {'': 1, 'K': 10 ** 3, 'M': 10 ** 6, 'B': 10 ** 9}
+
+_schemas: Dict[str, "pa.Schema"] = {}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Columnar dataset output requires pyarrow (pip install pyarrow)")
+
+
+def schema(table: str) -> "pa.Schema":
+    """Arrow schema of one of the ``TABLES``."""
+    _require_pyarrow()
+    if not _schemas:
+        strings = pa.list_(pa.string())
+        _schemas["movies"] = pa.schema([
+            ("imdb_id", pa.string()),
+            ("title", pa.string()),
+            ("year", pa.int16()),
+            ("duration", pa.string()),
+            ("imdb_rating", pa.float32()),
+            ("rating_count", pa.int64()),
+            ("content_rating", pa.string()),
+            ("summary", pa.string()),
+            ("synopsis", pa.string()),
+            ("tagline", pa.string()),
+            ("genres", strings),
+            ("keywords", strings),
+            ("details", pa.map_(pa.string(), strings)),
+            ("box_office", pa.map_(pa.string(), pa.string())),
+            ("technical_specs", pa.map_(pa.string(), pa.string())),
+            ("url", pa.string()),
+            ("scraped_at", pa.timestamp("s")),
+        ])
+        _schemas["cast"] = pa.schema([
+            ("imdb_id", pa.string()),
+            ("position", pa.int16()),
+            ("actor", pa.string()),
+            ("character", pa.string()),
+            ("scraped_at", pa.timestamp("s")),
+        ])
+        _schemas["reviews"] = pa.schema([
+            ("imdb_id", pa.string()),
+            ("review_type", pa.string()),
+            ("position", pa.int16()),
+            ("title", pa.string()),
+            ("content", pa.string()),
+            ("url", pa.string()),
+            ("rating", pa.int8()),
+            ("source", pa.string()),
+            ("author", pa.string()),
+            ("review_date", pa.date32()),
+            ("helpful_votes", pa.int32()),
+            ("scraped_at", pa.timestamp("s")),
+        ])
+    return _schemas[table]
+
+
+def parse_number(value) -> Optional[int]:
+    """Parse display numbers such as ``1999``, ``2,134,567`` or ``2.1M``."""
+    if value is None or isinstance(value, int):
+        return value
+    match = _COUNT_RE.match(str(value).strip())
+    if not match:
+        return None
+    try:
+        return int(float(match.group(1).replace(',', '')) * _MULTIPLIERS[match.group(2).upper()])
+    except ValueError:
+        return None
+
+
+def _bounded(value, bits: int) -> Optional[int]:
+    """``value`` as an int if it fits a signed ``bits``-bit column, else None."""
+    number = parse_number(value) if not isinstance(value, bool) else None
+    limit = 1 << (bits - 1)
+    return number if number is not None and -limit <= number < limit else None
+
+
+def _parse_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return datetime.now().replace(microsecond=0)
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+
+
+def _string_map(value: Optional[Dict]) -> List[tuple]:
+    return [(str(k), str(v)) for k, v in (value or {}).items() if v is not None]
+
+
+def movie_rows(movie_data: Dict) -> Dict[str, List[Dict]]:
+    """
+    Split one ``movie_data`` dict into typed rows for each table.
+
+    Integers that do not fit their column (e.g. a rating of 300 in the
+    int8 ``rating`` column) are stored as nulls rather than failing the
+    whole part file on flush.
+
+    Args:
+        movie_data: A movie as returned by ``scrape_comprehensive_movie_data``.
+
+    Returns:
+        Rows keyed by table name.
+    """
+    imdb_id = movie_data.get('imdb_id')
+    scraped_at = _parse_timestamp(movie_data.get('scraped_at'))
+    storyline = movie_data.get('storyline') or {}
+
+    movie = {
+        'imdb_id': imdb_id,
+        'title': movie_data.get('title'),
+        'year': _bounded(movie_data.get('year'), 16),
+        'duration': movie_data.get('duration'),
+        'imdb_rating': _parse_float(movie_data.get('imdb_rating')),
+        'rating_count': parse_number(movie_data.get('rating_count')),
+        'content_rating': movie_data.get('content_rating'),
+        'summary': movie_data.get('summary'),
+        'synopsis': movie_data.get('synopsis'),
+        'tagline': storyline.get('tagline'),
+        'genres': _as_list(storyline.get('genres')),
+        'keywords': _as_list(storyline.get('keywords')),
+        'details': [(str(k), _as_list(v)) for k, v in (movie_data.get('details') or {}).items()],
+        'box_office': _string_map(movie_data.get('box_office')),
+        'technical_specs': _string_map(movie_data.get('technical_specs')),
+        'url': movie_data.get('url'),
+        'scraped_at': scraped_at,
+    }
+
+    cast = [
+        {
+            'imdb_id': imdb_id,
+            'position': _bounded(position, 16),
+            'actor': member.get('actor'),
+            'character': member.get('character'),
+            'scraped_at': scraped_at,
+        }
+        for position, member in enumerate(movie_data.get('cast') or [])
+    ]
+
+    reviews = []
+    for key, default_type in (('user_reviews', 'user'), ('featured_reviews', 'critic')):
+        reviews.extend(review_rows(imdb_id, movie_data.get(key) or [], scraped_at, default_type))
+
+    return {'movies': [movie], 'cast': cast, 'reviews': reviews}
+
+
+def review_rows(imdb_id: Optional[str], reviews: Iterable[Dict], scraped_at, default_type: str = 'user') -> Iterator[Dict]:
+    """
+    Typed ``reviews`` rows, one per review, lazily.
+
+    Args:
+        imdb_id: Movie the reviews belong to.
+        reviews: Review dicts (DDGS snippets or harvested IMDb reviews).
+        scraped_at: Scrape time of the movie (a datetime or ``%Y-%m-%d %H:%M:%S``).
+        default_type: ``review_type`` of reviews without a ``type``.
+    """
+    scraped_at = _parse_timestamp(scraped_at)
+    for position, review in enumerate(reviews):
+        yield {
+            'imdb_id': imdb_id,
+            'review_type': review.get('type', default_type),
+            'position': _bounded(position, 16),
+            'title': review.get('title'),
+            'content': review.get('content'),
+            'url': review.get('url'),
+            'rating': _bounded(review.get('rating'), 8),
+            'source': review.get('source'),
+            'author': review.get('author'),
+            'review_date': date.fromisoformat(review['date']) if review.get('date') else None,
+            'helpful_votes': _bounded(review.get('helpful_votes'), 32),
+            'scraped_at': scraped_at,
+        }
+
+
+def _write_file(table: "pa.Table", path: Path, file_format: str):
+    """Write ``table`` to a hidden temp file, then rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    if file_format == "parquet":
+        pq.write_table(table, tmp, compression="zstd")
+    else:
+        feather.write_feather(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def _part_name(file_format: str) -> str:
+    return f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}{_EXTENSIONS[file_format]}"
+
+
+def _data_files(table_dir: Path) -> Dict[str, List[Path]]:
+    """Part files of a table by format (hidden temp files excluded)."""
+    files = {}
+    for file_format, extension in _EXTENSIONS.items():
+        paths = sorted(p for p in table_dir.rglob(f"*{extension}") if not p.name.startswith('.'))
+        if paths:
+            files[file_format] = paths
+    return files
+
+
+def _detect_format(table_dir: Path) -> str:
+    return next(iter(_data_files(table_dir)), "parquet")
+
+
+class DatasetWriter:
+    """
+    Buffered, thread-safe appender for the movies / cast / reviews datasets.
+    """
+
+    def __init__(self, root: Path = DEFAULT_DATASET_DIR, file_format: str = "parquet", flush_every: int = 100, max_buffered_rows: int = 50_000):
+        """
+        Args:
+            root: Dataset root directory (one sub-directory per table).
+            file_format: ``parquet`` or ``arrow`` (Arrow IPC / Feather v2).
+            flush_every: Movies buffered before a part file is written.
+            max_buffered_rows: Rows (of all tables) buffered before a part
+                file is written regardless of ``flush_every``, so a title
+                with a huge review stream cannot grow the buffer unbounded.
+        """
+        _require_pyarrow()
+        if file_format not in _EXTENSIONS:
+            raise ValueError(f"Unknown file format: {file_format}")
+        self.root = Path(root)
+        self.file_format = file_format
+        self.flush_every = flush_every
+        self.max_buffered_rows = max_buffered_rows
+        self.movies_written = 0
+
+        self._lock = threading.Lock()
+        self._buffer: Dict[str, List[Dict]] = {name: [] for name in TABLES}
+        self._buffered_movies = 0
+
+    def append(self, movie_data: Dict):
+        """Buffer one movie; flushes automatically every ``flush_every`` movies."""
+        rows = movie_rows(movie_data)
+        with self._lock:
+            for name in TABLES:
+                self._buffer[name].extend(rows[name])
+            self._buffered_movies += 1
+            if self._buffered_movies >= self.flush_every or self._buffered_rows() >= self.max_buffered_rows:
+                self._flush_locked()
+
+    def append_reviews(self, imdb_id: Optional[str], reviews: Iterable[Dict], scraped_at, default_type: str = 'user') -> int:
+        """
+        Stream reviews of an already appended movie into the reviews table.
+
+        Reviews are consumed one at a time and flushed every
+        ``max_buffered_rows`` rows, so the stream is never held in memory.
+        Use the movie's ``scraped_at`` so compaction keeps them with it.
+
+        Returns:
+            Number of reviews appended.
+        """
+        count = 0
+        for row in review_rows(imdb_id, reviews, scraped_at, default_type):
+            with self._lock:
+                self._buffer['reviews'].append(row)
+                if self._buffered_rows() >= self.max_buffered_rows:
+                    self._flush_locked()
+            count += 1
+        return count
+
+    def _buffered_rows(self) -> int:
+        return sum(len(rows) for rows in self._buffer.values())
+
+    def flush(self) -> int:
+        """
+        Write buffered rows as one part file per table and partition.
+
+        Returns:
+            Number of movies written.
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        flushed = self._buffered_movies
+        # Convert everything first so a bad value leaves the buffers untouched
+        parts = []
+        for name in TABLES:
+            partitions: Dict[str, List[Dict]] = {}
+            for row in self._buffer[name]:
+                partitions.setdefault(row['scraped_at'].strftime('%Y-%m'), []).append(row)
+            for month, part_rows in partitions.items():
+                parts.append((name, month, part_rows, pa.Table.from_pylist(part_rows, schema=schema(name))))
+
+        for name in TABLES:
+            self._buffer[name] = []
+        for i, (name, month, _, table) in enumerate(parts):
+            path = self.root / name / f"{PARTITION_KEY}={month}" / _part_name(self.file_format)
+            try:
+                _write_file(table, path, self.file_format)
+            except BaseException:
+                # Put back the rows of this and every later part; written parts stay written
+                for name, _, part_rows, _ in parts[i:]:
+                    self._buffer[name].extend(part_rows)
+                raise
+        self._buffered_movies = 0
+        self.movies_written += flushed
+        return flushed
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_table(root: Path, table: str, columns: Optional[List[str]] = None, filter=None) -> "pa.Table":
+    """
+    Load a table, reading only the requested columns from disk.
+
+    Args:
+        root: Dataset root directory.
+        table: One of ``TABLES``.
+        columns: Columns to load (all when None). ``scrape_month`` is
+            available as a partition column.
+        filter: Optional ``pyarrow.dataset`` expression, e.g.
+            ``pyarrow.dataset.field("imdb_id") == "tt0133093"``.
+
+    Returns:
+        A ``pyarrow.Table``.
+    """
+    _require_pyarrow()
+    table_dir = Path(root) / table
+    full_schema = schema(table).append(pa.field(PARTITION_KEY, pa.string()))
+    files = _data_files(table_dir) if table_dir.exists() else {}
+    if not files:
+        return full_schema.empty_table().select(columns or full_schema.names)
+    # One dataset per format on disk (a table may mix them, e.g. before compaction)
+    dataset = ds.dataset([
+        ds.dataset(
+            [str(path) for path in paths],
+            schema=full_schema,
+            format=_DATASET_FORMATS[file_format],
+            partitioning="hive",
+            partition_base_dir=str(table_dir),
+        )
+        for file_format, paths in files.items()
+    ])
+    return dataset.to_table(columns=columns, filter=filter)
+
+
+def _latest_rows(table: "pa.Table", unique: bool) -> "pa.Table":
+    """Keep only the rows of each movie's most recent scrape."""
+    keys = table.select(['imdb_id', 'scraped_at']).to_pandas()
+    if unique:
+        keep = keys.sort_values('scraped_at', kind='stable').drop_duplicates('imdb_id', keep='last').index.sort_values()
+        return table.take(keep.to_numpy())
+    latest = keys.groupby('imdb_id', dropna=False)['scraped_at'].transform('max')
+    return table.filter(pa.array((keys['scraped_at'] == latest).to_numpy()))
+
+
+def compact(root: Path = DEFAULT_DATASET_DIR, tables: Iterable[str] = TABLES, file_format: Optional[str] = None) -> Dict[str, int]:
+    """
+    Rewrite each table as one file per partition, dropping superseded scrapes.
+
+    When a movie was scraped more than once only the rows of its latest
+    scrape are kept (across partitions). Part files of every format are
+    read, so nothing is deleted without being rewritten.
+
+    Args:
+        root: Dataset root directory.
+        tables: Tables to compact.
+        file_format: Output format; defaults to the format already on disk.
+
+    Returns:
+        Rows kept per table.
+    """
+    _require_pyarrow()
+    kept = {}
+    for name in tables:
+        table_dir = Path(root) / name
+        if not table_dir.exists():
+            continue
+        old_files = [p for paths in _data_files(table_dir).values() for p in paths]
+        out_format = file_format or _detect_format(table_dir)
+
+        table = _latest_rows(read_table(root, name), unique=(name == "movies"))
+        months = table.column(PARTITION_KEY)
+        table = table.drop_columns([PARTITION_KEY])
+        for month in sorted(set(months.to_pylist())):
+            part = table.filter(pc.equal(months, month))
+            _write_file(part, table_dir / f"{PARTITION_KEY}={month}" / _part_name(out_format), out_format)
+
+        for path in old_files:
+            path.unlink()
+        for partition in table_dir.iterdir():
+            if partition.is_dir() and not any(partition.iterdir()):
+                partition.rmdir()
+        kept[name] = table.num_rows
+    return kept
@@ -0,0 +1,236 @@
+"""
+http_cache.py
+-------------
+
+On-disk HTTP response cache for the scraping engine.
+
+Bodies are stored as files keyed by a hash of the URL, with a small SQLite
+index holding validators (ETag / Last-Modified), timestamps and sizes.
+Stale entries are revalidated with a conditional request, so an unchanged
+IMDb page costs a ``304 Not Modified`` instead of a full download.
+
+In ``replay`` mode the cache never touches the network: cached bodies are
+served regardless of age and anything else raises ``CacheMiss``. This makes
+re-parsing runs and tests fully offline.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import requests
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a URL has no cached body."""
+
+
+class CachedResponse:
+    """
+    Minimal response object compatible with the parts of ``requests.Response``
+    the scrapers use (``content``, ``text``, ``status_code``, ``raise_for_status``).
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Optional[Dict[str, str]] = None, from_cache: bool = False, encoding: str = 'utf-8'):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if 400 <= self.status_code:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class ResponseCache:
+    """
+    URL-keyed response cache with TTL, conditional revalidation and
+    size-bounded LRU eviction.
+    """
+
+    def __init__(self, cache_dir: Path = Path("data/http_cache"), ttl: float = 24 * 3600, max_bytes: int = 512 * 1024 * 1024, replay: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding the index and cached bodies.
+            ttl: Seconds a cached body is served without revalidation.
+            max_bytes: Total body size above which least recently used
+                entries are evicted.
+            replay: Serve only cached bodies and never hit the network.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.body_dir = self.cache_dir / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evicted': 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.body_dir / f"{key}.html"
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, encoding, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if not row or not self._body_path(key).exists():
+            return None
+        url, etag, last_modified, encoding, stored_at = row
+        return {'url': url, 'etag': etag, 'last_modified': last_modified, 'encoding': encoding, 'stored_at': stored_at}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _serve(self, key: str, entry: Dict, touch_stored: bool = False) -> Optional[CachedResponse]:
+        """The cached body as a response, or None if it was evicted since the lookup."""
+        try:
+            content = self._body_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        with self._lock:
+            if touch_stored:
+                self._db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return CachedResponse(entry['url'], 200, content, from_cache=True, encoding=entry['encoding'] or 'utf-8')
+
+    def _store(self, key: str, url: str, response) -> None:
+        content = response.content
+        # Written aside and renamed, so a concurrent reader never sees a partial body.
+        path = self._body_path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    response.encoding,
+                    now,
+                    now,
+                    len(content),
+                ),
+            )
+            self._db.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._body_path(key).unlink(missing_ok=True)
+                total -= size
+                self.stats['evicted'] += 1
+            self._db.commit()
+
+    def get(self, url: str, fetch: Callable[[Dict[str, str]], requests.Response]):
+        """
+        Return the response for ``url``, from cache when possible.
+
+        Args:
+            url: Absolute URL; used as the cache key.
+            fetch: Callable performing the real request. It receives extra
+                headers (conditional validators) and returns a response.
+
+        Returns:
+            A ``CachedResponse`` for cache hits, otherwise the live response.
+
+        Raises:
+            CacheMiss: In replay mode when ``url`` is not cached.
+        """
+        key = self._key(url)
+        entry = self._lookup(key)
+
+        if self.replay:
+            cached = self._serve(key, entry) if entry else None
+            if cached is None:
+                raise CacheMiss(url)
+            self._count('hits')
+            return cached
+
+        if entry and time.time() - entry['stored_at'] < self.ttl:
+            cached = self._serve(key, entry)
+            if cached is not None:
+                self._count('hits')
+                return cached
+            entry = None  # evicted meanwhile: fetch it as a miss
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = fetch(headers)
+
+        if response.status_code == 304 and entry:
+            cached = self._serve(key, entry, touch_stored=True)
+            if cached is not None:
+                self._count('revalidated')
+                return cached
+            response = fetch({})  # the body we revalidated was evicted meanwhile
+
+        self._count('misses')
+        if response.status_code == 200:
+            self._store(key, url, response)
+        return response
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without downloading a body."""
+        with self._lock:
+            served = self.stats['hits'] + self.stats['revalidated']
+            total = served + self.stats['misses']
+        return served / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
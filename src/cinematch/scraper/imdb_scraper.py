@@ -1,76 +1,194 @@
 from ddgs import DDGS
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import random
 import re
+import csv
 import json
-from typing import List, Dict, Optional
+import contextlib
+from typing import Callable, Iterable, Iterator, List, Dict, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from urllib.parse import urljoin, urlparse
 from .imdb_searcher import ImprovedIMDbScraper
+from .rate_limiter import HostRateLimiter
+from .http_cache import ResponseCache
+from .transport import Transport
+from .resolution_cache import ResolutionCache
+from .title_index import TitleIndex
+from .structured_extractor import extract_structured_data, has_characters, has_storyline_text, merge_cast, merge_movie_data
+from .dataset_store import DatasetWriter
+from .review_harvester import ReviewHarvester
+from .metrics import ScrapeMetrics
+from .utils import make_soup
 from pathlib import Path
 
 class IMDbScraperDDGS:
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None, cache: Optional[ResponseCache] = None, transport: Optional[Transport] = None, resolution_cache: Optional[ResolutionCache] = None, title_index: Optional[TitleIndex] = None, dataset_writer: Optional[DatasetWriter] = None, metrics: Optional[ScrapeMetrics] = None):
         self.ddgs = DDGS()
-        self.session = requests.Session()
-        self.searcher = ImprovedIMDbScraper(ddgs=self.ddgs)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-        })
+        self.transport = transport or Transport(rate_limiter=rate_limiter, cache=cache, metrics=metrics)
+        self.metrics = metrics or self.transport.metrics
+        self.session = self.transport.session
+        self.searcher = ImprovedIMDbScraper(ddgs=self.ddgs, transport=self.transport, resolution_cache=resolution_cache, title_index=title_index)
+        self.harvester = ReviewHarvester(transport=self.transport)
         self.base_url = "https://www.imdb.com"
+        self.last_stage_timings: Dict[str, float] = {}
+        self.dataset_writer = dataset_writer
+        # Stage pool and per-thread DDGS clients reused by every parallel scrape
+        self._stage_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+
+    # Selector extractors used as fallback, keyed by the movie_data fields
+    # each one is responsible for.
+    _FALLBACK_EXTRACTORS = (
+        (('title', 'year', 'imdb_rating'), '_extract_basic_info'),
+        (('cast',), '_extract_cast'),
+        (('storyline',), '_extract_storyline'),
+        (('content_rating',), '_extract_ratings'),
+        (('details',), '_extract_details'),
+        (('box_office',), '_extract_box_office'),
+        (('technical_specs',), '_extract_tech_specs'),
+    )
+
+    def _stages(self) -> ThreadPoolExecutor:
+        """The pool that runs the overlapping stages of a scrape, created on first use."""
+        with self._executor_lock:
+            if self._stage_executor is None:
+                self._stage_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="stage")
+            return self._stage_executor
+
+    def _thread_ddgs(self) -> DDGS:
+        """This thread's DDGS client (clients are not shared between threads)."""
+        ddgs = getattr(self._local, 'ddgs', None)
+        if ddgs is None:
+            ddgs = DDGS()
+            self._local.ddgs = ddgs
+        return ddgs
+
+    def close(self):
+        """Stop the stage pool (it is recreated if the scraper is used again)."""
+        with self._executor_lock:
+            executor, self._stage_executor = self._stage_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _throttle(self, host: str):
+        """Wait for a request slot on ``host`` when a rate limiter is configured."""
+        self.transport.throttle(host)
+
+    def _fetch_page(self, url: str, timeout: Optional[float] = None):
+        """GET an IMDb page through the shared transport (pool, retries, cache)."""
+        return self.transport.get(url, timeout=timeout)
     
-    def get_movie_details(self, imdb_id: str) -> Dict:
-        """Extract comprehensive movie details from IMDb page"""
+    def _timed(self, timings: Dict[str, float], stage: str, func: Callable, /, *args, **kwargs):
+        """Call ``func`` and record its wall-clock duration under ``stage`` (and in the metrics)."""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[stage] = time.perf_counter() - start
+            if self.metrics:
+                self.metrics.observe('stage_seconds', timings[stage], stage=stage)
+
+    def _run_extractor(self, name: str, func: Callable, keys, *args, **kwargs) -> Dict:
+        """Run a parse step, recording its duration and whether it produced none of ``keys``."""
+        if not self.metrics:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.metrics.observe('extractor_seconds', time.perf_counter() - start, extractor=name)
+        if not any(result.get(key) for key in keys):
+            self.metrics.inc('extractor_empty_total', extractor=name)
+        return result
+
+    def get_movie_details(self, imdb_id: str, executor: Optional[ThreadPoolExecutor] = None, timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Extract comprehensive movie details from IMDb page.
+
+        When an ``executor`` is given, the /plotsummary/ page is fetched on it
+        concurrently with the main page instead of after it.
+        """
+        plot_page = None
         try:
             print(f"🎬 Fetching movie details for {imdb_id}...")
+            timings = timings if timings is not None else {}
+
+            plot_url = f"https://www.imdb.com/title/{imdb_id}/plotsummary/"
+            if executor is not None:
+                plot_page = executor.submit(self._timed, timings, 'plot_summary', self._fetch_page, plot_url, 10)
             
             # Main movie page
             url = f"https://www.imdb.com/title/{imdb_id}/"
-            response = self.session.get(url)
+            response = self._timed(timings, 'main_page', self._fetch_page, url)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+
+            if plot_page is None:
+                # Sequential: fetch /plotsummary/ now so it is timed as its own stage
+                plot_page = Future()
+                try:
+                    plot_page.set_result(self._timed(timings, 'plot_summary', self._fetch_page, plot_url, 10))
+                except Exception as e:
+                    plot_page.set_exception(e)
             
             movie_data = {
                 'imdb_id': imdb_id,
                 'url': url,
                 'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
-            
-            # 1. Extract Title and Basic Info
-            movie_data.update(self._extract_basic_info(soup))
-            
-            # 2. Extract Summary and Synopsis
-            movie_data.update(self._extract_summary_synopsis(soup))
-            
-            # 3. Extract Cast
-            movie_data.update(self._extract_cast(soup))
-            
-            # 4. Extract Storyline
-            movie_data.update(self._extract_storyline(soup))
-            
-            # 5. Extract Motion Picture Rating
-            movie_data.update(self._extract_ratings(soup))
-            
-            # 6. Extract Details (Genre, Release Date, etc.)
-            movie_data.update(self._extract_details(soup))
-            
-            # 7. Extract Box Office Information
-            movie_data.update(self._extract_box_office(soup))
-            
-            # 8. Extract Technical Specifications
-            movie_data.update(self._extract_tech_specs(soup))
+            movie_data.update(self.parse_movie_page(response.content, imdb_id, plot_page=plot_page))
             
             return movie_data
             
         except Exception as e:
             print(f"❌ Error fetching movie details: {e}")
+            if plot_page is not None and not plot_page.cancel():
+                wait([plot_page])  # don't leave the fetch running past this call
             return {'imdb_id': imdb_id, 'error': str(e)}
     
+    def parse_movie_page(self, content: bytes, imdb_id: Optional[str] = None, fast: bool = True, plot_page: Optional[Future] = None) -> Dict:
+        """
+        Parse a title page into movie_data fields.
+
+        With ``fast`` the page's embedded JSON (JSON-LD and ``__NEXT_DATA__``) is
+        decoded first and the CSS selector extractors only run for sections it
+        did not cover; the soup is not built at all when nothing is missing.
+        With ``fast=False`` only the selector extractors are used.
+        ``plot_page`` is an already started /plotsummary/ fetch to reuse.
+        """
+        all_keys = [key for keys, _ in self._FALLBACK_EXTRACTORS for key in keys]
+        data = self._run_extractor('structured', extract_structured_data, all_keys, content) if fast else {}
+        soup = None
+
+        def build_soup():
+            if self.metrics:
+                with self.metrics.timer('extractor_seconds', extractor='make_soup'):
+                    return make_soup(content)
+            return make_soup(content)
+
+        for keys, extractor in self._FALLBACK_EXTRACTORS:
+            # A cast without character names or a storyline without plot and
+            # tagline (JSON-LD only) is not complete
+            if all(data.get(key) for key in keys) and ('cast' not in keys or has_characters(data['cast'])) \
+                    and ('storyline' not in keys or has_storyline_text(data['storyline'])):
+                continue
+            if soup is None:
+                soup = build_soup()
+            extracted = self._run_extractor(extractor, getattr(self, extractor), keys, soup)
+            if 'cast' in keys and data.get('cast'):
+                data['cast'] = merge_cast(data['cast'], extracted.pop('cast', None))
+            merge_movie_data(data, extracted)
+
+        # Summary: short plot from the page, full text from /plotsummary/
+        short_summary = data.get('summary')
+        if not short_summary and soup is None:
+            soup = build_soup()
+        data.update(self._run_extractor(
+            '_extract_summary_synopsis', self._extract_summary_synopsis, ('summary',),
+            soup, imdb_id, short_summary=short_summary, plot_page=plot_page,
+        ))
+
+        return data
+
     def _extract_basic_info(self, soup: BeautifulSoup) -> Dict:
         """Extract basic movie information"""
         data = {}
@@ -146,14 +264,14 @@ class IMDbScraperDDGS:
             print(f"❌ Error extracting basic info: {e}")
         return data
     
-    def _extract_summary_synopsis(self, soup: BeautifulSoup) -> Dict:
+    def _extract_summary_synopsis(self, soup: Optional[BeautifulSoup], imdb_id: Optional[str] = None, short_summary: Optional[str] = None, plot_page: Optional[Future] = None) -> Dict:
         """Extract full plot summary from /plotsummary page (not just main page)."""
         data = {}
+        imdb_id = imdb_id or getattr(self, 'imdb_id', None)
         
         try:
             # 1. Try to get short summary from main page (fallback)
-            short_summary = None
-            for selector in ['span[data-testid="plot-xl"]', '.summary_text']:
+            for selector in ([] if short_summary else ['span[data-testid="plot-xl"]', '.summary_text']):
                 elem = soup.select_one(selector)
                 if elem:
                     text = elem.get_text(strip=True)
@@ -162,18 +280,13 @@ class IMDbScraperDDGS:
                         break
 
             # 2. Fetch full plot summary from /plotsummary page
-            if hasattr(self, 'imdb_id') and self.imdb_id:
-                plot_url = f"https://www.imdb.com/title/{self.imdb_id}/plotsummary/"
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0 Safari/537.36',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                }
+            if imdb_id:
+                plot_url = f"https://www.imdb.com/title/{imdb_id}/plotsummary/"
                 
                 try:
-                    import requests
-                    response = requests.get(plot_url, headers=headers, timeout=10)
+                    response = plot_page.result() if plot_page is not None else self._fetch_page(plot_url, timeout=10)
                     if response.status_code == 200:
-                        plot_soup = BeautifulSoup(response.text, 'html.parser')
+                        plot_soup = make_soup(response.content)
                         
                         # The official plot summaries are in <li> inside <section> with no class,
                         # but usually the FIRST <li> under a section is the "official" one.
@@ -518,15 +631,16 @@ class IMDbScraperDDGS:
         
         return data
     
-    def get_reviews_via_ddgs(self, movie_title: str, max_reviews: int = 20) -> List[Dict]:
-        """Get reviews using DDGS"""
+    def get_reviews_via_ddgs(self, movie_title: str, max_reviews: int = 20, ddgs: Optional[DDGS] = None) -> List[Dict]:
+        """Get reviews using DDGS (``ddgs`` overrides the shared client, e.g. per thread)"""
         reviews = []
         
         try:
             print("📝 Searching for reviews...")
             
             # Search for reviews
-            review_results = self.ddgs.text(
+            self._throttle("ddgs")
+            review_results = (ddgs or self.ddgs).text(
                 f'"{movie_title}" "IMDb" "review"', 
                 max_results=max_reviews
             )
@@ -553,15 +667,20 @@ class IMDbScraperDDGS:
         
         return reviews
     
-    def get_featured_reviews_via_ddgs(self, movie_title: str, max_reviews: int = 10) -> List[Dict]:
-        """Get featured/critic reviews using DDGS"""
+    def harvest_reviews(self, imdb_id: str, max_reviews: Optional[int] = None, **filters) -> Iterator[Dict]:
+        """Stream full IMDb user reviews page by page (see ``ReviewHarvester.iter_reviews``)"""
+        return self.harvester.iter_reviews(imdb_id, max_reviews=max_reviews, **filters)
+
+    def get_featured_reviews_via_ddgs(self, movie_title: str, max_reviews: int = 10, ddgs: Optional[DDGS] = None) -> List[Dict]:
+        """Get featured/critic reviews using DDGS (``ddgs`` overrides the shared client, e.g. per thread)"""
         reviews = []
         
         try:
             print("🌟 Searching for featured reviews...")
             
             # Search for critic/featured reviews
-            review_results = self.ddgs.text(
+            self._throttle("ddgs")
+            review_results = (ddgs or self.ddgs).text(
                 f'"{movie_title}" "IMDb" "critic review"', 
                 max_results=max_reviews
             )
@@ -584,7 +703,7 @@ class IMDbScraperDDGS:
         return reviews
     
 
-    def scrape_comprehensive_movie_data(self, movie_title: str, year: Optional[int] = None) -> Dict:
+    def scrape_comprehensive_movie_data(self, movie_title: str, year: Optional[int] = None, parallel: bool = True) -> Dict:
         """Orchestrates the comprehensive scraping of movie data for a given title.
 
         This method performs a sequence of actions:
@@ -594,8 +713,17 @@ class IMDbScraperDDGS:
         4. Fetches critic/featured reviews using an external search.
         5. Compiles all collected data into a single dictionary.
 
+        With ``parallel`` the steps run as a dependency graph: both review
+        searches (which only need the title) start immediately, and the main
+        page and /plotsummary/ fetches (which only need the ID) overlap once
+        the search resolves. Wall-clock time is then set by the longest chain
+        instead of the sum. Per-stage timings of the last call are kept in
+        ``last_stage_timings``; every call records into its own dict and only
+        returns once all of its stages have finished.
+
         Args:
             movie_title (str): The title of the movie to be scraped.
+            parallel (bool): Overlap independent network stages.
 
         Returns:
             Dict: A dictionary containing all scraped movie data. If the movie
@@ -603,32 +731,108 @@ class IMDbScraperDDGS:
         """
         print(f"\\n🎬 Starting comprehensive data collection for: {movie_title}")
         print("=" * 70)
-        
-        
-        # Step 1: Search for movie
-        movie_info = self.searcher.improved_search_movie(movie_title)
-        if not movie_info:
-            return {'error': f'Movie "{movie_title}" not found'}
-        
-        # Step 2: Get detailed movie information
-        movie_data = self.get_movie_details(movie_info['imdb_id'])
-        
-        # Step 3: Get user reviews
-        user_reviews = self.get_reviews_via_ddgs(movie_title, 15)
+
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        if not parallel:
+            # Step 1: Search for movie
+            movie_info = self._timed(timings, 'search', self.searcher.improved_search_movie, movie_title)
+            if not movie_info:
+                self.last_stage_timings = timings
+                return {'error': f'Movie "{movie_title}" not found'}
+            
+            # Step 2: Get detailed movie information
+            movie_data = self._timed(timings, 'details', self.get_movie_details, movie_info['imdb_id'], timings=timings)
+            
+            # Step 3: Get user reviews
+            user_reviews = self._timed(timings, 'user_reviews', self.get_reviews_via_ddgs, movie_title, 15)
+            
+            # Step 4: Get featured reviews
+            featured_reviews = self._timed(timings, 'featured_reviews', self.get_featured_reviews_via_ddgs, movie_title, 10)
+        else:
+            executor = self._stages()
+
+            def search_reviews(stage: str, func: Callable, max_reviews: int):
+                # Runs on a stage thread, with that thread's DDGS client
+                return self._timed(timings, stage, func, movie_title, max_reviews, self._thread_ddgs())
+
+            # Reviews only depend on the title: start them right away
+            review_futures = [
+                executor.submit(search_reviews, 'user_reviews', self.get_reviews_via_ddgs, 15),
+                executor.submit(search_reviews, 'featured_reviews', self.get_featured_reviews_via_ddgs, 10),
+            ]
+            try:
+                movie_info = self._timed(timings, 'search', self.searcher.improved_search_movie, movie_title)
+                if not movie_info:
+                    self.last_stage_timings = timings
+                    return {'error': f'Movie "{movie_title}" not found'}
+
+                # Main page and /plotsummary/ only depend on the ID
+                movie_data = self._timed(timings, 'details', self.get_movie_details, movie_info['imdb_id'], executor=executor, timings=timings)
+                user_reviews, featured_reviews = (future.result() for future in review_futures)
+            finally:
+                # Drop review searches that have not started; let running ones
+                # finish so none outlives this call
+                for future in review_futures:
+                    future.cancel()
+                wait(review_futures)
+
         movie_data['user_reviews'] = user_reviews
-        
-        # Step 4: Get featured reviews
-        featured_reviews = self.get_featured_reviews_via_ddgs(movie_title, 10)
         movie_data['featured_reviews'] = featured_reviews
         
         # Step 5: Add search info
         movie_data['search_info'] = movie_info
-        
+
+        timings['total'] = time.perf_counter() - start
+        self.last_stage_timings = timings
+        self._print_stage_timings(timings)
         print(f"✅ Data collection completed for: {movie_title}")
         return movie_data
 
-    def save_movie_data(self, movie_data: Dict, format: str = 'both', file_location: Path = Path("data")):
-        """Save movie data to JSON and/or CSV files in the specified directory."""
+    @staticmethod
+    def _print_stage_timings(timings: Dict[str, float]):
+        """Print per-stage durations and how much overlapping saved versus running them back to back."""
+        stages = ['search', 'main_page', 'plot_summary', 'user_reviews', 'featured_reviews']
+        parts = [f"{stage} {timings[stage]:.2f}s" for stage in stages if stage in timings]
+        serial = sum(timings.get(stage, 0.0) for stage in stages)
+        saved = serial - timings['total']
+        print(f"⏱️  Stages: {', '.join(parts)} | wall {timings['total']:.2f}s vs {serial:.2f}s sequential (saved {max(saved, 0.0):.2f}s)")
+
+    def save_movie_data(self, movie_data: Dict, format: str = 'both', file_location: Path = Path("data"), user_reviews: Optional[Iterable[Dict]] = None) -> int:
+        """Save movie data to JSON and/or CSV files in the specified directory.
+
+        With ``format='dataset'`` the movie is appended to the columnar
+        movies / cast / reviews datasets instead (see ``dataset_store``),
+        through ``self.dataset_writer`` when one is set, otherwise straight
+        to ``file_location / "dataset"``.
+
+        ``user_reviews`` (e.g. ``harvest_reviews(...)``) replaces
+        ``movie_data['user_reviews']``: it is consumed once and each review
+        is written out as it arrives, so long review streams are never
+        held in memory.
+
+        Returns:
+            Number of user reviews saved.
+        """
+        stream = user_reviews is not None
+        saved_reviews = 0 if stream else len(movie_data.get('user_reviews') or [])
+        if stream:
+            # The stream replaces any reviews already on the movie; the caller's dict is left as is
+            movie_data = dict(movie_data)
+            movie_data.pop('user_reviews', None)
+
+        if format == 'dataset':
+            writer = self.dataset_writer if self.dataset_writer is not None else DatasetWriter(file_location / "dataset")
+            try:
+                writer.append(movie_data)
+                if stream:
+                    saved_reviews = writer.append_reviews(movie_data.get('imdb_id'), user_reviews, movie_data.get('scraped_at'))
+            finally:
+                if writer is not self.dataset_writer:
+                    writer.close()
+            print(f"💾 Dataset rows appended for: {movie_data.get('title', 'unknown_movie')}")
+            return saved_reviews
 
         # Create base and subdirectories if they don't exist
         file_location.mkdir(parents=True, exist_ok=True)
@@ -641,7 +845,7 @@ class IMDbScraperDDGS:
         movie_title = movie_data.get('title', 'unknown_movie').replace(' ', '_')
 
         # Save JSON
-        if format in ['json', 'both']:
+        if format in ['json', 'both'] and not stream:
             json_filename = json_dir / f"imdb_data_{movie_title}.json"
             with open(json_filename, 'w', encoding='utf-8') as f:
                 json.dump(movie_data, f, indent=2, ensure_ascii=False)
@@ -649,6 +853,7 @@ class IMDbScraperDDGS:
 
         # Save CSV files
         if format in ['csv', 'both']:
+            import pandas as pd  # deferred: pandas alone costs ~0.6s of startup
             # Create flattened CSV for main data
             flat_data = {}
             for key, value in movie_data.items():
@@ -668,12 +873,57 @@ class IMDbScraperDDGS:
                 print(f"💾 Cast CSV saved to: {cast_filename}")
 
             # Save reviews
-            if movie_data.get('user_reviews'):
+            if movie_data.get('user_reviews') and not stream:
                 df_reviews = pd.DataFrame(movie_data['user_reviews'])
                 reviews_filename = csv_dir / f"imdb_reviews_{movie_title}.csv"
                 df_reviews.to_csv(reviews_filename, index=False, encoding='utf-8')
                 print(f"💾 Reviews CSV saved to: {reviews_filename}")
 
+        if stream:
+            json_filename = json_dir / f"imdb_data_{movie_title}.json"
+            reviews_filename = csv_dir / f"imdb_reviews_{movie_title}.csv"
+            saved_reviews = self._stream_user_reviews(
+                movie_data,
+                user_reviews,
+                json_filename if format in ['json', 'both'] else None,
+                reviews_filename if format in ['csv', 'both'] else None,
+            )
+            print(f"💾 {saved_reviews} user reviews streamed for: {movie_title}")
+
+        return saved_reviews
+
+    @staticmethod
+    def _stream_user_reviews(movie_data: Dict, reviews: Iterable[Dict], json_path: Optional[Path], csv_path: Optional[Path]) -> int:
+        """
+        Write ``movie_data`` as JSON with ``user_reviews`` spliced in, and the
+        reviews CSV, in a single pass over ``reviews``.
+        """
+        count = 0
+        with contextlib.ExitStack() as stack:
+            json_file = stack.enter_context(open(json_path, 'w', encoding='utf-8')) if json_path else None
+            if json_file:
+                # Same layout as json.dump(..., indent=2), minus the closing brace
+                head = json.dumps(movie_data, indent=2, ensure_ascii=False)[:-1].rstrip()
+                json_file.write(head + (',' if movie_data else '') + '\n  "user_reviews": [')
+
+            csv_writer = None
+            for review in reviews:
+                if json_file:
+                    text = json.dumps(review, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                    json_file.write(f"{',' if count else ''}\n    {text}")
+                if csv_path:
+                    if csv_writer is None:
+                        csv_file = stack.enter_context(open(csv_path, 'w', encoding='utf-8', newline=''))
+                        fields = list(review) + ([] if 'rating' in review else ['rating'])
+                        csv_writer = csv.DictWriter(csv_file, fieldnames=fields, extrasaction='ignore')
+                        csv_writer.writeheader()
+                    csv_writer.writerow(review)
+                count += 1
+
+            if json_file:
+                json_file.write('\n  ]\n}' if count else ']\n}')
+        return count
+
     def print_movie_summary(self, movie_data: Dict):
         """Print a summary of the movie data"""
         print(f"\\n{'='*70}")
@@ -1,74 +1,127 @@
 import re
 from typing import Dict, Optional
 import difflib
+from .transport import Transport
+from .resolution_cache import NEGATIVE, ResolutionCache
+from .title_index import TitleIndex
 
 class ImprovedIMDbScraper:
-    def __init__(self, ddgs):
+    def __init__(self, ddgs, transport: Optional[Transport] = None, resolution_cache: Optional[ResolutionCache] = None, title_index: Optional[TitleIndex] = None, index_min_similarity: float = 0.9):
         self.ddgs = ddgs
+        self.transport = transport
+        self.resolution_cache = resolution_cache
+        self.title_index = title_index
+        self.index_min_similarity = index_min_similarity
 
     def improved_search_movie(self, movie_title: str, year: Optional[int] = None) -> Optional[Dict]:
-        """Improved movie search with better matching and year filtering"""
-        try:
-            print(f"🔍 Searching for: {movie_title} {f'({year})' if year else ''}")
-            
-            # More specific search query
-            search_query = f'"{movie_title}" site:imdb.com/title/'
-            if year:
-                search_query += f' {year}'
-            
-            results = self.ddgs.text(search_query, max_results=10)
-            
-            best_match = None
-            best_score = 0
-            
-            for result in results:
-                if 'imdb.com/title/tt' in result['href']:
-                    # Extract IMDb ID
-                    match = re.search(r'imdb\.com/title/(tt\d+)', result['href'])
-                    if not match:
-                        continue
-                    
-                    # Calculate title similarity score
-                    result_title = result['title'].lower()
-                    # Remove common IMDb suffixes
-                    result_title = re.sub(r'\s*[-–]\s*imdb.*$', '', result_title, flags=re.I)
-                    result_title = re.sub(r'\s*\(\d{4}\).*$', '', result_title)
-                    
-                    # Use fuzzy matching to find best match
-                    similarity = difflib.SequenceMatcher(None, 
-                                                        movie_title.lower(), 
-                                                        result_title.lower()).ratio()
-                    
-                    # Check year if provided
-                    year_match = True
-                    if year:
-                        year_in_result = re.search(r'\((\d{4})\)', result['title'] + ' ' + result['body'])
-                        if year_in_result:
-                            year_match = (int(year_in_result.group(1)) == year)
-                    
-                    # Weight score
-                    score = similarity
-                    if year_match and year:
-                        score += 0.3  # Bonus for year match
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_match = {
-                            'imdb_id': match.group(1),
-                            'title': movie_title,
-                            'url': result['href'],
-                            'description': result['body'],
-                            'search_title': result['title'],
-                            'match_score': score
-                        }
-            
-            if best_match and best_score > 0.5:  # Minimum threshold
-                print(f"✅ Found: {best_match['search_title']} (Score: {best_score:.2f})")
-                return best_match
-            else:
-                print(f"❌ No good match found for '{movie_title}'")
+        """Improved movie search with better matching and year filtering.
+
+        Consults the persistent resolution cache and the offline title index
+        first (when configured) and only falls back to a DDGS search when
+        both miss.
+        """
+        if self.resolution_cache:
+            cached = self.resolution_cache.get(movie_title, year)
+            if cached is NEGATIVE:
+                print(f"⏭️  No match for '{movie_title}' (cached)")
+                return None
+            if cached:
+                print(f"✅ Found: {cached['search_title']} (Score: {cached['match_score']:.2f}, cached)")
+                cached['title'] = movie_title
+                return cached
+
+        best_match = self._search_index(movie_title, year) if self.title_index else None
+
+        if best_match is None:
+            try:
+                best_match = self._search_ddgs(movie_title, year)
+            except Exception as e:
+                print(f"❌ Error searching: {e}")
                 return None
+
+        if self.resolution_cache:
+            self.resolution_cache.put(movie_title, year, best_match)
+        return best_match
+
+    def _search_index(self, movie_title: str, year: Optional[int] = None) -> Optional[Dict]:
+        """Resolve the title from the offline IMDb index; None if there is no close match."""
+        results = self.title_index.search(movie_title, year, limit=1)
+        if not results or results[0]['similarity'] < self.index_min_similarity:
+            return None
+
+        hit = results[0]
+        search_title = f"{hit['title']} ({hit['year']})" if hit['year'] else hit['title']
+        print(f"✅ Found: {search_title} (Score: {hit['score']:.2f}, offline index)")
+        return {
+            'imdb_id': hit['imdb_id'],
+            'title': movie_title,
+            'url': f"https://www.imdb.com/title/{hit['imdb_id']}/",
+            'description': '',
+            'search_title': search_title,
+            'match_score': hit['score'],
+            'source': 'title_index'
+        }
+
+    def _search_ddgs(self, movie_title: str, year: Optional[int] = None) -> Optional[Dict]:
+        """Run the DDGS search and return the best scoring IMDb title, if any."""
+        print(f"🔍 Searching for: {movie_title} {f'({year})' if year else ''}")
+        
+        # More specific search query
+        search_query = f'"{movie_title}" site:imdb.com/title/'
+        if year:
+            search_query += f' {year}'
+        
+        if self.transport:
+            self.transport.throttle("ddgs")
+        results = self.ddgs.text(search_query, max_results=10)
+        
+        best_match = None
+        best_score = 0
+        
+        for result in results:
+            if 'imdb.com/title/tt' in result['href']:
+                # Extract IMDb ID
+                match = re.search(r'imdb\.com/title/(tt\d+)', result['href'])
+                if not match:
+                    continue
+                
+                # Calculate title similarity score
+                result_title = result['title'].lower()
+                # Remove common IMDb suffixes
+                result_title = re.sub(r'\s*[-–]\s*imdb.*$', '', result_title, flags=re.I)
+                result_title = re.sub(r'\s*\(\d{4}\).*$', '', result_title)
+                
+                # Use fuzzy matching to find best match
+                similarity = difflib.SequenceMatcher(None, 
+                                                    movie_title.lower(), 
+                                                    result_title.lower()).ratio()
+                
+                # Check year if provided
+                year_match = True
+                if year:
+                    year_in_result = re.search(r'\((\d{4})\)', result['title'] + ' ' + result['body'])
+                    if year_in_result:
+                        year_match = (int(year_in_result.group(1)) == year)
+                
+                # Weight score
+                score = similarity
+                if year_match and year:
+                    score += 0.3  # Bonus for year match
                 
-        except Exception as e:
-            print(f"❌ Error searching: {e}")
+                if score > best_score:
+                    best_score = score
+                    best_match = {
+                        'imdb_id': match.group(1),
+                        'title': movie_title,
+                        'url': result['href'],
+                        'description': result['body'],
+                        'search_title': result['title'],
+                        'match_score': score
+                    }
+        
+        if best_match and best_score > 0.5:  # Minimum threshold
+            print(f"✅ Found: {best_match['search_title']} (Score: {best_score:.2f})")
+            return best_match
+        else:
+            print(f"❌ No good match found for '{movie_title}'")
             return None
@@ -0,0 +1,225 @@
+"""
+job_manifest.py
+---------------
+
+Durable, resumable job manifest for bulk scrapes.
+
+Every title moves through the stages
+
+    pending -> resolved -> details_done -> reviews_done
+
+and the manifest (a SQLite file) records the stage reached, the IMDb ID,
+the partial ``movie_data`` collected so far, and ``scraped_at`` once the
+title is complete. A failed stage increments the title's retry count and
+leaves it at the last completed stage; after ``max_retries`` failures the
+title is parked as ``failed``. Workers claim one outstanding title at a
+time and resume it from the stage it reached, so an interrupted run picks
+up exactly where it stopped. Claims can be scoped to a run's own titles so
+leftovers of earlier runs are only resumed when asked for.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+PENDING = 'pending'
+RESOLVED = 'resolved'
+DETAILS_DONE = 'details_done'
+REVIEWS_DONE = 'reviews_done'
+FAILED = 'failed'
+
+STAGES = (PENDING, RESOLVED, DETAILS_DONE, REVIEWS_DONE)
+
+
+class JobManifest:
+    """
+    SQLite-backed manifest of bulk scrape jobs, safe to share between threads.
+    """
+
+    def __init__(self, path: Path = Path("data/scrape_manifest.sqlite"), max_retries: int = 3):
+        """
+        Args:
+            path: SQLite database file.
+            max_retries: Failures after which a title is marked ``failed``.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                title TEXT PRIMARY KEY,
+                state TEXT NOT NULL DEFAULT 'pending',
+                stage TEXT NOT NULL DEFAULT 'pending',
+                imdb_id TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                payload TEXT,
+                scraped_at TEXT,
+                claimed_by TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+
+    def add_titles(self, titles: Iterable[str]) -> int:
+        """Register titles as pending; titles already in the manifest are left untouched."""
+        now = time.time()
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (title, updated_at) VALUES (?, ?)",
+                [(title, now) for title in titles],
+            )
+            return self._db.total_changes - before
+
+    def reset_claims(self):
+        """Release every claim (call once at the start of a run; claims from a crashed run are stale)."""
+        with self._lock:
+            self._db.execute("UPDATE jobs SET claimed_by = NULL WHERE claimed_by IS NOT NULL")
+
+    def claim(self, worker_id: str, titles: Optional[Iterable[str]] = None) -> Optional[Dict]:
+        """
+        Atomically claim the next outstanding title.
+
+        Args:
+            worker_id: Name recorded as the claim's owner.
+            titles: Only claim among these titles (the current run's). By
+                default any outstanding title in the manifest can be claimed,
+                including leftovers of earlier runs.
+
+        Returns:
+            The job (title, stage, imdb_id, attempts, payload) or None when
+            nothing is left to do.
+        """
+        scope = "AND title IN (SELECT value FROM json_each(?))" if titles is not None else ""
+        params = (worker_id, time.time(), REVIEWS_DONE, FAILED)
+        if titles is not None:
+            params += (json.dumps(list(titles), ensure_ascii=False),)
+        with self._lock:
+            row = self._db.execute(
+                f"""
+                UPDATE jobs SET claimed_by = ?, updated_at = ?
+                WHERE title = (
+                    SELECT title FROM jobs
+                    WHERE claimed_by IS NULL AND state NOT IN (?, ?) {scope}
+                    ORDER BY attempts, updated_at
+                    LIMIT 1
+                )
+                RETURNING title, stage, imdb_id, attempts, payload
+                """,
+                params,
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+        return job
+
+    def advance(self, title: str, stage: str, imdb_id: Optional[str] = None, payload: Optional[Dict] = None, scraped_at: Optional[str] = None):
+        """Record that ``title`` completed ``stage``; the claim is kept so the worker can continue."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        with self._lock:
+            self._db.execute(
+                """
+                UPDATE jobs SET state = ?, stage = ?, imdb_id = COALESCE(?, imdb_id),
+                    payload = COALESCE(?, payload), scraped_at = COALESCE(?, scraped_at),
+                    last_error = NULL, updated_at = ?
+                WHERE title = ?
+                """,
+                (
+                    stage,
+                    stage,
+                    imdb_id,
+                    json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                    scraped_at,
+                    time.time(),
+                    title,
+                ),
+            )
+
+    def fail(self, title: str, error: str):
+        """Record a failed attempt; the title is parked as ``failed`` after ``max_retries``."""
+        with self._lock:
+            self._db.execute(
+                """
+                UPDATE jobs SET attempts = attempts + 1, last_error = ?,
+                    state = CASE WHEN attempts + 1 >= ? THEN ? ELSE stage END,
+                    updated_at = ?
+                WHERE title = ?
+                """,
+                (error, self.max_retries, FAILED, time.time(), title),
+            )
+
+    def release(self, title: str):
+        """Drop the worker's claim on ``title``."""
+        with self._lock:
+            self._db.execute("UPDATE jobs SET claimed_by = NULL WHERE title = ?", (title,))
+
+    def retry_failed(self) -> int:
+        """Give every ``failed`` title a fresh set of retries from the stage it reached."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = stage, attempts = 0 WHERE state = ?", (FAILED,)
+            )
+            return cursor.rowcount
+
+    def requeue(self, title: str, stage: str = PENDING, imdb_id: Optional[str] = None, payload: Optional[Dict] = None):
+        """Schedule a title (complete or not) to be scraped again from ``stage``, with fresh retries."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO jobs (title, updated_at) VALUES (?, ?)", (title, time.time())
+            )
+            self._db.execute(
+                """
+                UPDATE jobs SET state = ?, stage = ?, imdb_id = COALESCE(?, imdb_id),
+                    payload = ?, attempts = 0, last_error = NULL, updated_at = ?
+                WHERE title = ?
+                """,
+                (
+                    stage,
+                    stage,
+                    imdb_id,
+                    json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                    time.time(),
+                    title,
+                ),
+            )
+
+    def completed(self) -> List[Dict]:
+        """Every finished job (title, imdb_id, scraped_at and the saved movie data as payload)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, imdb_id, scraped_at, payload FROM jobs WHERE state = ?", (REVIEWS_DONE,)
+            ).fetchall()
+        jobs = [dict(row) for row in rows]
+        for job in jobs:
+            job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+        return jobs
+
+    def get(self, title: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE title = ?", (title,)).fetchone()
+        return dict(row) if row else None
+
+    def summary(self) -> Dict[str, int]:
+        """Number of titles per state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
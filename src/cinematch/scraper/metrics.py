@@ -0,0 +1,240 @@
+"""
+metrics.py
+----------
+
+Structured, thread-safe metrics for the scraping engine.
+
+``ScrapeMetrics`` keeps labelled counters and fixed-bucket histograms
+(bounded memory however long the run). The transport records per-host
+request latency, bytes, status codes, retries, errors, cache hits and
+rate-limit waits; ``IMDbScraperDDGS`` records per-stage durations and
+per-extractor parse time, including which ``_extract_*`` method came back
+empty; the bulk runner records its deliberate sleeps.
+
+Metrics can be appended to a JSON-lines file, rendered in the Prometheus
+text format (optionally served over HTTP) or printed as a run summary.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Seconds; covers parse times (ms) up to slow page loads and backoffs.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PREFIX = "cinematch_scraper_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count, as in Prometheus."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def to_dict(self) -> Dict:
+        return {'buckets': list(self.buckets), 'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class ScrapeMetrics:
+    """
+    Labelled counters and histograms shared by all scraper threads.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Histogram bucket upper bounds, in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to the counter ``name`` for ``labels``."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record ``value`` in the histogram ``name`` for ``labels``."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the ``with`` block into the histogram ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def snapshot(self) -> Dict:
+        """All series as plain data (labels as dicts)."""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'uptime_seconds': time.time() - self.started_at,
+                'counters': {
+                    name: [{'labels': dict(k), 'value': v} for k, v in series.items()]
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: [{'labels': dict(k), **h.to_dict()} for k, h in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def write_jsonl(self, path: Path):
+        """Append the current snapshot as one JSON line to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+
+    def to_prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for labels, h in series.items():
+                    cumulative = 0
+                    for bound, count in zip(h.buckets + (float('inf'),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                        lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {h.sum:g}")
+                    lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` in the Prometheus format from a daemon thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+    def report(self) -> str:
+        """Human-readable run summary: hosts, stages, extractors."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+        lines = ["📊 Scrape metrics"]
+
+        def label(labels: Labels, key: str) -> str:
+            return dict(labels).get(key, '')
+
+        requests = histograms.get('http_request_seconds', {})
+        for labels, h in sorted(requests.items()):
+            host = label(labels, 'host')
+            statuses = ", ".join(
+                f"{label(k, 'status')}×{v:g}"
+                for k, v in sorted(counters.get('http_responses_total', {}).items())
+                if label(k, 'host') == host
+            )
+            kib = counters.get('http_response_bytes_total', {}).get(labels, 0) / 1024
+            retries = counters.get('http_retries_total', {}).get(labels, 0)
+            cached = counters.get('http_cache_hits_total', {}).get(labels, 0)
+            lines.append(
+                f"   🌐 {host}: {h.count} requests, p50 ≤{h.quantile(0.5):g}s, p95 ≤{h.quantile(0.95):g}s, "
+                f"{kib:,.0f} KiB, {retries:g} retries, {cached:g} cache hits [{statuses}]"
+            )
+        for labels, value in sorted(counters.get('http_errors_total', {}).items()):
+            lines.append(f"   ⚠️ {label(labels, 'host')}: {value:g} × {label(labels, 'error')}")
+        for labels, h in sorted(histograms.get('rate_limit_wait_seconds', {}).items()):
+            lines.append(f"   🚦 {label(labels, 'host')}: waited {h.sum:.1f}s for rate limit slots")
+
+        stages = histograms.get('stage_seconds', {})
+        if stages:
+            lines.append("   ⏱️  Stages (total / mean): " + ", ".join(
+                f"{label(k, 'stage')} {h.sum:.1f}s/{h.sum / h.count:.2f}s"
+                for k, h in sorted(stages.items(), key=lambda item: -item[1].sum)
+            ))
+
+        extractors = histograms.get('extractor_seconds', {})
+        if extractors:
+            empty = counters.get('extractor_empty_total', {})
+            lines.append("   🧩 Extractors (calls, mean, empty): " + ", ".join(
+                f"{label(k, 'extractor')} {h.count}×{h.sum / h.count * 1000:.1f}ms/{empty.get(k, 0):g}"
+                for k, h in sorted(extractors.items())
+            ))
+        return "\n".join(lines)
@@ -0,0 +1,139 @@
+"""
+rate_limiter.py
+---------------
+
+Per-host token-bucket rate limiting for the scraping engine.
+
+Each host (e.g. ``www.imdb.com`` or the DDGS search backend) gets its own
+bucket, so waiting on one host never blocks a worker that is about to talk
+to another one. Buckets are thread-safe and can be shared by every worker
+of a concurrent bulk scrape.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Default polite request rates (requests per second) per host.
+DEFAULT_HOST_RATES: Dict[str, float] = {
+    "www.imdb.com": 1.0,
+    "ddgs": 0.5,
+}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at ``rate`` tokens per second up to
+    ``capacity`` tokens. Each request consumes one token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate: Refill rate in tokens per second. Must be positive.
+            capacity: Maximum burst size. Defaults to ``max(1, rate)``.
+            clock: Monotonic time source, in seconds.
+            sleep: Function used to wait in :meth:`acquire`.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Try to take ``tokens`` from the bucket without blocking.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the number of seconds
+            to wait before they will be available.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until ``tokens`` are available, then take them.
+
+        Returns:
+            Total time spent waiting, in seconds.
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """
+    Registry of token buckets keyed by host name.
+
+    Hosts without an explicit rate fall back to ``default_rate``.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 1.0,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rates: Mapping of host -> requests per second.
+            default_rate: Rate used for hosts not present in ``rates``.
+            burst: Optional bucket capacity applied to every host.
+            clock: Time source handed to every bucket.
+            sleep: Wait function handed to every bucket.
+        """
+        self.rates = dict(DEFAULT_HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = self.rates.get(host, self.default_rate)
+                bucket = TokenBucket(rate, self.burst, clock=self._clock, sleep=self._sleep)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, host: str) -> float:
+        """
+        Wait for a request slot on ``host``.
+
+        Returns:
+            Time spent waiting, in seconds.
+        """
+        return self._bucket(host).acquire()
@@ -0,0 +1,224 @@
+"""
+refresh_scheduler.py
+--------------------
+
+Staleness-driven incremental refresh of already scraped movies.
+
+Every saved movie gets a refresh priority that combines
+
+* age       - days since ``scraped_at``; titles younger than ``min_age_days``
+              are never refreshed,
+* popularity - ``log10(1 + rating_count)``, so blockbusters go stale faster
+              than obscure titles,
+* velocity  - reviews per day posted in the window before the last scrape,
+              so titles that are being actively reviewed are revisited first.
+
+The candidates go through a heap and the highest-priority titles are taken
+until the per-run request budget is spent. Movie data can be read from the
+job manifest, the JSON output directory or the columnar datasets.
+"""
+
+import heapq
+import json
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dataset_store import parse_number, read_table
+from .job_manifest import JobManifest
+
+# Requests one refresh costs: main page, /plotsummary/ and two DDGS searches
+# (the IMDb ID is already known, so the title search is skipped).
+DEFAULT_REQUESTS_PER_TITLE = 4
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value), _TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def _window(scraped_at: datetime, window_days: int) -> Tuple[str, str]:
+    return (scraped_at - timedelta(days=window_days)).date().isoformat(), scraped_at.date().isoformat()
+
+
+def review_velocity(review_dates: Iterable, scraped_at: datetime, window_days: int = 30) -> float:
+    """Reviews per day posted within ``window_days`` before ``scraped_at``."""
+    start, end = _window(scraped_at, window_days)
+    recent = sum(1 for d in review_dates if d and start <= str(d)[:10] <= end)
+    return recent / window_days
+
+
+class ReviewCounter:
+    """
+    Counts the reviews of a stream as it is consumed.
+
+    Used when reviews are streamed to disk instead of kept in ``movie_data``:
+    only ``count`` and ``velocity`` need to be remembered afterwards.
+    """
+
+    def __init__(self, scraped_at, window_days: int = 30):
+        self.window_days = window_days
+        scraped_at = _parse_timestamp(scraped_at) or datetime.now()
+        self._start, self._end = _window(scraped_at, window_days)
+        self.count = 0
+        self.recent = 0
+
+    def wrap(self, reviews: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield ``reviews`` unchanged, counting them on the way."""
+        for review in reviews:
+            self.count += 1
+            posted = str(review.get('date') or '')[:10]
+            if posted and self._start <= posted <= self._end:
+                self.recent += 1
+            yield review
+
+    @property
+    def velocity(self) -> float:
+        """Same value ``review_velocity`` would give for the counted reviews."""
+        return self.recent / self.window_days
+
+
+def movie_entry(title: str, movie_data: Dict, scraped_at=None, window_days: int = 30) -> Optional[Dict]:
+    """
+    Refresh candidate for one saved movie.
+
+    Returns:
+        A dict with title, imdb_id, scraped_at, rating_count and
+        review_velocity, or None when the scrape time is unknown.
+    """
+    scraped_at = _parse_timestamp(scraped_at or movie_data.get('scraped_at'))
+    if scraped_at is None:
+        return None
+    if 'user_reviews' not in movie_data and 'review_velocity' in movie_data:
+        # Reviews were streamed to disk; only their velocity was kept
+        velocity = movie_data['review_velocity']
+    else:
+        dates = [review.get('date') for review in movie_data.get('user_reviews') or []]
+        velocity = review_velocity(dates, scraped_at, window_days)
+    return {
+        'title': title,
+        'imdb_id': movie_data.get('imdb_id'),
+        'scraped_at': scraped_at,
+        'rating_count': parse_number(movie_data.get('rating_count')) or 0,
+        'review_velocity': velocity,
+    }
+
+
+def load_from_manifest(manifest: JobManifest) -> List[Dict]:
+    """Candidates from the completed jobs of a manifest."""
+    entries = []
+    for job in manifest.completed():
+        movie_data = dict(job['payload'], imdb_id=job['payload'].get('imdb_id') or job['imdb_id'])
+        entry = movie_entry(job['title'], movie_data, job['scraped_at'])
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def load_from_json_dir(json_dir: Path = Path("data/json")) -> List[Dict]:
+    """Candidates from the per-movie JSON files written by ``save_movie_data``."""
+    entries = []
+    for path in sorted(Path(json_dir).glob("imdb_data_*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            movie_data = json.load(f)
+        title = (movie_data.get('search_info') or {}).get('title') or movie_data.get('title')
+        entry = movie_entry(title, movie_data)
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def load_from_dataset(root: Path = Path("data/dataset"), window_days: int = 30) -> List[Dict]:
+    """Candidates from the columnar datasets, reading only the columns needed."""
+    movies = read_table(root, "movies", columns=["imdb_id", "title", "rating_count", "scraped_at"]).to_pandas()
+    reviews = read_table(root, "reviews", columns=["imdb_id", "review_date"]).to_pandas()
+    dates_by_id = reviews.dropna(subset=["review_date"]).groupby("imdb_id")["review_date"].apply(list).to_dict()
+
+    entries = []
+    for movie in movies.sort_values("scraped_at").drop_duplicates("imdb_id", keep="last").itertuples(index=False):
+        scraped_at = movie.scraped_at.to_pydatetime()
+        entries.append({
+            'title': movie.title,
+            'imdb_id': movie.imdb_id,
+            'scraped_at': scraped_at,
+            'rating_count': 0 if math.isnan(movie.rating_count) else int(movie.rating_count),
+            'review_velocity': review_velocity(dates_by_id.get(movie.imdb_id, []), scraped_at, window_days),
+        })
+    return entries
+
+
+class RefreshScheduler:
+    """
+    Ranks saved movies by refresh value and picks them within a request budget.
+    """
+
+    def __init__(
+        self,
+        min_age_days: float = 7,
+        half_life_days: float = 30,
+        popularity_weight: float = 1.0,
+        velocity_weight: float = 1.0,
+        requests_per_title: int = DEFAULT_REQUESTS_PER_TITLE,
+        now: Optional[datetime] = None,
+    ):
+        """
+        Args:
+            min_age_days: Titles scraped more recently than this are skipped.
+            half_life_days: Age at which the age factor reaches 1.
+            popularity_weight: Weight of ``log10(1 + rating_count)``.
+            velocity_weight: Weight of the recent reviews-per-day rate.
+            requests_per_title: Requests budgeted for refreshing one title.
+            now: Reference time (defaults to the current time).
+        """
+        self.min_age_days = min_age_days
+        self.half_life_days = half_life_days
+        self.popularity_weight = popularity_weight
+        self.velocity_weight = velocity_weight
+        self.requests_per_title = requests_per_title
+        self.now = now or datetime.now()
+
+    def priority(self, entry: Dict) -> float:
+        """Refresh priority of a candidate; 0 when it is not stale yet."""
+        age_days = (self.now - entry['scraped_at']).total_seconds() / 86400
+        if age_days < self.min_age_days:
+            return 0.0
+        popularity = math.log10(1 + entry.get('rating_count', 0))
+        return (
+            (age_days / self.half_life_days)
+            * (1 + self.popularity_weight * popularity)
+            * (1 + self.velocity_weight * entry.get('review_velocity', 0.0))
+        )
+
+    def plan(self, entries: Iterable[Dict], budget: int) -> List[Dict]:
+        """
+        Select the most valuable stale titles that fit in ``budget`` requests.
+
+        Args:
+            entries: Candidates from one of the ``load_from_*`` helpers.
+            budget: Maximum number of HTTP/search requests for this run.
+
+        Returns:
+            Selected candidates, highest priority first, each with its
+            ``priority`` filled in.
+        """
+        heap = []
+        for i, entry in enumerate(entries):
+            priority = self.priority(entry)
+            if priority > 0:
+                # Max-heap on priority; the index keeps ties stable and
+                # avoids comparing dicts.
+                heap.append((-priority, i, entry))
+        heapq.heapify(heap)
+
+        selected = []
+        for _ in range(min(len(heap), budget // self.requests_per_title)):
+            negative_priority, _, entry = heapq.heappop(heap)
+            selected.append(dict(entry, priority=-negative_priority))
+        return selected
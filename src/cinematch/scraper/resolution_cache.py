@@ -0,0 +1,137 @@
+"""
+resolution_cache.py
+-------------------
+
+Persistent title -> IMDb ID resolution cache.
+
+Resolving a title costs a DDGS web search plus fuzzy scoring. Results are
+stored in SQLite keyed by the normalized (title, year) pair, together with
+the match score and a timestamp. Misses are cached too (negative caching,
+with a shorter TTL) so titles that cannot be resolved are not searched for
+again on every run.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# Sentinel returned by ``get`` for a cached miss (distinct from "not cached").
+NEGATIVE = object()
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(ch for ch in title if not unicodedata.combining(ch))
+    title = re.sub(r'[^\w\s]', ' ', title.lower())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+class ResolutionCache:
+    """
+    SQLite-backed cache of title searches with TTL, negative caching and
+    hit-rate reporting.
+    """
+
+    def __init__(
+        self,
+        path: Path = Path("data/resolution_cache.sqlite"),
+        ttl: float = 90 * 24 * 3600,
+        negative_ttl: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file.
+            ttl: Seconds a successful resolution stays valid.
+            negative_ttl: Seconds a "not found" result stays valid.
+            clock: Wall-clock time source used for timestamps and expiry.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolutions (
+                title_key TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                imdb_id TEXT,
+                match_score REAL,
+                result TEXT,
+                resolved_at REAL NOT NULL,
+                PRIMARY KEY (title_key, year)
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _key(title: str, year: Optional[int]) -> Tuple[str, int]:
+        # SQLite treats NULLs as distinct in primary keys, so "no year" is 0.
+        return normalize_title(title), int(year or 0)
+
+    def get(self, title: str, year: Optional[int] = None):
+        """
+        Look up a cached resolution.
+
+        Returns:
+            The cached search result dict, ``NEGATIVE`` for a cached miss,
+            or None when nothing valid is cached.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT imdb_id, result, resolved_at FROM resolutions WHERE title_key = ? AND year = ?",
+                self._key(title, year),
+            ).fetchone()
+
+            if row:
+                imdb_id, result, resolved_at = row
+                age = self._clock() - resolved_at
+                if imdb_id and age < self.ttl:
+                    self.stats['hits'] += 1
+                    return json.loads(result)
+                if not imdb_id and age < self.negative_ttl:
+                    self.stats['negative_hits'] += 1
+                    return NEGATIVE
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, title: str, year: Optional[int], result: Optional[Dict]):
+        """Store a search result, or a miss when ``result`` is None."""
+        title_key, year_key = self._key(title, year)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    title_key,
+                    year_key,
+                    result['imdb_id'] if result else None,
+                    result.get('match_score') if result else None,
+                    json.dumps(result, ensure_ascii=False) if result else None,
+                    self._clock(),
+                ),
+            )
+            self._db.commit()
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (including cached misses)."""
+        with self._lock:
+            hits = self.stats['hits'] + self.stats['negative_hits']
+            total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,237 @@
+"""
+review_harvester.py
+-------------------
+
+Streaming harvester for a title's full set of IMDb user reviews.
+
+IMDb serves reviews 25 at a time from ``/title/<id>/reviews/_ajax``; every
+page carries the ``paginationKey`` of the next one. ``ReviewHarvester``
+walks that chain through the shared ``Transport`` and yields reviews one
+by one. A background thread fetches and parses the next pages while the
+caller consumes the current one; the hand-off queue holds at most
+``prefetch`` pages, so memory stays bounded however many reviews a title
+has. Iteration stops at ``max_reviews``, at the first review older than
+``since`` (reviews are then requested newest first), or when the caller
+stops consuming.
+
+Usage:
+    python -m cinematch.scraper.review_harvester tt0133093 --max-reviews 500 --out matrix_reviews.jsonl
+"""
+
+import argparse
+import json
+import queue
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .transport import Transport
+from .utils import make_soup
+
+REVIEWS_URL = "https://www.imdb.com/title/{imdb_id}/reviews/_ajax"
+
+# Sentinel put on the queue once the producer is done.
+_DONE = object()
+
+
+def _parse_date(text: str) -> Optional[str]:
+    try:
+        return datetime.strptime(text.strip(), '%d %B %Y').date().isoformat()
+    except ValueError:
+        return None
+
+
+def _parse_helpful(text: str) -> Tuple[int, int]:
+    """Parse "1,234 out of 1,500 found this helpful." into (1234, 1500)."""
+    numbers = [int(n.replace(',', '')) for n in text.split() if n.replace(',', '').isdigit()]
+    if len(numbers) >= 2:
+        return numbers[0], numbers[1]
+    return 0, 0
+
+
+def parse_review_page(content) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Parse one ``_ajax`` reviews page.
+
+    Args:
+        content: Raw page HTML.
+
+    Returns:
+        The page's reviews and the pagination key of the next page (None on
+        the last page).
+    """
+    soup = make_soup(content)
+    reviews = []
+
+    for item in soup.select('div.lister-item.imdb-user-review'):
+        text = item.select_one('div.content div.text')
+        if not text:
+            continue
+        title_link = item.select_one('a.title')
+        rating = item.select_one('span.rating-other-user-rating span')
+        author = item.select_one('span.display-name-link a')
+        posted = item.select_one('span.review-date')
+        actions = item.select_one('div.actions')
+        helpful, total = _parse_helpful(actions.get_text(' ', strip=True)) if actions else (0, 0)
+
+        review = {
+            'review_id': item.get('data-review-id'),
+            'title': title_link.get_text(strip=True) if title_link else '',
+            'content': text.get_text('\n', strip=True),
+            'url': f"https://www.imdb.com{title_link['href']}" if title_link and title_link.get('href') else None,
+            'type': 'user',
+            'source': 'imdb_reviews',
+            'author': author.get_text(strip=True) if author else None,
+            'date': _parse_date(posted.get_text()) if posted else None,
+            'helpful_votes': helpful,
+            'total_votes': total,
+            'spoiler': item.select_one('span.spoiler-warning') is not None,
+        }
+        if rating and rating.get_text(strip=True).isdigit():
+            review['rating'] = rating.get_text(strip=True)
+        reviews.append(review)
+
+    more = soup.select_one('div.load-more-data[data-key]')
+    return reviews, (more['data-key'] if more else None)
+
+
+class ReviewHarvester:
+    """
+    Lazily walks every review page of a title with bounded read-ahead.
+    """
+
+    def __init__(self, transport: Optional[Transport] = None, prefetch: int = 2):
+        """
+        Args:
+            transport: Shared HTTP transport (rate limits, retries, cache).
+            prefetch: Pages fetched ahead of the consumer (and the most
+                that are ever held in memory).
+        """
+        self.transport = transport or Transport()
+        self.prefetch = max(1, prefetch)
+
+    def page_url(self, imdb_id: str, pagination_key: Optional[str] = None, sort: str = 'helpfulnessScore', direction: str = 'desc') -> str:
+        params = {'sort': sort, 'dir': direction, 'ratingFilter': 0}
+        if pagination_key:
+            params['paginationKey'] = pagination_key
+        return f"{REVIEWS_URL.format(imdb_id=imdb_id)}?{urlencode(params)}"
+
+    def iter_pages(self, imdb_id: str, sort: str = 'helpfulnessScore', max_pages: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Yield review pages in order, fetching up to ``prefetch`` pages ahead.
+
+        Closing the generator (or dropping it) stops the background fetcher.
+        """
+        pages: "queue.Queue" = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            key, fetched = None, 0
+            try:
+                while not stop.is_set() and (max_pages is None or fetched < max_pages):
+                    response = self.transport.get(self.page_url(imdb_id, key, sort))
+                    response.raise_for_status()
+                    reviews, key = parse_review_page(response.content)
+                    fetched += 1
+                    if not reviews or not put(reviews) or not key:
+                        break
+            except Exception as e:
+                put(e)
+            finally:
+                put(_DONE)
+
+        producer = threading.Thread(target=produce, name=f"reviews-{imdb_id}", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def iter_reviews(
+        self,
+        imdb_id: str,
+        max_reviews: Optional[int] = None,
+        min_helpful: int = 0,
+        since: Optional[date] = None,
+        sort: str = 'helpfulnessScore',
+    ) -> Iterator[Dict]:
+        """
+        Yield a title's reviews one at a time.
+
+        Args:
+            imdb_id: IMDb title ID, e.g. ``tt0133093``.
+            max_reviews: Stop after this many reviews (None for all).
+            min_helpful: Skip reviews with fewer "helpful" votes.
+            since: Stop at the first review posted before this date. Pages
+                are then requested newest first regardless of ``sort``.
+            sort: IMDb sort key (``helpfulnessScore``, ``submissionDate``,
+                ``totalVotes``, ``userRating``).
+
+        Yields:
+            Review dicts with the same keys as the DDGS reviews plus
+            review_id, author, date, helpful_votes, total_votes and spoiler.
+        """
+        if since is not None:
+            sort = 'submissionDate'
+        cutoff = since.isoformat() if since else None
+        count = 0
+
+        pages = self.iter_pages(imdb_id, sort)
+        try:
+            for page in pages:
+                for review in page:
+                    if cutoff and review['date'] and review['date'] < cutoff:
+                        return
+                    if review['helpful_votes'] < min_helpful:
+                        continue
+                    yield review
+                    count += 1
+                    if max_reviews is not None and count >= max_reviews:
+                        return
+        finally:
+            pages.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream every IMDb user review of a title to JSON lines")
+    parser.add_argument("imdb_id", help="IMDb title ID, e.g. tt0133093")
+    parser.add_argument("--max-reviews", type=int, default=None)
+    parser.add_argument("--min-helpful", type=int, default=0, help="Minimum 'found this helpful' votes")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Only reviews posted on or after YYYY-MM-DD")
+    parser.add_argument("--out", type=Path, default=None, help="Output .jsonl file (default: stdout)")
+    args = parser.parse_args()
+
+    harvester = ReviewHarvester()
+    reviews = harvester.iter_reviews(args.imdb_id, args.max_reviews, args.min_helpful, args.since)
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+    count = 0
+    try:
+        for review in reviews:
+            print(json.dumps(review, ensure_ascii=False), file=out)
+            count += 1
+    finally:
+        if out:
+            out.close()
+    if out:
+        print(f"✅ Saved {count} reviews to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
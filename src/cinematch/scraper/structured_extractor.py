@@ -0,0 +1,322 @@
+"""
+structured_extractor.py
+-----------------------
+
+Fast, single-pass extraction of movie data from the JSON payloads that
+IMDb embeds in every title page:
+
+* the schema.org ``application/ld+json`` block (title, rating, genres, cast...)
+* the Next.js ``__NEXT_DATA__`` blob (runtime, box office, tech specs...)
+
+Both are located with a regular expression over the raw HTML and decoded
+with ``json.loads``; no DOM is built. The result uses the same keys as the
+CSS-selector extractors in ``IMDbScraperDDGS`` so either path can fill
+``movie_data``. Sections that the payloads do not cover are simply absent,
+which tells the caller to fall back to the selectors.
+"""
+
+import html
+import json
+import re
+from typing import Any, Dict, List, Optional, Union
+
+_JSON_LD_RE = re.compile(
+    rb'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.S | re.I
+)
+_NEXT_DATA_RE = re.compile(
+    rb'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S | re.I
+)
+_ISO_DURATION_RE = re.compile(r'^PT(?:(\d+)H)?(?:(\d+)M)?')
+
+_MONTHS = [
+    'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December',
+]
+
+
+def _dig(obj: Any, *path: Union[str, int]) -> Any:
+    """Safely walk nested dicts/lists; returns None on any missing step."""
+    for key in path:
+        if isinstance(obj, dict):
+            obj = obj.get(key)
+        elif isinstance(obj, list) and isinstance(key, int) and -len(obj) <= key < len(obj):
+            obj = obj[key]
+        else:
+            return None
+        if obj is None:
+            return None
+    return obj
+
+
+def _texts(items: Optional[List], *path: Union[str, int]) -> List[str]:
+    """Collect unique non-empty strings at ``path`` from each item of a list."""
+    values = []
+    for item in items or []:
+        value = _dig(item, *path)
+        if isinstance(value, str) and value and value not in values:
+            values.append(value)
+    return values
+
+
+def _load_json(raw: Optional[bytes]) -> Optional[Dict]:
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _format_duration(seconds: Optional[int], iso: Optional[str] = None) -> Optional[str]:
+    """Format a runtime as IMDb displays it, e.g. ``2h 16m``."""
+    if seconds is None and iso:
+        match = _ISO_DURATION_RE.match(iso)
+        if match and any(match.groups()):
+            seconds = int(match.group(1) or 0) * 3600 + int(match.group(2) or 0) * 60
+    if not seconds:
+        return None
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    if hours and minutes:
+        return f"{hours}h {minutes}m"
+    return f"{hours}h" if hours else f"{minutes}m"
+
+
+def _format_money(money: Optional[Dict]) -> Optional[str]:
+    amount = _dig(money, 'amount')
+    if amount is None:
+        return None
+    currency = _dig(money, 'currency') or ''
+    prefix = '$' if currency == 'USD' else f"{currency} "
+    return f"{prefix}{int(amount):,}"
+
+
+def _format_date(date: Optional[Dict]) -> Optional[str]:
+    year = _dig(date, 'year')
+    if not year:
+        return None
+    month = _dig(date, 'month')
+    day = _dig(date, 'day')
+    text = str(year)
+    # A month outside 1-12 (malformed payload) leaves just the year
+    if isinstance(month, int) and 1 <= month <= 12:
+        text = f"{_MONTHS[month - 1]} {day}, {year}" if day else f"{_MONTHS[month - 1]} {year}"
+    country = _dig(date, 'country', 'text')
+    return f"{text} ({country})" if country else text
+
+
+def _from_json_ld(ld: Dict) -> Dict:
+    data: Dict[str, Any] = {}
+
+    if ld.get('name'):
+        data['title'] = html.unescape(ld['name'])
+    if ld.get('datePublished'):
+        data['year'] = str(ld['datePublished'])[:4]
+    duration = _format_duration(None, ld.get('duration'))
+    if duration:
+        data['duration'] = duration
+
+    rating = ld.get('aggregateRating') or {}
+    if rating.get('ratingValue') is not None:
+        data['imdb_rating'] = str(rating['ratingValue'])
+    if rating.get('ratingCount') is not None:
+        data['rating_count'] = f"{int(rating['ratingCount']):,}"
+
+    if ld.get('contentRating'):
+        data['content_rating'] = ld['contentRating']
+    if ld.get('description'):
+        data['summary'] = html.unescape(ld['description'])
+
+    storyline = {}
+    genres = ld.get('genre')
+    if genres:
+        storyline['genres'] = [genres] if isinstance(genres, str) else list(genres)
+    if ld.get('keywords'):
+        storyline['keywords'] = [k.strip() for k in ld['keywords'].split(',') if k.strip()]
+    if storyline:
+        data['storyline'] = storyline
+
+    actors = _texts(ld.get('actor'), 'name')
+    if actors:
+        data['cast'] = [{'actor': html.unescape(name), 'character': 'Unknown'} for name in actors]
+
+    return data
+
+
+def _from_next_data(next_data: Dict) -> Dict:
+    page = _dig(next_data, 'props', 'pageProps') or {}
+    above = page.get('aboveTheFoldData') or {}
+    main = page.get('mainColumnData') or {}
+    data: Dict[str, Any] = {}
+
+    title = _dig(above, 'titleText', 'text')
+    if title:
+        data['title'] = title
+    year = _dig(above, 'releaseYear', 'year')
+    if year:
+        data['year'] = str(year)
+    duration = _dig(above, 'runtime', 'displayableProperty', 'value', 'plainText') or _format_duration(_dig(above, 'runtime', 'seconds'))
+    if duration:
+        data['duration'] = duration
+
+    rating = _dig(above, 'ratingsSummary', 'aggregateRating')
+    if rating is not None:
+        data['imdb_rating'] = str(rating)
+    votes = _dig(above, 'ratingsSummary', 'voteCount')
+    if votes is not None:
+        data['rating_count'] = f"{int(votes):,}"
+    certificate = _dig(above, 'certificate', 'rating')
+    if certificate:
+        data['content_rating'] = certificate
+
+    plot = _dig(above, 'plot', 'plotText', 'plainText')
+    if plot:
+        data['summary'] = plot
+
+    # Cast with character names
+    cast = []
+    for edge in (_dig(main, 'cast', 'edges') or [])[:20]:
+        actor = _dig(edge, 'node', 'name', 'nameText', 'text')
+        if not actor:
+            continue
+        characters = _texts(_dig(edge, 'node', 'characters'), 'name')
+        cast.append({'actor': actor, 'character': ' / '.join(characters) or 'Unknown'})
+    if cast:
+        data['cast'] = cast
+
+    # Storyline
+    storyline = {}
+    if plot:
+        storyline['plot_summary'] = plot
+    genres = _texts(_dig(above, 'genres', 'genres'), 'text')
+    if genres:
+        storyline['genres'] = genres
+    tagline = _dig(main, 'taglines', 'edges', 0, 'node', 'text')
+    if tagline:
+        storyline['tagline'] = tagline
+    keywords = _texts(_dig(above, 'keywords', 'edges'), 'node', 'text')
+    if keywords:
+        storyline['keywords'] = keywords
+    if storyline:
+        data['storyline'] = storyline
+
+    # Details
+    details = {}
+    release_date = _format_date(_dig(main, 'releaseDate'))
+    if release_date:
+        details['release_date'] = release_date
+    countries = _texts(_dig(main, 'countriesOfOrigin', 'countries'), 'text')
+    if countries:
+        details['country'] = countries[0]
+        details['countries_of_origin'] = countries if len(countries) > 1 else countries[0]
+    languages = _texts(_dig(main, 'spokenLanguages', 'spokenLanguages'), 'text')
+    if languages:
+        details['languages'] = languages
+    locations = _texts(_dig(main, 'filmingLocations', 'edges'), 'node', 'text')
+    if locations:
+        details['filming_locations'] = locations if len(locations) > 1 else locations[0]
+    companies = _texts(_dig(main, 'production', 'edges'), 'node', 'company', 'companyText', 'text')
+    if companies:
+        details['production_companies'] = companies if len(companies) > 1 else companies[0]
+    if details:
+        data['details'] = details
+
+    # Box office
+    box_office = {}
+    for key, path in (
+        ('budget', ('productionBudget', 'budget')),
+        ('gross_usa', ('lifetimeGross', 'total')),
+        ('opening_weekend_usa', ('openingWeekendGross', 'gross', 'total')),
+        ('gross_worldwide', ('worldwideGross', 'total')),
+    ):
+        value = _format_money(_dig(main, *path))
+        if value:
+            box_office[key] = value
+    if box_office:
+        data['box_office'] = box_office
+
+    # Technical specifications
+    specs = {}
+    if duration:
+        specs['runtime'] = duration
+    specs_root = _dig(main, 'technicalSpecifications') or {}
+    for key, path in (
+        ('color', ('colorations', 'items')),
+        ('sound_mix', ('soundMixes', 'items')),
+    ):
+        values = _texts(_dig(specs_root, *path), 'text')
+        if values:
+            specs[key] = ', '.join(values)
+    ratios = _texts(_dig(specs_root, 'aspectRatios', 'items'), 'aspectRatio')
+    if ratios:
+        specs['aspect_ratio'] = ', '.join(ratios)
+    if specs:
+        data['technical_specs'] = specs
+
+    return data
+
+
+def merge_movie_data(base: Dict, extra: Dict) -> Dict:
+    """Merge ``extra`` into ``base``; nested dicts are merged key by key, base wins."""
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            for sub_key, sub_value in value.items():
+                base[key].setdefault(sub_key, sub_value)
+        else:
+            base.setdefault(key, value)
+    return base
+
+
+def has_characters(cast: Optional[List[Dict]]) -> bool:
+    """True when at least one cast entry names its character (JSON-LD never does)."""
+    return any(entry.get('character') not in (None, '', 'Unknown') for entry in cast or [])
+
+
+def has_storyline_text(storyline: Optional[Dict]) -> bool:
+    """True when the storyline has its plot and tagline (JSON-LD only has genres and keywords)."""
+    return bool(storyline and storyline.get('plot_summary') and storyline.get('tagline'))
+
+
+def merge_cast(base: Optional[List[Dict]], extra: Optional[List[Dict]]) -> List[Dict]:
+    """
+    Combine two cast lists, preferring the one that knows the characters.
+
+    A JSON-LD cast (actors only) is replaced by a selector-extracted cast
+    when that one names characters; otherwise ``base`` is kept.
+    """
+    if not has_characters(base) and has_characters(extra):
+        return list(extra)
+    return list(base or extra or [])
+
+
+def extract_structured_data(content: Union[bytes, str]) -> Dict:
+    """
+    Extract movie data from the JSON payloads embedded in an IMDb title page.
+
+    The Next.js blob is preferred (it carries character names, box office and
+    tech specs); JSON-LD fills whatever it lacks.
+
+    Args:
+        content: Raw page HTML.
+
+    Returns:
+        Partial ``movie_data`` dict. Empty if the page has no payloads.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    data: Dict[str, Any] = {}
+
+    next_match = _NEXT_DATA_RE.search(content)
+    next_data = _load_json(next_match.group(1) if next_match else None)
+    if next_data:
+        data = _from_next_data(next_data)
+
+    for match in _JSON_LD_RE.finditer(content):
+        ld = _load_json(match.group(1))
+        if isinstance(ld, dict) and ld.get('@type') in ('Movie', 'TVSeries', 'TVEpisode', 'TVMovie', 'CreativeWork'):
+            merge_movie_data(data, _from_json_ld(ld))
+            break
+
+    if 'summary' in data:
+        data.setdefault('synopsis', data['summary'])
+    return data
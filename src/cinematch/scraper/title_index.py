@@ -0,0 +1,309 @@
+"""
+title_index.py
+--------------
+
+Offline IMDb title index built from the public dataset dumps
+(https://datasets.imdbws.com/ ``title.basics.tsv.gz`` and, optionally,
+``title.ratings.tsv.gz``).
+
+The index is a directory of flat NumPy arrays that are memory-mapped on
+load, so opening it is instant and several processes share the same pages:
+
+* ``ids.npy`` / ``years.npy`` / ``votes.npy``  one row per title
+* ``titles.bin`` + ``title_offsets.npy``       UTF-8 primary titles
+* ``original_titles.bin`` + ``original_offsets.npy``
+  UTF-8 original titles (empty when equal to the primary title)
+* ``gram_counts.npy``                           trigrams per title variant
+* ``gram_keys.npy`` + ``gram_offsets.npy`` + ``postings.npy``
+  a character-trigram inverted index (CSR layout) over normalized titles
+
+Every title has two variants, primary (``2 * row``) and original
+(``2 * row + 1``); postings and gram counts are per variant, so a title
+found through its original name is scored against that name. A lookup
+merges the posting lists of the query's rarest trigrams, filters the
+candidates by year, ranks variants by trigram Dice coefficient
+(vectorized) and only then runs ``difflib`` on the best few titles,
+keeping the better of their two names.
+
+Usage:
+    python -m cinematch.scraper.title_index build --basics title.basics.tsv.gz --ratings title.ratings.tsv.gz
+    python -m cinematch.scraper.title_index query "The Matrix" --year 1999
+"""
+
+import argparse
+import csv
+import difflib
+import gzip
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .resolution_cache import normalize_title
+
+DEFAULT_INDEX_DIR = Path("data/title_index")
+DEFAULT_TITLE_TYPES = ("movie", "tvMovie")
+
+
+def title_grams(title: str) -> List[int]:
+    """Hashed character trigrams of a normalized, space-padded title."""
+    padded = f" {normalize_title(title)} "
+    return sorted({zlib.crc32(padded[i:i + 3].encode('utf-8')) for i in range(len(padded) - 2)})
+
+
+def _open_tsv(path: Path):
+    opener = gzip.open if str(path).endswith('.gz') else open
+    return opener(path, 'rt', encoding='utf-8', newline='')
+
+
+def _read_votes(ratings_path: Optional[Path]) -> Dict[str, int]:
+    votes = {}
+    if ratings_path:
+        with _open_tsv(ratings_path) as f:
+            for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                votes[row['tconst']] = int(row['numVotes'])
+    return votes
+
+
+def build_index(basics_path: Path, out_dir: Path = DEFAULT_INDEX_DIR, ratings_path: Optional[Path] = None, title_types=DEFAULT_TITLE_TYPES) -> int:
+    """
+    Build the title index from ``title.basics.tsv(.gz)``.
+
+    Args:
+        basics_path: Path to the IMDb basics dump.
+        out_dir: Directory to write the index to.
+        ratings_path: Optional ``title.ratings.tsv(.gz)``; vote counts are
+            used to rank otherwise identical matches.
+        title_types: ``titleType`` values to keep.
+
+    Returns:
+        Number of indexed titles.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    votes_by_id = _read_votes(ratings_path)
+    title_types = set(title_types)
+
+    ids, years, votes, counts = array('I'), array('H'), array('I'), array('H')
+    offsets, original_offsets = array('Q', [0]), array('Q', [0])
+    gram_keys, gram_variants = array('I'), array('I')
+
+    with _open_tsv(basics_path) as f, \
+            open(out_dir / "titles.bin", 'wb') as titles_out, \
+            open(out_dir / "original_titles.bin", 'wb') as originals_out:
+        for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+            if row['titleType'] not in title_types:
+                continue
+            row_id = len(ids)
+            ids.append(int(row['tconst'][2:]))
+            years.append(int(row['startYear']) if row['startYear'].isdigit() else 0)
+            votes.append(votes_by_id.get(row['tconst'], 0))
+
+            primary = row['primaryTitle']
+            original = row['originalTitle'] if row['originalTitle'] not in ('', '\\N', primary) else ''
+            for variant, (title, out, ends) in enumerate(((primary, titles_out, offsets), (original, originals_out, original_offsets))):
+                encoded = title.encode('utf-8')
+                out.write(encoded)
+                ends.append(ends[-1] + len(encoded))
+
+                grams = title_grams(title) if title else []
+                counts.append(min(len(grams), 0xFFFF))
+                gram_keys.extend(grams)
+                gram_variants.extend([2 * row_id + variant] * len(grams))
+
+    keys = np.frombuffer(gram_keys, dtype=np.uint32)
+    variants = np.frombuffer(gram_variants, dtype=np.uint32)
+    order = np.argsort(keys, kind='stable')
+    unique_keys, starts = np.unique(keys[order], return_index=True)
+
+    np.save(out_dir / "ids.npy", np.frombuffer(ids, dtype=np.uint32))
+    np.save(out_dir / "years.npy", np.frombuffer(years, dtype=np.uint16))
+    np.save(out_dir / "votes.npy", np.frombuffer(votes, dtype=np.uint32))
+    np.save(out_dir / "gram_counts.npy", np.frombuffer(counts, dtype=np.uint16))
+    np.save(out_dir / "title_offsets.npy", np.frombuffer(offsets, dtype=np.uint64))
+    np.save(out_dir / "original_offsets.npy", np.frombuffer(original_offsets, dtype=np.uint64))
+    np.save(out_dir / "gram_keys.npy", unique_keys.astype(np.uint32))
+    np.save(out_dir / "gram_offsets.npy", np.append(starts, len(keys)).astype(np.uint64))
+    np.save(out_dir / "postings.npy", variants[order])
+    return len(ids)
+
+
+class TitleIndex:
+    """
+    Read-only, memory-mapped fuzzy title index.
+    """
+
+    def __init__(self, index_dir: Path = DEFAULT_INDEX_DIR, max_df: float = 0.02, candidates: int = 8):
+        """
+        Args:
+            index_dir: Directory produced by ``build_index``.
+            max_df: Trigrams occurring in more than this fraction of titles
+                are skipped when the query has rarer ones (e.g. "the").
+            candidates: Titles kept for ``difflib`` scoring per query.
+        """
+        index_dir = Path(index_dir)
+        if not (index_dir / "original_offsets.npy").exists():
+            raise ValueError(f"{index_dir} was built by an older version without original titles; rebuild it")
+
+        def load(name):
+            # Plain ndarray view over the memmap (avoids memmap.__getitem__ overhead)
+            return np.asarray(np.load(index_dir / name, mmap_mode='r'))
+
+        self.ids = load("ids.npy")
+        self.years = load("years.npy")
+        self.votes = load("votes.npy")
+        self.gram_counts = load("gram_counts.npy")
+        self.title_offsets = load("title_offsets.npy")
+        self.gram_keys = load("gram_keys.npy")
+        self.gram_offsets = load("gram_offsets.npy")
+        self.postings = load("postings.npy")
+        self.original_offsets = load("original_offsets.npy")
+        self.titles = self._load_text(index_dir / "titles.bin", self.title_offsets)
+        self.original_titles = self._load_text(index_dir / "original_titles.bin", self.original_offsets)
+        self.max_df = max_df
+        self.candidates = candidates
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _load_text(path: Path, offsets: np.ndarray) -> np.ndarray:
+        # np.memmap refuses empty files
+        return np.asarray(np.memmap(path, dtype=np.uint8, mode='r')) if offsets[-1] else np.zeros(0, np.uint8)
+
+    def title(self, row: int) -> str:
+        start, end = int(self.title_offsets[row]), int(self.title_offsets[row + 1])
+        return self.titles[start:end].tobytes().decode('utf-8')
+
+    def original_title(self, row: int) -> Optional[str]:
+        """The title's original name, or None when it equals the primary title."""
+        start, end = int(self.original_offsets[row]), int(self.original_offsets[row + 1])
+        return self.original_titles[start:end].tobytes().decode('utf-8') if end > start else None
+
+    def _posting_lists(self, grams: np.ndarray) -> List[np.ndarray]:
+        positions = np.searchsorted(self.gram_keys, grams)
+        in_range = positions < len(self.gram_keys)
+        positions, grams = positions[in_range], grams[in_range]
+        positions = positions[self.gram_keys[positions] == grams]
+        starts = self.gram_offsets[positions].tolist()
+        ends = self.gram_offsets[positions + 1].tolist()
+        return [self.postings[start:end] for start, end in zip(starts, ends)]
+
+    def search(self, title: str, year: Optional[int] = None, limit: int = 5, year_tolerance: int = 0) -> List[Dict]:
+        """
+        Fuzzy title search.
+
+        Args:
+            title: Title to look up.
+            year: Optional release year filter.
+            limit: Maximum results.
+            year_tolerance: Accepted +/- difference from ``year``.
+
+        Returns:
+            Results ordered by score, each with imdb_id, title, year,
+            similarity, score and votes. ``score`` adds the same +0.3 year
+            bonus as the DDGS searcher.
+        """
+        grams = np.asarray(title_grams(title), dtype=np.uint32)
+        lists = self._posting_lists(grams)
+        if not lists:
+            return []
+
+        # Drop very common trigrams unless nothing else is left
+        max_len = max(1, int(self.max_df * len(self)))
+        rare = [p for p in lists if len(p) <= max_len]
+        if rare:
+            lists = rare
+
+        variants, counts = np.unique(np.concatenate(lists), return_counts=True)
+        if year:
+            row_years = self.years[variants // 2].astype(np.int32)
+            keep = np.abs(row_years - year) <= year_tolerance
+            variants, counts = variants[keep], counts[keep]
+        if not len(variants):
+            return []
+
+        # Trigram Dice coefficient per title variant, then difflib on the best few titles only
+        dice = 2 * counts / (len(grams) + self.gram_counts[variants])
+        # A title has at most two variants, so the best 2 * candidates variants cover the best titles
+        keep = 2 * self.candidates
+        if len(variants) > keep:
+            top = np.argpartition(-dice, keep)[:keep]
+            variants, dice = variants[top], dice[top]
+        order = np.argsort(-dice, kind='stable')
+        rows = list(dict.fromkeys((variants[order] // 2).tolist()))[:self.candidates]
+
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq2(normalize_title(title))
+        results = []
+        for row in rows:
+            candidate = self.title(row)
+            similarity = 0.0
+            for name in (candidate, self.original_title(row)):
+                if name:
+                    matcher.set_seq1(normalize_title(name))
+                    similarity = max(similarity, matcher.ratio())
+            row_year = int(self.years[row]) or None
+            results.append({
+                'imdb_id': f"tt{int(self.ids[row]):07d}",
+                'title': candidate,
+                'year': row_year,
+                'similarity': similarity,
+                'score': similarity + (0.3 if year and row_year else 0.0),
+                'votes': int(self.votes[row]),
+            })
+
+        results.sort(key=lambda r: (r['score'], r['votes']), reverse=True)
+        return results[:limit]
+
+
+def _iter_titles(path: Path) -> Iterator[str]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline IMDb title index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build the index from IMDb dataset dumps")
+    build.add_argument("--basics", type=Path, required=True, help="title.basics.tsv(.gz)")
+    build.add_argument("--ratings", type=Path, default=None, help="title.ratings.tsv(.gz) (optional)")
+    build.add_argument("--out", type=Path, default=DEFAULT_INDEX_DIR)
+    build.add_argument("--types", nargs="+", default=list(DEFAULT_TITLE_TYPES), help="titleType values to keep")
+
+    query = sub.add_parser("query", help="Look up one title, or every line of a file with --file")
+    query.add_argument("title", nargs="?")
+    query.add_argument("--year", type=int, default=None)
+    query.add_argument("--file", type=Path, default=None, help="File with one title per line (reports titles/sec)")
+    query.add_argument("--index", type=Path, default=DEFAULT_INDEX_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        count = build_index(args.basics, args.out, args.ratings, args.types)
+        print(f"✅ Indexed {count} titles in {time.perf_counter() - start:.1f}s -> {args.out}")
+        return
+
+    index = TitleIndex(args.index)
+    if args.file:
+        titles = list(_iter_titles(args.file))
+        start = time.perf_counter()
+        found = sum(1 for t in titles if index.search(t, limit=1))
+        elapsed = time.perf_counter() - start
+        print(f"Resolved {found}/{len(titles)} titles in {elapsed:.2f}s ({len(titles) / elapsed:.0f} titles/sec)")
+    elif args.title:
+        for result in index.search(args.title, args.year):
+            print(f"{result['imdb_id']}  {result['title']} ({result['year']})  score={result['score']:.2f} votes={result['votes']}")
+    else:
+        parser.error("query needs a title or --file")
+
+
+if __name__ == "__main__":
+    main()
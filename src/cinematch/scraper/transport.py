@@ -0,0 +1,150 @@
+"""
+transport.py
+------------
+
+Shared HTTP transport for every module of the scraping engine.
+
+One ``Transport`` owns a pooled keep-alive ``requests.Session`` with the
+browser headers from ``utils.get_headers``, default timeouts, and retries
+with jittered exponential backoff on 429/5xx responses and connection
+errors. It also routes requests through the optional per-host rate limiter
+and on-disk response cache, so callers only ever ask for a URL, and
+records per-host request metrics when a ``ScrapeMetrics`` is attached.
+"""
+
+import random
+import time
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import ResponseCache
+from .metrics import ScrapeMetrics
+from .rate_limiter import HostRateLimiter
+from .utils import get_headers
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class Transport:
+    """
+    Pooled, retrying HTTP client shared by the scrapers.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        timeout: Timeout = (5, 30),
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+        pool_maxsize: int = 16,
+        metrics: Optional[ScrapeMetrics] = None,
+    ):
+        """
+        Args:
+            rate_limiter: Optional per-host limiter applied to every attempt.
+            cache: Optional on-disk response cache.
+            timeout: Default (connect, read) timeout in seconds.
+            max_retries: Retries after the first attempt on 429/5xx/connection errors.
+            backoff_base: Base delay for exponential backoff, in seconds.
+            backoff_cap: Upper bound for a single backoff delay.
+            pool_maxsize: Keep-alive connections kept per host (set to at
+                least the number of concurrent workers).
+            metrics: Optional metrics sink for latency, bytes, status codes,
+                retries, errors, cache hits and rate-limit waits.
+        """
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.metrics = metrics
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(get_headers())
+
+    def throttle(self, host: str):
+        """Wait for a request slot on ``host`` when a rate limiter is configured."""
+        if self.rate_limiter:
+            if self.metrics:
+                with self.metrics.timer('rate_limit_wait_seconds', host=host):
+                    self.rate_limiter.acquire(host)
+            else:
+                self.rate_limiter.acquire(host)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Delay before retry number ``attempt`` (0-based).
+
+        Honours a numeric ``Retry-After`` header, otherwise uses "full jitter"
+        exponential backoff: uniform(0, min(cap, base * 2**attempt)).
+        """
+        if retry_after and retry_after.strip().isdigit():
+            return min(self.backoff_cap, float(retry_after))
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[Timeout] = None) -> requests.Response:
+        host = urlparse(url).netloc
+        timeout = timeout if timeout is not None else self.timeout
+
+        for attempt in range(self.max_retries + 1):
+            self.throttle(host)
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.metrics:
+                    self.metrics.inc('http_errors_total', host=host, error=type(e).__name__)
+                if attempt >= self.max_retries:
+                    raise
+                if self.metrics:
+                    self.metrics.inc('http_retries_total', host=host)
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️ {type(e).__name__} on {url}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            if self.metrics:
+                self.metrics.observe('http_request_seconds', time.perf_counter() - start, host=host)
+                self.metrics.inc('http_responses_total', host=host, status=response.status_code)
+                self.metrics.inc('http_response_bytes_total', len(response.content), host=host)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                if self.metrics:
+                    self.metrics.inc('http_retries_total', host=host)
+                delay = self.backoff_delay(attempt, response.headers.get('Retry-After'))
+                print(f"⚠️ HTTP {response.status_code} on {url}, retrying in {delay:.1f}s...")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            return response
+
+        return response
+
+    def get(self, url: str, timeout: Optional[Timeout] = None, use_cache: bool = True):
+        """
+        GET ``url`` through the cache (when configured), rate limiter and retry loop.
+
+        Returns:
+            A ``requests.Response`` or, for cache hits, a ``CachedResponse``.
+        """
+        def fetch(extra_headers: Dict[str, str]):
+            return self._request(url, headers=extra_headers, timeout=timeout)
+
+        if self.cache and use_cache:
+            response = self.cache.get(url, fetch)
+            if self.metrics and getattr(response, 'from_cache', False):
+                self.metrics.inc('http_cache_hits_total', host=urlparse(url).netloc)
+            return response
+        return fetch({})
@@ -7,12 +7,24 @@ Its primary purpose allows our scraper to mimic a legitimate web browser
 Avoid being blocked by anti-bot protections.
 """
 
-from typing import Dict
+from typing import Dict, Union
+
+from bs4 import BeautifulSoup
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 def get_headers() -> Dict[str, str]:
     """
     Constructs and returns a dictionary of HTTP headers to mimick a real browser.
 
+    ``Accept-Encoding`` advertises brotli only when a brotli decoder is
+    installed, since urllib3 can otherwise not decode ``br`` bodies.
+
     Returns:
         Dict[str, str]: A dictionary containing standard browser headers.
     """
@@ -20,7 +32,25 @@ def get_headers() -> Dict[str, str]:
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/91.0.4472.124 Safari/537.36"
+            "Chrome/120.0.0.0 Safari/537.36"
         ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": ACCEPT_ENCODING,
     }
+
+
+def make_soup(markup: Union[bytes, str]) -> BeautifulSoup:
+    """
+    Parses HTML with the fastest available BeautifulSoup backend.
+
+    Uses ``lxml`` when it is installed and falls back to the pure-Python
+    ``html.parser`` otherwise.
+
+    Args:
+        markup: Raw HTML.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    return BeautifulSoup(markup, HTML_PARSER)
@@ -1,12 +1,26 @@
-from cinematch.processing.store import VectorStore
-
-store = VectorStore()
-count = store.count()
-print(f"Total Documents in DB: {count}")
-
-if count > 0:
-    print("Sample Data:")
-    peek = store.peek(1)
-    print(peek)
-else:
-    print("Database is empty.")
+import argparse
+
+from cinematch.processing.registry import get_vector_store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what the vector database holds")
+    parser.add_argument("--collection", type=str, default="cinematch_reviews", help="Collection to inspect")
+    parser.add_argument("--path", type=str, default="./data/chroma_db", help="ChromaDB directory")
+    parser.add_argument("--peek", type=int, default=1, help="Number of sample documents to print")
+    args = parser.parse_args(argv)
+
+    # chromadb is only imported here, after argument parsing.
+    store = get_vector_store(args.collection, args.path)
+    count = store.count()
+    print(f"Total Documents in DB: {count}")
+    print(f"Index: {store.hnsw_config}")
+
+    if count > 0:
+        print("Sample Data:")
+        peek = store.peek(args.peek)
+        print(peek)
+    else:
+        print("Database is empty.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+test_chunking.py
+----------------
+
+Offline checks for token-aware chunking and length-bucketed batching, using
+a small whitespace tokenizer built in memory instead of a downloaded model.
+Encoding is a single model call unless a token budget is set and the input
+spans several batches.
+
+Usage:
+    python -m tests.test_chunking
+"""
+
+import sys
+import types
+from unittest import mock
+
+import numpy as np
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from cinematch.processing.cleaning import chunk_by_tokens, plain_tokenizer
+from cinematch.processing.embedding import EmbeddingModel, length_batches
+from cinematch.processing.pipeline import chunk_records
+
+
+def make_tokenizer() -> Tokenizer:
+    vocab = {"[UNK]": 0, **{f"w{i}": i + 1 for i in range(100)}}
+    tokenizer = Tokenizer(WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    return tokenizer
+
+
+def words(start: int, stop: int) -> str:
+    return " ".join(f"w{i}" for i in range(start, stop))
+
+
+def test_chunks_fit_and_overlap():
+    tokenizer = make_tokenizer()
+    text = words(0, 25)
+
+    chunks = chunk_by_tokens([text, "w1 w2", "", "  "], tokenizer, max_tokens=10, overlap=3)
+
+    assert chunks[0] == [words(0, 10), words(7, 17), words(14, 24), words(21, 25)]
+    assert chunks[1:] == [["w1 w2"], [], []]
+    # Without overlap the chunks tile the text exactly.
+    assert " ".join(chunk_by_tokens([text], tokenizer, max_tokens=10, overlap=0)[0]) == text
+    # A text of exactly max_tokens + overlap needs no near-empty last chunk.
+    assert chunk_by_tokens([words(0, 13)], tokenizer, max_tokens=10, overlap=3)[0] == [words(0, 10), words(7, 13)]
+
+    try:
+        chunk_by_tokens([text], tokenizer, max_tokens=10, overlap=10)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("overlap >= max_tokens must be rejected")
+
+
+def test_truncating_tokenizer_is_not_used_or_mutated():
+    tokenizer = make_tokenizer()
+    tokenizer.enable_truncation(max_length=5)
+
+    chunks = chunk_by_tokens([words(0, 12)], tokenizer, max_tokens=10, overlap=2)
+
+    assert chunks[0] == [words(0, 10), words(8, 12)]
+    assert tokenizer.truncation["max_length"] == 5
+    assert plain_tokenizer(tokenizer).truncation is None
+
+
+def test_chunk_records_keep_metadata():
+    tokenizer = make_tokenizer()
+    records = [(words(0, 15), {"movie_id": "tt1"}), ("w1 w2", {"movie_id": "tt1"})]
+
+    chunked = list(chunk_records(records, lambda texts: chunk_by_tokens(texts, tokenizer, max_tokens=10, overlap=0)))
+
+    assert [text for text, _ in chunked] == [words(0, 10), words(10, 15), "w1 w2"]
+    assert [(meta["chunk_index"], meta["chunk_count"]) for _, meta in chunked] == [(0, 2), (1, 2), (0, 1)]
+    assert all(meta["movie_id"] == "tt1" for _, meta in chunked)
+
+
+def test_length_batches():
+    lengths = np.array([50, 3, 40, 4, 5, 60, 2])
+
+    batches = length_batches(lengths, batch_size=3)
+    assert [lengths[batch].tolist() for batch in batches] == [[2, 3, 4], [5, 40, 50], [60]]
+
+    # Every position appears exactly once, and the token cap splits long batches.
+    capped = length_batches(lengths, batch_size=4, max_batch_tokens=100)
+    assert sorted(np.concatenate(capped).tolist()) == list(range(len(lengths)))
+    assert all(len(batch) <= 4 for batch in capped)
+    assert all(len(batch) == 1 or len(batch) * lengths[batch].max() <= 100 for batch in capped)
+    assert [lengths[batch].tolist() for batch in capped] == [[2, 3, 4, 5], [40, 50], [60]]
+
+
+class FakeSentenceTransformer:
+    """Embeds a text as [word count] and records the size of every encode call."""
+
+    max_seq_length = 512
+
+    def __init__(self, model_name):
+        self.tokenizer = make_tokenizer()
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 1
+
+    def encode(self, texts, batch_size, convert_to_numpy, normalize_embeddings):
+        self.calls.append((len(texts), batch_size))
+        return np.array([[len(text.split())] for text in texts], dtype=np.float32)
+
+
+def load_model(**kwargs):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    with mock.patch.dict(sys.modules, {"sentence_transformers": module}):
+        model = EmbeddingModel("fake", **kwargs)
+    tokenized = []
+    token_lengths = model.token_lengths
+
+    def counting_token_lengths(texts):
+        tokenized.append(len(texts))
+        return token_lengths(texts)
+
+    model.token_lengths = counting_token_lengths
+    return model, tokenized
+
+
+def test_encode_is_one_model_call_without_a_token_budget():
+    model, tokenized = load_model()
+    texts = [words(0, n) for n in (50, 3, 40, 4, 5, 60, 2)]
+
+    assert model.encode_array(texts, batch_size=3)[:, 0].tolist() == [50, 3, 40, 4, 5, 60, 2]
+    assert model.encode_array(["w1 w2"], batch_size=3).shape == (1, 1)
+    assert model.model.calls == [(7, 3), (1, 3)]
+    assert tokenized == []
+    assert model.encode_stats()['texts'] == 8
+
+
+def test_token_budget_batches_only_large_inputs():
+    model, tokenized = load_model(max_batch_tokens=100)
+    texts = [words(0, n) for n in (50, 3, 40, 4, 5, 60, 2)]
+
+    # A query fits one batch, so it is neither tokenized nor split
+    model.encode_array(["w1 w2 w3"], batch_size=4)
+    assert tokenized == [] and model.model.calls == [(1, 4)]
+
+    model.model.calls = []
+    embeddings = model.encode_array(texts, batch_size=4)
+    assert embeddings[:, 0].tolist() == [50, 3, 40, 4, 5, 60, 2]
+    assert tokenized == [7]
+    assert [size for size, _ in model.model.calls] == [4, 2, 1]
+    assert model.encode_stats()['tokens'] == sum((50, 3, 40, 4, 5, 60, 2))
+
+
+if __name__ == "__main__":
+    test_chunks_fit_and_overlap()
+    test_truncating_tokenizer_is_not_used_or_mutated()
+    test_chunk_records_keep_metadata()
+    test_length_batches()
+    test_encode_is_one_model_call_without_a_token_budget()
+    test_token_budget_batches_only_large_inputs()
+    print("✅ Chunking checks passed.")
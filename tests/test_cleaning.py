@@ -0,0 +1,97 @@
+"""
+test_cleaning.py
+----------------
+
+Offline checks for review text cleaning: the batch ``clean_texts`` (Arrow
+kernels, process pool) and the guarded ``clean_text`` give exactly the
+output of the original per-row regex cleaner, and ``review_records`` builds
+the same metadata as the old ``iterrows`` loop.
+
+Usage:
+    python -m tests.test_cleaning
+"""
+
+import html
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from cinematch.processing.cleaning import clean_text, clean_texts
+from cinematch.processing.pipeline import review_records
+
+SAMPLES = [
+    "Great movie!&nbsp;<br/><br/>Loved the <i>score</i>, see http://example.com/x for more.",
+    "&lt;b&gt;Escaped tags&lt;/b&gt; are decoded, then stripped &amp; spaced",
+    "Visit www.imdb.com/title/tt0133093 or https://x.org/a?b=1 then read on",
+    "Ideographic　space, em space, tab\tand\n\nnewlines too  ",
+    "wwwhat a film, httpd jokes aside",
+    "",
+    "   ",
+    None,
+    float('nan'),
+    42,
+]
+
+
+def reference_clean(text) -> str:
+    """The cleaner as it was before the batch API (str() of non-strings included)."""
+    text = "" if text is None or text != text else str(text)
+    if not text:
+        return ""
+    text = html.unescape(text)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'http\S+|www.\S+', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def test_clean_text_matches_reference():
+    for sample in SAMPLES:
+        if isinstance(sample, str):
+            assert clean_text(sample) == reference_clean(sample), repr(sample)
+
+
+def test_clean_texts_matches_reference_for_every_input_type():
+    expected = [reference_clean(sample) for sample in SAMPLES]
+    strings = [sample if isinstance(sample, str) else None for sample in SAMPLES]
+
+    assert clean_texts(SAMPLES) == expected
+    assert clean_texts(pd.Series(SAMPLES, dtype=object)) == expected
+    assert clean_texts(pd.Series(strings, dtype="str")) == [reference_clean(s) for s in strings]
+    assert clean_texts(pa.chunked_array([strings[:4], strings[4:]])) == [reference_clean(s) for s in strings]
+    assert clean_texts(SAMPLES * 3, workers=2, chunk_size=7) == expected * 3
+
+
+def test_review_records_matches_row_loop():
+    reviews = pd.DataFrame(
+        {
+            'title': ["Masterpiece", None, "Short", "Meh"],
+            'content': [SAMPLES[0], SAMPLES[2], "Too short.", np.nan],
+            'type': ["user", "user", "featured", "user"],
+        },
+        index=[5, 6, 7, 8],
+    )
+    metadata = {'imdb_id': "tt0133093", 'title': "The Matrix", 'year': 1999}
+
+    records = list(review_records("The Matrix", metadata, reviews))
+
+    assert [text for text, _ in records] == [reference_clean(SAMPLES[0]), reference_clean(SAMPLES[2])]
+    assert records[0][1] == {
+        'source': "imdb",
+        'movie_id': "tt0133093",
+        'movie_title': "The Matrix",
+        'year': "1999",
+        'review_title': "Masterpiece",
+        'review_type': "user",
+        'original_index': 5,
+    }
+    assert records[1][1]['original_index'] == 6
+    assert type(records[1][1]['original_index']) is int
+
+
+if __name__ == "__main__":
+    test_clean_text_matches_reference()
+    test_clean_texts_matches_reference_for_every_input_type()
+    test_review_records_matches_row_loop()
+    print("✅ Cleaning checks passed.")
@@ -0,0 +1,138 @@
+"""
+test_dataset_store.py
+---------------------
+
+Offline checks for the columnar movies / cast / reviews datasets: typed
+rows, partitioned appends, column-projected reads and compaction.
+
+Usage:
+    python -m tests.test_dataset_store
+"""
+
+import tempfile
+from pathlib import Path
+
+import pyarrow.dataset as ds
+
+from unittest import mock
+
+from cinematch.scraper import dataset_store
+from cinematch.scraper.dataset_store import DatasetWriter, compact, read_table
+
+
+def make_movie(imdb_id, title, scraped_at, reviews=2):
+    return {
+        'imdb_id': imdb_id,
+        'title': title,
+        'year': "1999",
+        'imdb_rating': "8.7",
+        'rating_count': "2.1M",
+        'scraped_at': scraped_at,
+        'storyline': {'genres': ["Action", "Sci-Fi"], 'tagline': "Free your mind"},
+        'details': {'country': "United States", 'languages': ["English"]},
+        'box_office': {'budget': "$63,000,000"},
+        'cast': [{'actor': "Keanu Reeves", 'character': "Neo"}, {'actor': "Laurence Fishburne", 'character': "Morpheus"}],
+        'user_reviews': [{'title': f"Review {i}", 'content': "Still holds up.", 'rating': "9", 'type': 'user'} for i in range(reviews)],
+        'featured_reviews': [{'title': "Critic", 'content': "A landmark.", 'type': 'critic'}],
+    }
+
+
+def test_append_and_read_columns():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        with DatasetWriter(root, flush_every=1) as writer:
+            writer.append(make_movie("tt0133093", "The Matrix", "2026-09-30 12:00:00"))
+            writer.append(make_movie("tt1375666", "Inception", "2026-10-01 08:00:00"))
+
+        assert sorted(p.name for p in (root / "movies").iterdir()) == ["scrape_month=2026-09", "scrape_month=2026-10"]
+
+        titles = read_table(root, "movies", columns=["title"])
+        assert titles.column_names == ["title"]
+        assert sorted(titles.column("title").to_pylist()) == ["Inception", "The Matrix"]
+
+        movie = read_table(root, "movies", filter=ds.field("imdb_id") == "tt0133093").to_pylist()[0]
+        assert movie['year'] == 1999 and movie['rating_count'] == 2_100_000
+        assert movie['genres'] == ["Action", "Sci-Fi"]
+        assert dict(movie['details'])['languages'] == ["English"]
+
+        reviews = read_table(root, "reviews", columns=["review_type", "rating"]).to_pylist()
+        assert len(reviews) == 6
+        assert {'review_type': 'critic', 'rating': None} in reviews
+        assert read_table(root, "cast").num_rows == 4
+
+
+def test_compaction_keeps_latest_scrape():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        with DatasetWriter(root, file_format="arrow", flush_every=1) as writer:
+            writer.append(make_movie("tt0133093", "The Matrix", "2026-09-30 12:00:00", reviews=3))
+            writer.append(make_movie("tt1375666", "Inception", "2026-10-01 08:00:00"))
+            writer.append(make_movie("tt0133093", "The Matrix", "2026-10-02 12:00:00", reviews=1))
+
+        assert compact(root) == {'movies': 2, 'cast': 4, 'reviews': 5}
+        for name in ("movies", "cast", "reviews"):
+            files = list((root / name).rglob("*.arrow"))
+            assert len(files) == len({f.parent for f in files})
+
+        matrix = read_table(root, "reviews", filter=ds.field("imdb_id") == "tt0133093")
+        assert matrix.num_rows == 2
+        assert set(matrix.column("scrape_month").to_pylist()) == {"2026-10"}
+        assert not (root / "movies" / "scrape_month=2026-09").exists()
+
+
+def test_out_of_range_values_become_nulls():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        movie = make_movie("tt0133093", "The Matrix", "2026-10-02 12:00:00")
+        movie['year'] = "40000"
+        movie['user_reviews'][0]['rating'] = "300"
+        movie['user_reviews'][1]['helpful_votes'] = 2 ** 40
+        with DatasetWriter(root) as writer:
+            writer.append(movie)
+
+        assert read_table(root, "movies", columns=["year"]).to_pylist() == [{'year': None}]
+        reviews = read_table(root, "reviews", columns=["rating", "helpful_votes"]).to_pylist()
+        assert {'rating': None, 'helpful_votes': None} in reviews
+        assert {'rating': 9, 'helpful_votes': None} in reviews
+
+
+def test_failed_write_keeps_buffered_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        writer = DatasetWriter(root)
+        writer.append(make_movie("tt0133093", "The Matrix", "2026-10-02 12:00:00"))
+
+        with mock.patch.object(dataset_store, "_write_file", side_effect=OSError("disk full")):
+            try:
+                writer.flush()
+            except OSError:
+                pass
+            else:
+                raise AssertionError("expected the write error to propagate")
+
+        assert writer.flush() == 1
+        assert read_table(root, "movies").num_rows == 1
+        assert read_table(root, "reviews").num_rows == 3
+
+
+def test_compaction_reads_every_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        with DatasetWriter(root, file_format="parquet") as writer:
+            writer.append(make_movie("tt0133093", "The Matrix", "2026-09-30 12:00:00"))
+        with DatasetWriter(root, file_format="arrow") as writer:
+            writer.append(make_movie("tt1375666", "Inception", "2026-10-01 08:00:00"))
+
+        assert read_table(root, "movies").num_rows == 2
+        assert compact(root, file_format="arrow") == {'movies': 2, 'cast': 4, 'reviews': 6}
+        assert not list(root.rglob("*.parquet"))
+        assert sorted(read_table(root, "movies", columns=["title"]).column("title").to_pylist()) == ["Inception", "The Matrix"]
+
+
+if __name__ == "__main__":
+    test_append_and_read_columns()
+    test_compaction_keeps_latest_scrape()
+    test_out_of_range_values_become_nulls()
+    test_failed_write_keeps_buffered_rows()
+    test_compaction_reads_every_format()
+    print("✅ Dataset store checks passed.")
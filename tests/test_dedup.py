@@ -0,0 +1,67 @@
+"""
+test_dedup.py
+-------------
+
+Offline checks for near-duplicate review suppression: the same search
+snippet under different titles/URLs collapses to one review, distinct
+reviews are all kept.
+
+Usage:
+    python -m tests.test_dedup
+"""
+
+from cinematch.processing.dedup import MinHasher, dedupe_records, lsh_bands, near_duplicate_clusters
+
+SNIPPET = (
+    "The Matrix is a landmark of science fiction cinema. The bullet time sequences, "
+    "the philosophy borrowed from Baudrillard and the relentless pacing still hold up "
+    "more than twenty years later, and Keanu Reeves has never been better cast."
+)
+OTHER = (
+    "I found the sequel bloated and self-serious. Too many speeches about choice and "
+    "purpose, a car chase that goes on forever and a rave scene nobody asked for."
+)
+
+
+def test_signature_agreement_tracks_similarity():
+    hasher = MinHasher()
+    same = hasher.signature(SNIPPET.upper())
+    assert (same == hasher.signature(SNIPPET)).all()  # case-insensitive
+    assert (hasher.signature(OTHER) == same).mean() < 0.2
+    assert hasher.signature("  ... ") is None
+
+
+def test_clusters():
+    texts = [
+        SNIPPET,
+        OTHER,
+        SNIPPET + " ...",
+        "Read more: " + SNIPPET,
+        "",
+        OTHER[:60],
+    ]
+    assert near_duplicate_clusters(texts) == [[0, 2, 3], [1], [4], [5]]
+    assert lsh_bands(128, 0.8) == (8, 16)
+
+
+def test_dedupe_records_keeps_longest_representative():
+    records = [
+        (SNIPPET, {"review_title": "Landmark"}),
+        (OTHER, {"review_title": "Bloated"}),
+        ("Read more: " + SNIPPET, {"review_title": "Landmark - IMDb"}),
+    ]
+
+    kept, stats = dedupe_records(records)
+
+    assert kept == [
+        (OTHER, {"review_title": "Bloated", "duplicate_count": 0}),
+        ("Read more: " + SNIPPET, {"review_title": "Landmark - IMDb", "duplicate_count": 1}),
+    ]
+    assert stats == {"reviews": 3, "kept": 2, "duplicates": 1, "chars_saved": len(SNIPPET)}
+
+
+if __name__ == "__main__":
+    test_signature_agreement_tracks_similarity()
+    test_clusters()
+    test_dedupe_records_keeps_longest_representative()
+    print("✅ Dedup checks passed.")
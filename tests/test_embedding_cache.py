@@ -0,0 +1,78 @@
+"""
+test_embedding_cache.py
+-----------------------
+
+Offline checks for the content-addressed embedding cache: hits and misses
+per (model, text), persistence across reopen, matrix growth and LRU
+eviction with row reuse.
+
+Usage:
+    python -m tests.test_embedding_cache
+"""
+
+import tempfile
+
+import numpy as np
+
+from cinematch.processing.embedding_cache import EmbeddingCache
+
+MODEL = "all-MiniLM-L6-v2"
+
+
+def vectors(n, dim=4, offset=0):
+    return np.arange(offset, offset + n * dim, dtype=np.float32).reshape(n, dim)
+
+
+def test_hits_misses_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp)
+        texts = ["great pacing", "weak third act", "great pacing"]
+        found, missing = cache.get(MODEL, texts)
+        assert found == {} and missing == [0, 1, 2]
+
+        cache.put(MODEL, texts[:2], vectors(2))
+        found, missing = cache.get(MODEL, texts + ["new review"])
+        assert missing == [3]
+        assert np.array_equal(found[0], vectors(2)[0])
+        assert np.array_equal(found[2], found[0])
+        assert np.array_equal(found[1], vectors(2)[1])
+
+        # Another model never sees these vectors.
+        assert cache.get("other-model", texts)[1] == [0, 1, 2]
+        assert cache.stats()['hits'] == 3
+        cache.close()
+
+        reopened = EmbeddingCache(tmp)
+        found, missing = reopened.get(MODEL, ["weak third act"])
+        assert missing == [] and np.array_equal(found[0], vectors(2)[1])
+        reopened.close()
+
+
+def test_growth_and_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, max_entries=1500)
+        first = [f"review {i}" for i in range(1200)]
+        cache.put(MODEL, first, vectors(1200))
+        cache.get(MODEL, first[:100])  # keep the first hundred recently used
+
+        second = [f"review {i}" for i in range(1200, 1600)]
+        cache.put(MODEL, second, vectors(400, offset=10_000))
+
+        assert len(cache) == 1500
+        assert cache.evictions == 100
+        assert cache.get(MODEL, first[:100])[1] == []
+        assert len(cache.get(MODEL, first[100:200])[1]) == 100
+
+        # Evicted rows are reused instead of growing the matrix further.
+        cache.put(MODEL, ["reuse me"], vectors(1, offset=-4))
+        assert cache._db.execute("SELECT next_row FROM models").fetchone()[0] == 1600
+        found, _ = cache.get(MODEL, ["reuse me", "review 1599"])
+        assert np.array_equal(found[0], vectors(1, offset=-4)[0])
+        assert np.array_equal(found[1], vectors(400, offset=10_000)[-1])
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_hits_misses_and_persistence()
+    test_growth_and_lru_eviction()
+    print("✅ Embedding cache checks passed.")
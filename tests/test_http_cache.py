@@ -0,0 +1,165 @@
+"""
+test_http_cache.py
+------------------
+
+Offline checks for the on-disk HTTP response cache: TTL hits, conditional
+revalidation, replay mode and size-bounded eviction, a body evicted
+between lookup and read treated as a miss, and exact stats when threads
+share the cache.
+
+Usage:
+    python -m tests.test_http_cache
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from cinematch.scraper.http_cache import CacheMiss, CachedResponse, ResponseCache
+
+
+class FakeFetcher:
+    """Stands in for the network and records the conditional headers it receives."""
+
+    def __init__(self, body: bytes = b"<html>The Matrix</html>", status: int = 200):
+        self.body = body
+        self.status = status
+        self.calls = []
+
+    def __call__(self, headers):
+        self.calls.append(dict(headers))
+        return CachedResponse(
+            "https://www.imdb.com/title/tt0133093/",
+            self.status,
+            self.body,
+            headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'},
+        )
+
+
+URL = "https://www.imdb.com/title/tt0133093/"
+
+
+def test_fresh_entry_served_without_network():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp), ttl=3600)
+        fetch = FakeFetcher()
+
+        first = cache.get(URL, fetch)
+        second = cache.get(URL, fetch)
+
+        assert len(fetch.calls) == 1
+        assert not getattr(first, 'from_cache', False)
+        assert second.from_cache and second.content == fetch.body
+        cache.close()
+
+
+def test_stale_entry_is_revalidated():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp), ttl=0)
+        cache.get(URL, FakeFetcher())
+
+        not_modified = FakeFetcher(body=b"", status=304)
+        response = cache.get(URL, not_modified)
+
+        assert not_modified.calls[0]['If-None-Match'] == '"v1"'
+        assert 'If-Modified-Since' in not_modified.calls[0]
+        assert response.from_cache and b"The Matrix" in response.content
+        assert cache.stats['revalidated'] == 1
+        cache.close()
+
+
+def test_replay_mode_never_fetches():
+    with tempfile.TemporaryDirectory() as tmp:
+        ResponseCache(Path(tmp)).get(URL, FakeFetcher())
+
+        replay = ResponseCache(Path(tmp), ttl=0, replay=True)
+        fetch = FakeFetcher()
+        assert replay.get(URL, fetch).from_cache
+        assert fetch.calls == []
+
+        try:
+            replay.get("https://www.imdb.com/title/tt0000000/", fetch)
+        except CacheMiss:
+            pass
+        else:
+            raise AssertionError("replay mode should raise CacheMiss for unknown URLs")
+        replay.close()
+
+
+def test_eviction_keeps_cache_under_size_limit():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp), max_bytes=250)
+        for i in range(5):
+            cache.get(f"{URL}?page={i}", FakeFetcher(body=b"x" * 100))
+            time.sleep(0.01)
+
+        assert cache.stats['evicted'] == 3
+        assert len(list((Path(tmp) / "bodies").iterdir())) == 2
+        cache.close()
+
+
+class RacingCache(ResponseCache):
+    """Loses the body right after the index lookup, as a concurrent eviction would."""
+
+    def _lookup(self, key):
+        entry = super()._lookup(key)
+        if entry:
+            self._body_path(key).unlink()
+        return entry
+
+
+def test_body_evicted_after_lookup_is_a_miss():
+    with tempfile.TemporaryDirectory() as tmp:
+        ResponseCache(Path(tmp)).get(URL, FakeFetcher())
+
+        cache = RacingCache(Path(tmp), ttl=3600)
+        fetch = FakeFetcher()
+        response = cache.get(URL, fetch)
+        assert not getattr(response, 'from_cache', False) and fetch.calls == [{}]
+        assert cache.stats['misses'] == 1 and cache.stats['hits'] == 0
+
+        stale = RacingCache(Path(tmp), ttl=0)
+        not_modified = FakeFetcher(body=b"", status=304)
+        stale.get(URL, not_modified)
+        assert len(not_modified.calls) == 2 and not_modified.calls[1] == {}   # refetched without validators
+
+        replay = RacingCache(Path(tmp), replay=True)
+        try:
+            replay.get(URL, FakeFetcher())
+        except CacheMiss:
+            pass
+        else:
+            raise AssertionError("replay mode should raise CacheMiss for an evicted body")
+        for c in (cache, stale, replay):
+            c.close()
+
+
+def test_stats_are_exact_under_concurrency():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp), ttl=3600)
+        cache.get(URL, FakeFetcher())
+
+        def lookups():
+            for _ in range(200):
+                cache.get(URL, FakeFetcher())
+
+        threads = [threading.Thread(target=lookups) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats['hits'] == 800 and cache.stats['misses'] == 1
+        assert not list((Path(tmp) / "bodies").glob("*.tmp"))
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_fresh_entry_served_without_network()
+    test_stale_entry_is_revalidated()
+    test_replay_mode_never_fetches()
+    test_eviction_keeps_cache_under_size_limit()
+    test_body_evicted_after_lookup_is_a_miss()
+    test_stats_are_exact_under_concurrency()
+    print("✅ HTTP cache checks passed.")
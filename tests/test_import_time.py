@@ -0,0 +1,58 @@
+"""
+test_import_time.py
+-------------------
+
+Import-time budget for the CLI and service entry points.
+
+Importing ``cinematch.core.recommendation``, ``cinematch.processing.pipeline``
+or ``cinematch.utils.verify_db`` must not load torch, sentence-transformers,
+chromadb, onnxruntime or pandas (they are imported on first use, through
+``cinematch.processing.registry``) and must stay within
+``IMPORT_BUDGET_SECONDS``. Each check runs in a fresh interpreter.
+
+Usage:
+    python -m tests.test_import_time
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+IMPORT_BUDGET_SECONDS = 0.5
+
+ENTRY_POINTS = ("cinematch.core.recommendation", "cinematch.processing.pipeline", "cinematch.utils.verify_db")
+HEAVY_MODULES = ("torch", "sentence_transformers", "chromadb", "onnxruntime", "pandas")
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import {", ".join(ENTRY_POINTS)}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def probe() -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_entry_points_do_not_import_heavy_libraries():
+    assert probe()["heavy"] == []
+
+
+def test_entry_points_import_within_budget():
+    # Best of three, so a cold bytecode cache or a busy machine does not count.
+    seconds = min(probe()["seconds"] for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"imports took {seconds:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+
+
+if __name__ == "__main__":
+    test_entry_points_do_not_import_heavy_libraries()
+    test_entry_points_import_within_budget()
+    print("✅ Import-time checks passed.")
@@ -0,0 +1,156 @@
+"""
+test_job_manifest.py
+--------------------
+
+Offline checks for the resumable bulk scrape manifest: stage tracking,
+retry accounting, exclusive claims and resuming a job mid-way.
+
+Usage:
+    python -m tests.test_job_manifest
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+
+from cinematch.scraper.bulk_runner import BulkScraper
+from cinematch.scraper.job_manifest import DETAILS_DONE, FAILED, RESOLVED, REVIEWS_DONE, JobManifest
+
+
+def test_failures_keep_stage_until_retries_run_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite", max_retries=2)
+        manifest.add_titles(["The Matrix"])
+
+        job = manifest.claim("w1")
+        manifest.advance(job['title'], RESOLVED, imdb_id="tt0133093", payload={'search_info': {'imdb_id': "tt0133093"}})
+        manifest.fail(job['title'], "timeout")
+        manifest.release(job['title'])
+
+        job = manifest.claim("w1")
+        assert job['stage'] == RESOLVED and job['attempts'] == 1
+        assert job['payload']['search_info']['imdb_id'] == "tt0133093"
+        manifest.fail(job['title'], "timeout")
+        manifest.release(job['title'])
+
+        assert manifest.get("The Matrix")['state'] == FAILED
+        assert manifest.claim("w1") is None
+
+        assert manifest.retry_failed() == 1
+        assert manifest.claim("w1")['stage'] == RESOLVED
+        manifest.close()
+
+
+def test_each_title_is_claimed_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        manifest.add_titles([f"Movie {i}" for i in range(50)])
+        claimed = []
+
+        def worker(name):
+            while True:
+                job = manifest.claim(name)
+                if job is None:
+                    return
+                claimed.append(job['title'])
+                manifest.advance(job['title'], REVIEWS_DONE)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(claimed) == sorted(f"Movie {i}" for i in range(50))
+        assert manifest.summary() == {REVIEWS_DONE: 50}
+        manifest.close()
+
+
+class FakeScraper:
+    """Records which stages ran instead of touching the network."""
+
+    def __init__(self):
+        self.calls = []
+        self.saved = None
+
+    def get_movie_details(self, imdb_id):
+        self.calls.append('details')
+        return {'imdb_id': imdb_id, 'title': "The Matrix", 'scraped_at': "2026-10-18 00:00:00"}
+
+    def get_reviews_via_ddgs(self, title, max_reviews):
+        self.calls.append('reviews')
+        return [{'title': "Great", 'content': "Still holds up."}]
+
+    def get_featured_reviews_via_ddgs(self, title, max_reviews):
+        self.calls.append('featured')
+        return []
+
+    def save_movie_data(self, movie_data, format='both', user_reviews=None):
+        self.saved = movie_data
+
+
+def test_job_resumes_from_recorded_stage():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        manifest.add_titles(["The Matrix"])
+        manifest.claim("w1")
+        manifest.advance("The Matrix", DETAILS_DONE, imdb_id="tt0133093", payload={
+            'imdb_id': "tt0133093",
+            'title': "The Matrix",
+            'scraped_at': "2026-10-18 00:00:00",
+            'search_info': {'imdb_id': "tt0133093"},
+        })
+        manifest.release("The Matrix")
+
+        bulk = BulkScraper(manifest=manifest)
+        scraper = FakeScraper()
+        assert bulk._process_job(scraper, manifest.claim("w1")) == 'saved'
+
+        assert scraper.calls == ['reviews', 'featured']
+        assert list(scraper.saved)[-1] == 'search_info'
+        assert manifest.get("The Matrix")['scraped_at'] == "2026-10-18 00:00:00"
+        assert manifest.claim("w1") is None
+        manifest.close()
+
+
+def test_claims_can_be_scoped_to_a_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        manifest.add_titles(["Old Movie", "The Matrix"])
+
+        job = manifest.claim("w1", ["The Matrix", "Not In Manifest"])
+        assert job['title'] == "The Matrix"
+        assert manifest.claim("w1", ["The Matrix"]) is None
+        assert manifest.claim("w1", []) is None
+        assert manifest.claim("w1")['title'] == "Old Movie"
+        manifest.close()
+
+
+def test_run_leaves_other_outstanding_titles_unless_resuming_all():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        # Leftover of an earlier run, already resolved
+        manifest.requeue("Old Movie", RESOLVED, imdb_id="tt0000001", payload={'search_info': {'imdb_id': "tt0000001"}})
+        manifest.requeue("The Matrix", RESOLVED, imdb_id="tt0133093", payload={'search_info': {'imdb_id': "tt0133093"}})
+
+        bulk = BulkScraper(manifest=manifest)
+        scraper = FakeScraper()
+        bulk._local.scraper = scraper
+        counts = bulk._scrape(["The Matrix"], workers=1, delay_range=(0, 0))
+        assert counts['saved'] == 1
+        assert scraper.calls.count('details') == 1
+        assert manifest.get("Old Movie")['state'] == RESOLVED
+
+        counts = bulk._scrape([], workers=1, delay_range=(0, 0), resume_all=True)
+        assert counts['saved'] == 1
+        assert manifest.get("Old Movie")['state'] == REVIEWS_DONE
+        manifest.close()
+
+
+if __name__ == "__main__":
+    test_failures_keep_stage_until_retries_run_out()
+    test_each_title_is_claimed_once()
+    test_job_resumes_from_recorded_stage()
+    test_claims_can_be_scoped_to_a_run()
+    test_run_leaves_other_outstanding_titles_unless_resuming_all()
+    print("✅ Job manifest checks passed.")
@@ -0,0 +1,202 @@
+"""
+test_memmap_store.py
+--------------------
+
+Offline checks for the memory-mapped exact-search store: top-k matches
+brute force in every distance space, re-added IDs replace their row,
+metadata filters apply, read-only openers see the writer's data, and a
+Chroma collection copies over with the same query results. Replacements
+and deletions only take effect once the manifest commits them, writers
+are serialized by the store's lock, and movies can be diffed and synced
+as with ``VectorStore``.
+
+Usage:
+    python -m tests.test_memmap_store
+"""
+
+import fcntl
+import os
+import tempfile
+import threading
+from unittest import mock
+
+import numpy as np
+
+from cinematch.processing.memmap_store import MemmapVectorStore
+from cinematch.processing.store import VectorStore, document_id
+
+
+def vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def add(store, data, offset=0):
+    n = len(data)
+    store.add_documents(
+        documents=[f"review {offset + i}" for i in range(n)],
+        metadatas=[{'movie_id': f"tt{(offset + i) % 3}", 'index': offset + i} for i in range(n)],
+        embeddings=data,
+        ids=[f"r{offset + i}" for i in range(n)],
+    )
+
+
+def test_exact_top_k_in_every_space():
+    data, queries = vectors(500), vectors(5, seed=1)
+    expected_scores = {
+        'cosine': (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ (data / np.linalg.norm(data, axis=1, keepdims=True)).T,
+        'ip': queries @ data.T,
+        'l2': -((queries[:, None, :] - data[None, :, :]) ** 2).sum(axis=2),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for space, scores in expected_scores.items():
+            store = MemmapVectorStore(f"{tmp}/{space}", space=space, query_chunk_rows=64)
+            add(store, data)
+            results = store.query_embeddings(queries, n_results=7)
+            for row, ids, distances in zip(scores, results['ids'], results['distances']):
+                assert ids == [f"r{i}" for i in np.argsort(-row)[:7]], space
+                if space == "l2":
+                    assert np.allclose(distances, -np.sort(row)[::-1][:7], rtol=1e-4)
+
+            assert store.query_embeddings(queries, n_results=0)['ids'] == [[]] * len(queries)
+
+
+def test_upsert_filter_and_shared_readers():
+    data = vectors(30)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemmapVectorStore(tmp)
+        add(store, data[:20])
+        reader = MemmapVectorStore(tmp, read_only=True)
+
+        # r0 now points at r25's vector; its old row no longer matches.
+        store.add_documents(["edited"], [{'movie_id': "tt0", 'index': 0, 'edited': True}], embeddings=data[25:26], ids=["r0"])
+        add(store, data[20:], offset=20)
+        assert store.count() == 30
+        top = store.query_embeddings(data[25], n_results=2)
+        found = dict(zip(top['ids'][0], zip(top['documents'][0], top['metadatas'][0])))
+        assert found == {
+            "r0": ("edited", {'movie_id': "tt0", 'index': 0, 'edited': True}),
+            "r25": ("review 25", {'movie_id': "tt1", 'index': 25}),  # no None for missing keys
+        }
+        assert store.query_embeddings(data[0], n_results=1)['ids'][0] != ["r0"]
+
+        filtered = store.query_embeddings(data[:2], n_results=50, where={'movie_id': "tt1"})
+        assert all(len(ids) == 10 and all(int(i[1:]) % 3 == 1 for i in ids) for ids in filtered['ids'])
+        assert store.query_embeddings(data[0], where={'movie_id': "tt9"})['ids'] == [[]]
+        # A selective filter scores only its rows; the retired copy of r0 is not one of them.
+        assert store.query_embeddings(data[0], n_results=5, where={'index': 0})['documents'] == [["edited"]]
+        assert store.query_embeddings(data[3], n_results=5, where={'$and': [{'index': 3}, {'movie_id': "tt0"}]})['ids'] == [["r3"]]
+
+        assert reader.count() == 20
+        reader.refresh()
+        assert reader.count() == 30
+        assert set(reader.query_embeddings(data[25], n_results=2)['ids'][0]) == {"r0", "r25"}
+        assert reader.peek(2)['ids'] == ["r1", "r2"]
+
+
+def test_copy_from_chroma():
+    data = vectors(40)
+    with tempfile.TemporaryDirectory() as tmp:
+        chroma = VectorStore("copy_source", persistent_path=f"{tmp}/chroma")
+        add(chroma, data)
+        memmap = MemmapVectorStore.from_vector_store(chroma, f"{tmp}/memmap", batch_size=16)
+
+        assert memmap.count() == 40 and memmap.space == chroma.space
+        ours = memmap.query_embeddings(data[:3], n_results=3)
+        theirs = chroma.query_embeddings(data[:3], n_results=3)
+        assert ours['ids'] == theirs['ids']
+        assert np.allclose(ours['distances'], theirs['distances'], atol=1e-5)
+        assert ours['metadatas'] == theirs['metadatas']
+
+
+def test_replacement_waits_for_the_manifest_commit():
+    data = vectors(10)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemmapVectorStore(tmp)
+        add(store, data)
+
+        # A write that dies before its manifest must leave the old r0 live
+        with mock.patch.object(MemmapVectorStore, "_write_manifest", side_effect=OSError("disk full")):
+            try:
+                store.add_documents(["edited"], [{'movie_id': "tt0", 'index': 0}], embeddings=data[5:6], ids=["r0"])
+            except OSError:
+                pass
+            else:
+                raise AssertionError("the manifest write error must propagate")
+
+        reopened = MemmapVectorStore(tmp)
+        assert reopened.count() == 10
+        assert reopened.query_embeddings(data[0], n_results=1)['documents'] == [["review 0"]]
+
+        # The next committed write does not pick up the failed write's retirement
+        reopened.add_documents(["edited 1"], [{'movie_id': "tt1", 'index': 1}], embeddings=data[1:2], ids=["r1"])
+        reader = MemmapVectorStore(tmp, read_only=True)
+        assert reader.count() == 10
+        assert reader.query_embeddings(data[0], n_results=1)['documents'] == [["review 0"]]
+        assert reader.query_embeddings(data[1], n_results=1)['documents'] == [["edited 1"]]
+
+
+def test_writers_take_the_lock_and_see_each_other():
+    data = vectors(6)
+    with tempfile.TemporaryDirectory() as tmp:
+        first = MemmapVectorStore(tmp)
+        second = MemmapVectorStore(tmp)
+        add(first, data[:3])
+        add(second, data[3:], offset=3)   # opened before first's write, refreshed under the lock
+        first.refresh()
+        assert first.count() == second.count() == 6
+
+        with open(os.path.join(tmp, "write.lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            writer = threading.Thread(target=first.delete, kwargs={'ids': ["r0"]})
+            writer.start()
+            writer.join(0.2)
+            assert writer.is_alive()   # waiting for the lock
+            assert MemmapVectorStore(tmp, read_only=True).count() == 6
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        writer.join()
+        assert MemmapVectorStore(tmp, read_only=True).count() == 5
+
+
+def test_diff_delete_and_prune():
+    data = vectors(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemmapVectorStore(tmp)
+        documents = ["great film", "too long", "loved it"]
+        metadatas = [{'movie_id': "tt1", 'rating': r} for r in (9, 4, 8)]
+        store.add_documents(documents, metadatas, embeddings=data[:3])
+        store.add_documents(["another movie"], [{'movie_id': "tt2"}], embeddings=data[3:4])
+        reader = MemmapVectorStore(tmp, read_only=True)
+        assert store.movie_ids() == {"tt1", "tt2"}
+
+        # One review edited, one gone, one new
+        current = ["great film", "loved it", "a new review"]
+        current_meta = [{'movie_id': "tt1", 'rating': 9}, {'movie_id': "tt1", 'rating': 10}, {'movie_id': "tt1", 'rating': 7}]
+        diff = store.diff_documents("tt1", current, current_meta)
+        assert diff == {'new': [2], 'changed': [1], 'stale': [document_id("tt1", "too long")], 'unchanged': 1}
+
+        store.apply_diff("tt1", current, current_meta, diff)
+        assert store.count() == 3
+        loved = store.query_embeddings(data[2], n_results=1)
+        assert loved['documents'] == [["loved it"]] and loved['metadatas'][0][0]['rating'] == 10
+        assert store.diff_documents("tt1", current[:2], current_meta[:2])['unchanged'] == 2
+
+        # Readers keep their snapshot until they refresh
+        assert reader.count() == 4
+        assert reader.query_embeddings(data[1], n_results=1)['documents'] == [["too long"]]
+        reader.refresh()
+        assert reader.count() == 3
+
+        store.delete(where={'movie_id': "tt2"})
+        assert store.movie_ids() == {"tt1"} and store.count() == 2
+        store.delete(ids=["not stored"])
+        assert MemmapVectorStore(tmp, read_only=True).count() == 2
+
+
+if __name__ == "__main__":
+    test_exact_top_k_in_every_space()
+    test_upsert_filter_and_shared_readers()
+    test_copy_from_chroma()
+    test_replacement_waits_for_the_manifest_commit()
+    test_writers_take_the_lock_and_see_each_other()
+    test_diff_delete_and_prune()
+    print("✅ Memmap store checks passed.")
@@ -0,0 +1,101 @@
+"""
+test_metrics.py
+---------------
+
+Offline checks for the scraper metrics: transport request accounting,
+per-extractor parse timings, and the JSON-lines / Prometheus exports.
+
+Usage:
+    python -m tests.test_metrics
+"""
+
+import json
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from cinematch.scraper.http_cache import CachedResponse
+from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+from cinematch.scraper.metrics import ScrapeMetrics
+from cinematch.scraper.transport import Transport
+
+FIXTURE = Path(__file__).parent / "fixtures" / "imdb_title_tt0133093.html"
+
+
+class FakeResponse(CachedResponse):
+    def close(self):
+        pass
+
+
+class FlakySession:
+    """Answers 503 once, then 200, without touching the network."""
+
+    def __init__(self, body=b"<html>ok</html>"):
+        self.statuses = [503, 200]
+        self.body = body
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse(url, self.statuses.pop(0), self.body)
+
+
+def test_transport_records_requests_and_retries():
+    metrics = ScrapeMetrics()
+    transport = Transport(metrics=metrics, backoff_base=0.0)
+    transport.session = FlakySession()
+
+    assert transport.get("https://www.imdb.com/title/tt0133093/").status_code == 200
+
+    host = "www.imdb.com"
+    assert metrics.counter('http_responses_total', host=host, status=503) == 1
+    assert metrics.counter('http_responses_total', host=host, status=200) == 1
+    assert metrics.counter('http_retries_total', host=host) == 1
+    assert metrics.counter('http_response_bytes_total', host=host) == 2 * len(b"<html>ok</html>")
+    assert metrics.histogram('http_request_seconds', host=host).count == 2
+
+
+def test_parse_records_extractor_timings_and_empties():
+    metrics = ScrapeMetrics()
+    scraper = IMDbScraperDDGS(metrics=metrics)
+
+    scraper.parse_movie_page(FIXTURE.read_bytes())
+    assert metrics.histogram('extractor_seconds', extractor='structured').count == 1
+    assert metrics.counter('extractor_empty_total', extractor='structured') == 0
+
+    scraper.parse_movie_page(b"<html><body>Nothing here</body></html>")
+    assert metrics.counter('extractor_empty_total', extractor='structured') == 1
+    assert metrics.counter('extractor_empty_total', extractor='_extract_cast') == 1
+    assert metrics.histogram('extractor_seconds', extractor='make_soup').count == 1
+    assert "_extract_cast" in metrics.report()
+
+
+def test_exports():
+    metrics = ScrapeMetrics(buckets=(0.1, 1.0))
+    metrics.observe('http_request_seconds', 0.5, host="www.imdb.com")
+    metrics.inc('http_responses_total', host="www.imdb.com", status=200)
+
+    text = metrics.to_prometheus()
+    assert 'cinematch_scraper_http_request_seconds_bucket{host="www.imdb.com",le="0.1"} 0' in text
+    assert 'cinematch_scraper_http_request_seconds_bucket{host="www.imdb.com",le="1"} 1' in text
+    assert 'cinematch_scraper_http_responses_total{host="www.imdb.com",status="200"} 1' in text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "metrics.jsonl"
+        metrics.write_jsonl(path)
+        metrics.write_jsonl(path)
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])['histograms']['http_request_seconds'][0]['count'] == 1
+
+    server = metrics.serve(port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.read().decode() == metrics.to_prometheus()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_transport_records_requests_and_retries()
+    test_parse_records_extractor_timings_and_empties()
+    test_exports()
+    print("✅ Metrics checks passed.")
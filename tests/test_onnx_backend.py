@@ -0,0 +1,133 @@
+"""
+test_onnx_backend.py
+--------------------
+
+Offline checks for the ONNX Runtime embedding backend, with
+sentence_transformers and onnxruntime replaced by fakes: the backend and
+model file are selected from the options, quantization options are
+validated, exports are reused, and a missing onnxruntime or model falls
+back to the torch backend.
+
+Usage:
+    python -m tests.test_onnx_backend
+"""
+
+import os
+import sys
+import tempfile
+import types
+from unittest import mock
+
+from cinematch.processing.embedding import EmbeddingModel
+from cinematch.processing.onnx_backend import load_onnx_model
+
+
+class FakeSentenceTransformer:
+    """Records how it was loaded; ``missing`` makes ONNX loads fail like an unknown model."""
+
+    loads = []
+    missing = False
+
+    def __init__(self, name, backend="torch", device=None, model_kwargs=None):
+        if backend == "onnx" and FakeSentenceTransformer.missing:
+            raise OSError(f"{name} is not a local folder or a known model")
+        self.name = name
+        self.backend = backend
+        self.model_kwargs = model_kwargs or {}
+        FakeSentenceTransformer.loads.append(self)
+
+    def save_pretrained(self, path):
+        os.makedirs(os.path.join(path, "onnx"), exist_ok=True)
+        open(os.path.join(path, "onnx", "model.onnx"), 'w').close()
+
+
+def fake_export(model, config, path):
+    fake_export.calls.append(config)
+    open(os.path.join(path, "onnx", f"model_qint8_{config}.onnx"), 'w').close()
+
+
+def fake_modules(onnxruntime=True):
+    FakeSentenceTransformer.loads = []
+    FakeSentenceTransformer.missing = False
+    fake_export.calls = []
+    sentence_transformers = types.ModuleType("sentence_transformers")
+    sentence_transformers.SentenceTransformer = FakeSentenceTransformer
+    sentence_transformers.export_dynamic_quantized_onnx_model = fake_export
+    # A None entry makes ``import onnxruntime`` raise ImportError.
+    runtime = types.ModuleType("onnxruntime") if onnxruntime else None
+    return mock.patch.dict(sys.modules, {"sentence_transformers": sentence_transformers, "onnxruntime": runtime})
+
+
+def test_backend_selects_model_and_file():
+    with tempfile.TemporaryDirectory() as tmp, fake_modules():
+        model = load_onnx_model("org/model", models_dir=tmp)
+        assert model.backend == "onnx"
+        assert model.name == os.path.join(tmp, "org__model")
+        assert model.model_kwargs == {"file_name": "onnx/model.onnx"}
+
+        quantized = load_onnx_model("org/model", quantize=True, quantization_config="avx2", models_dir=tmp)
+        assert quantized.model_kwargs["file_name"] == "onnx/model_qint8_avx2.onnx"
+        assert fake_export.calls == ["avx2"]
+
+        # Exports are reused: only the final model is loaded the second time
+        FakeSentenceTransformer.loads = []
+        load_onnx_model("org/model", quantize=True, quantization_config="avx2", models_dir=tmp)
+        assert len(FakeSentenceTransformer.loads) == 1 and fake_export.calls == ["avx2"]
+
+        with mock.patch("cinematch.processing.embedding.load_onnx_model") as load:
+            embedder = EmbeddingModel("org/model", backend="onnx", quantize=True)
+        load.assert_called_once_with("org/model", quantize=True)
+        assert embedder.backend == "onnx" and embedder.cache_name == "org/model@int8"
+
+        torch_embedder = EmbeddingModel("org/model")
+        assert torch_embedder.backend == "torch" and torch_embedder.model.backend == "torch"
+
+
+def test_quantization_options_are_validated():
+    with fake_modules():
+        for kwargs in ({'backend': "tensorflow"}, {'quantize': True}):
+            try:
+                EmbeddingModel("org/model", **kwargs)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{kwargs} must be rejected")
+
+        try:
+            load_onnx_model("org/model", quantize=True, quantization_config="avx3")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an unknown quantization config must be rejected")
+        assert FakeSentenceTransformer.loads == []
+
+
+def test_falls_back_to_torch_without_onnxruntime():
+    with fake_modules(onnxruntime=False):
+        try:
+            load_onnx_model("org/model")
+        except ImportError:
+            pass
+        else:
+            raise AssertionError("load_onnx_model needs onnxruntime")
+
+        embedder = EmbeddingModel("org/model", backend="onnx", quantize=True)
+        assert embedder.backend == "torch" and not embedder.quantize
+        assert embedder.model.backend == "torch"
+        assert embedder.cache_name == "org/model"   # fp32 vectors are not cached as int8
+
+
+def test_falls_back_to_torch_when_model_is_missing():
+    with fake_modules():
+        FakeSentenceTransformer.missing = True
+        embedder = EmbeddingModel("org/no-such-model", backend="onnx")
+        assert embedder.backend == "torch"
+        assert [m.backend for m in FakeSentenceTransformer.loads] == ["torch"]
+
+
+if __name__ == "__main__":
+    test_backend_selects_model_and_file()
+    test_quantization_options_are_validated()
+    test_falls_back_to_torch_without_onnxruntime()
+    test_falls_back_to_torch_when_model_is_missing()
+    print("✅ ONNX backend checks passed.")
@@ -0,0 +1,49 @@
+"""
+test_parallel_embedding.py
+--------------------------
+
+Offline checks for the multi-process encoder: shards are encoded in the
+worker processes, each worker loads its model with the requested thread
+count, and results come back in input order.
+
+Usage:
+    python -m tests.test_parallel_embedding
+"""
+
+import os
+
+import numpy as np
+
+from cinematch.processing.parallel_embedding import ParallelEncoder
+
+
+class FakeModel:
+    """Encodes "review <n>" as [n, worker pid, threads]."""
+
+    def __init__(self, threads):
+        self.threads = threads
+
+    def encode(self, texts, batch_size, convert_to_numpy):
+        return np.array([[int(text.split()[1]), os.getpid(), self.threads] for text in texts], dtype=np.float64)
+
+
+def fake_loader(model_name, threads):
+    return FakeModel(threads)
+
+
+def test_results_in_input_order_across_workers():
+    texts = [f"review {i}" for i in range(1000)]
+    with ParallelEncoder(workers=3, threads_per_worker=2, shard_size=50, loader=fake_loader) as encoder:
+        embeddings = encoder.encode(texts, batch_size=16)
+        small = encoder.encode(texts[:9])
+
+    assert embeddings.dtype == np.float32 and embeddings.shape == (1000, 3)
+    assert embeddings[:, 0].tolist() == list(range(1000))
+    assert os.getpid() not in set(embeddings[:, 1].tolist())
+    assert set(embeddings[:, 2].tolist()) == {2.0}
+    assert small[:, 0].tolist() == list(range(9))
+
+
+if __name__ == "__main__":
+    test_results_in_input_order_across_workers()
+    print("✅ Parallel embedding checks passed.")
@@ -0,0 +1,93 @@
+"""
+test_rate_limiter.py
+--------------------
+
+Offline checks for the per-host token buckets: refill rate, burst
+capacity and per-host isolation, driven by a fake clock so no test
+actually sleeps.
+
+Usage:
+    python -m tests.test_rate_limiter
+"""
+
+from cinematch.scraper.rate_limiter import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to (or when slept on)."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_refill_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=clock, sleep=clock.sleep)
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.5
+
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.25
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.0
+
+
+def test_burst_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=3.0, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == 1.0
+
+    # A long idle period refills up to the capacity, never beyond it.
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == 1.0
+
+
+def test_default_capacity_follows_rate():
+    assert TokenBucket(rate=0.5).capacity == 1.0
+    assert TokenBucket(rate=4.0).capacity == 4.0
+
+
+def test_acquire_sleeps_until_a_token_is_free():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 2.0
+    assert clock.sleeps == [2.0]
+
+
+def test_hosts_are_isolated():
+    clock = FakeClock()
+    limiter = HostRateLimiter({"www.imdb.com": 1.0, "ddgs": 0.5}, default_rate=0.25, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire("www.imdb.com") == 0.0
+    # An exhausted IMDb bucket does not make the other hosts wait.
+    assert limiter.acquire("ddgs") == 0.0
+    assert limiter.acquire("example.org") == 0.0
+    assert clock.sleeps == []
+
+    assert limiter.acquire("www.imdb.com") == 1.0
+    assert limiter.acquire("ddgs") == 1.0   # refilled 1s of its 2s while IMDb waited
+    assert limiter.acquire("example.org") == 2.0
+    assert clock.sleeps == [1.0, 1.0, 2.0]
+
+
+if __name__ == "__main__":
+    test_refill_rate()
+    test_burst_capacity()
+    test_default_capacity_follows_rate()
+    test_acquire_sleeps_until_a_token_is_free()
+    test_hosts_are_isolated()
+    print("✅ Rate limiter checks passed.")
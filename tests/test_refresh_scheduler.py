@@ -0,0 +1,130 @@
+"""
+test_refresh_scheduler.py
+-------------------------
+
+Offline checks for the staleness-driven refresh scheduler: priority
+ordering, the request budget, and re-queuing picked titles in the manifest.
+
+Usage:
+    python -m tests.test_refresh_scheduler
+"""
+
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from cinematch.scraper.bulk_runner import BulkScraper
+from cinematch.scraper.job_manifest import RESOLVED, REVIEWS_DONE, JobManifest
+from cinematch.scraper.refresh_scheduler import RefreshScheduler, load_from_manifest, movie_entry
+
+NOW = datetime(2026, 10, 18)
+
+
+def entry(title, scraped_at, rating_count="1,000", reviews=()):
+    return movie_entry(title, {
+        'imdb_id': f"tt{abs(hash(title)) % 10 ** 7:07d}",
+        'scraped_at': scraped_at,
+        'rating_count': rating_count,
+        'user_reviews': [{'date': d} for d in reviews],
+    })
+
+
+def test_priority_combines_age_popularity_and_velocity():
+    scheduler = RefreshScheduler(min_age_days=7, now=NOW)
+    fresh = entry("Fresh", "2026-10-15 00:00:00")
+    old = entry("Old", "2026-07-01 00:00:00")
+    old_popular = entry("Old Popular", "2026-07-01 00:00:00", rating_count="2.1M")
+    trending = entry("Trending", "2026-09-01 00:00:00", reviews=["2026-08-20"] * 30)
+
+    assert scheduler.priority(fresh) == 0.0
+    assert scheduler.priority(old_popular) > scheduler.priority(old)
+    assert trending['review_velocity'] == 1.0
+    assert scheduler.priority(trending) > scheduler.priority(entry("Quiet", "2026-09-01 00:00:00"))
+
+
+def test_plan_respects_budget():
+    scheduler = RefreshScheduler(now=NOW, requests_per_title=4)
+    entries = [entry(f"Movie {i}", f"2026-0{i}-01 00:00:00") for i in range(1, 10)]
+
+    plan = scheduler.plan(entries, budget=13)
+    assert [e['title'] for e in plan] == ["Movie 1", "Movie 2", "Movie 3"]
+    assert plan[0]['priority'] >= plan[1]['priority'] >= plan[2]['priority']
+    assert scheduler.plan(entries, budget=3) == []
+
+
+class FakeScraper:
+    def __init__(self):
+        self.details_for = []
+
+    def get_movie_details(self, imdb_id):
+        self.details_for.append(imdb_id)
+        return {'imdb_id': imdb_id, 'title': "The Matrix", 'scraped_at': "2026-10-18 00:00:00"}
+
+    def get_reviews_via_ddgs(self, title, max_reviews):
+        return []
+
+    def get_featured_reviews_via_ddgs(self, title, max_reviews):
+        return []
+
+    def save_movie_data(self, movie_data, format='both', user_reviews=None):
+        pass
+
+
+def test_refresh_requeues_after_search_stage():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        for title, imdb_id, scraped_at in (
+            ("The Matrix", "tt0133093", "2026-01-01 00:00:00"),
+            ("Inception", "tt1375666", "2026-10-17 00:00:00"),
+        ):
+            manifest.add_titles([title])
+            manifest.claim("w")
+            manifest.advance(title, REVIEWS_DONE, imdb_id=imdb_id, payload={'imdb_id': imdb_id, 'rating_count': "2,000"}, scraped_at=scraped_at)
+            manifest.release(title)
+
+        assert {e['title'] for e in load_from_manifest(manifest)} == {"The Matrix", "Inception"}
+
+        bulk = BulkScraper(manifest=manifest)
+        scraper = FakeScraper()
+        bulk._local.scraper = scraper
+        counts = bulk.refresh(budget=100, scheduler=RefreshScheduler(now=NOW), delay_range=(0, 0))
+
+        assert counts['saved'] == 1
+        assert scraper.details_for == ["tt0133093"]
+        assert manifest.get("The Matrix")['scraped_at'] == "2026-10-18 00:00:00"
+        assert manifest.summary() == {REVIEWS_DONE: 2}
+        manifest.close()
+
+
+def test_refresh_stays_within_budget_despite_outstanding_jobs():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = JobManifest(Path(tmp) / "m.sqlite")
+        for i in range(3):
+            title = f"Old {i}"
+            manifest.add_titles([title])
+            manifest.claim("w")
+            manifest.advance(title, REVIEWS_DONE, imdb_id=f"tt000000{i}", payload={'imdb_id': f"tt000000{i}"}, scraped_at=f"2026-0{i + 1}-01 00:00:00")
+            manifest.release(title)
+        # Outstanding rows left by an earlier, interrupted crawl
+        for i in range(5):
+            manifest.requeue(f"Stale {i}", RESOLVED, imdb_id=f"tt100000{i}", payload={'search_info': {'imdb_id': f"tt100000{i}"}})
+
+        bulk = BulkScraper(manifest=manifest)
+        scraper = FakeScraper()
+        bulk._local.scraper = scraper
+        scheduler = RefreshScheduler(now=NOW, requests_per_title=4)
+        counts = bulk.refresh(budget=9, scheduler=scheduler, delay_range=(0, 0))
+
+        assert counts['saved'] == 2
+        assert scraper.details_for == ["tt0000000", "tt0000001"]
+        assert len(scraper.details_for) * scheduler.requests_per_title <= 9
+        assert manifest.summary() == {REVIEWS_DONE: 3, RESOLVED: 5}
+        manifest.close()
+
+
+if __name__ == "__main__":
+    test_priority_combines_age_popularity_and_velocity()
+    test_plan_respects_budget()
+    test_refresh_requeues_after_search_stage()
+    test_refresh_stays_within_budget_despite_outstanding_jobs()
+    print("✅ Refresh scheduler checks passed.")
@@ -0,0 +1,60 @@
+"""
+test_registry.py
+----------------
+
+Offline checks for the process-wide registry: every caller (and thread)
+gets the same vector store and Chroma client for a path, and options left
+at their defaults do not load a second instance.
+
+Usage:
+    python -m tests.test_registry
+"""
+
+import sys
+import tempfile
+import types
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from cinematch.processing import registry
+from cinematch.processing.store import VectorStore
+from tests.test_chunking import FakeSentenceTransformer
+
+
+def test_shared_store_and_client():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                stores = list(executor.map(lambda _: registry.get_vector_store("shared_reviews", tmp), range(16)))
+            assert len({id(store) for store in stores}) == 1
+
+            # A store for another collection, or built directly, reuses the client.
+            other = registry.get_vector_store("other_reviews", tmp)
+            direct = VectorStore("shared_reviews", persistent_path=tmp)
+            assert other is not stores[0]
+            assert other.client is stores[0].client is direct.client is registry.get_chroma_client(tmp)
+        finally:
+            registry.clear()
+
+
+def test_default_options_share_one_instance():
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(sys.modules, {"sentence_transformers": module}):
+        try:
+            model = registry.get_embedding_model()
+            assert registry.get_embedding_model(workers=1, cache=None) is model
+            assert registry.get_embedding_model('all-MiniLM-L6-v2', backend="torch", max_batch_tokens=None) is model
+            assert registry.get_embedding_model(workers=2) is not model
+
+            store = registry.get_vector_store("reviews", tmp)
+            assert registry.get_vector_store("reviews", tmp, space=None, ef_search=None) is store
+            assert registry.get_vector_store("reviews", tmp, ef_search=50) is not store
+        finally:
+            registry.clear()
+
+
+if __name__ == "__main__":
+    test_shared_store_and_client()
+    test_default_options_share_one_instance()
+    print("✅ Registry checks passed.")
@@ -0,0 +1,117 @@
+"""
+test_resolution_cache.py
+------------------------
+
+Offline checks for the persistent title -> IMDb ID cache: TTL expiry,
+negative caching with its shorter TTL, hit-rate accounting, and that a
+failed search is not cached as a miss.
+
+Usage:
+    python -m tests.test_resolution_cache
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+
+from cinematch.scraper.imdb_searcher import ImprovedIMDbScraper
+from cinematch.scraper.resolution_cache import NEGATIVE, ResolutionCache
+
+MATRIX = {'imdb_id': "tt0133093", 'search_title': "The Matrix (1999)", 'match_score': 1.0}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDDGS:
+    """Raises ``error`` while it is set, otherwise returns one IMDb hit."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def text(self, query, max_results=10):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return [{'href': "https://www.imdb.com/title/tt0133093/", 'title': "The Matrix (1999) - IMDb", 'body': "1999 film"}]
+
+
+def test_positive_entries_expire_after_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = FakeClock()
+        cache = ResolutionCache(Path(tmp) / "r.sqlite", ttl=100, negative_ttl=10, clock=clock)
+        cache.put("The Matrix", 1999, MATRIX)
+
+        assert cache.get("the  matrix!", 1999)['imdb_id'] == "tt0133093"
+        assert cache.get("The Matrix") is None   # a different year is a different key
+
+        clock.now += 99
+        assert cache.get("The Matrix", 1999) is not None
+        clock.now += 1
+        assert cache.get("The Matrix", 1999) is None
+        cache.close()
+
+
+def test_negative_entries_use_the_shorter_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = FakeClock()
+        cache = ResolutionCache(Path(tmp) / "r.sqlite", ttl=100, negative_ttl=10, clock=clock)
+        cache.put("Not A Real Movie", None, None)
+
+        assert cache.get("Not A Real Movie") is NEGATIVE
+        clock.now += 10
+        assert cache.get("Not A Real Movie") is None
+
+        assert cache.stats == {'hits': 0, 'negative_hits': 1, 'misses': 1}
+        assert cache.hit_rate() == 0.5
+        cache.close()
+
+
+def test_search_errors_are_not_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResolutionCache(Path(tmp) / "r.sqlite")
+        ddgs = FakeDDGS(error=RuntimeError("rate limited"))
+        searcher = ImprovedIMDbScraper(ddgs=ddgs, resolution_cache=cache)
+
+        assert searcher.improved_search_movie("The Matrix", 1999) is None
+        assert cache.get("The Matrix", 1999) is None   # not stored as NEGATIVE
+
+        ddgs.error = None
+        assert searcher.improved_search_movie("The Matrix", 1999)['imdb_id'] == "tt0133093"
+        assert searcher.improved_search_movie("The Matrix", 1999)['imdb_id'] == "tt0133093"
+        assert ddgs.calls == 2   # the error and one real search; the last lookup was a hit
+        cache.close()
+
+
+def test_stats_are_exact_under_concurrency():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResolutionCache(Path(tmp) / "r.sqlite")
+        cache.put("The Matrix", 1999, MATRIX)
+
+        def lookups():
+            for _ in range(200):
+                cache.get("The Matrix", 1999)
+                cache.get("Unknown Title", 1999)
+
+        threads = [threading.Thread(target=lookups) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats == {'hits': 800, 'negative_hits': 0, 'misses': 800}
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_positive_entries_expire_after_ttl()
+    test_negative_entries_use_the_shorter_ttl()
+    test_search_errors_are_not_cached()
+    test_stats_are_exact_under_concurrency()
+    print("✅ Resolution cache checks passed.")
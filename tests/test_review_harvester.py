@@ -0,0 +1,187 @@
+"""
+test_review_harvester.py
+------------------------
+
+Offline checks for the paginated review harvester: page parsing, following
+the pagination key, stop conditions and early close of the generator.
+
+Usage:
+    python -m tests.test_review_harvester
+"""
+
+import csv
+import json
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from cinematch.scraper.bulk_runner import BulkScraper
+from cinematch.scraper.dataset_store import DatasetWriter, read_table
+from cinematch.scraper.http_cache import CachedResponse
+from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+from cinematch.scraper.job_manifest import DETAILS_DONE, JobManifest
+from cinematch.scraper.refresh_scheduler import load_from_manifest
+from cinematch.scraper.review_harvester import ReviewHarvester, parse_review_page
+
+
+def review_html(review_id, posted, helpful, rating=8):
+    return f"""
+    <div class="lister-item mode-detail imdb-user-review collapsable" data-review-id="{review_id}">
+      <div class="review-container"><div class="lister-item-content">
+        <div class="ipl-ratings-bar"><span class="rating-other-user-rating"><span>{rating}</span><span class="point-scale">/10</span></span></div>
+        <a href="/review/{review_id}/" class="title"> Review {review_id}
+        </a>
+        <div class="display-name-date"><span class="display-name-link"><a href="/user/ur1/">neo</a></span><span class="review-date">{posted}</span></div>
+        <div class="content"><div class="text show-more__control">Body of {review_id}.</div>
+          <div class="actions text-muted">{helpful:,} out of {helpful + 10:,} found this helpful.</div>
+        </div>
+      </div></div>
+    </div>
+    """
+
+
+def page_html(reviews, next_key=None):
+    more = f'<div class="load-more-data" data-key="{next_key}" data-ajaxurl="/title/tt0133093/reviews/_ajax"></div>' if next_key else ''
+    return f"<html><body>{''.join(reviews)}{more}</body></html>".encode()
+
+
+class FakeTransport:
+    """Serves three pages of reviews chained by pagination keys."""
+
+    def __init__(self):
+        self.pages = {
+            None: page_html([review_html("rw1", "3 March 2026", 1500), review_html("rw2", "1 February 2026", 3)], "k2"),
+            "k2": page_html([review_html("rw3", "5 January 2026", 40), review_html("rw4", "30 December 2025", 12)], "k3"),
+            "k3": page_html([review_html("rw5", "1 June 2025", 7)]),
+        }
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        query = parse_qs(urlparse(url).query)
+        key = query.get('paginationKey', [None])[0]
+        with self.lock:
+            self.requested.append((key, query['sort'][0]))
+        return CachedResponse(url, 200, self.pages[key])
+
+
+def test_parse_review_page():
+    reviews, next_key = parse_review_page(page_html([review_html("rw1", "3 March 2026", 1500)], "k2"))
+    assert next_key == "k2"
+    review = reviews[0]
+    assert review['review_id'] == "rw1" and review['title'] == "Review rw1"
+    assert review['content'] == "Body of rw1." and review['rating'] == "8"
+    assert review['date'] == "2026-03-03" and review['author'] == "neo"
+    assert (review['helpful_votes'], review['total_votes']) == (1500, 1510)
+    assert review['url'] == "https://www.imdb.com/review/rw1/"
+
+
+def test_walks_all_pages_lazily():
+    transport = FakeTransport()
+    harvester = ReviewHarvester(transport, prefetch=1)
+    reviews = harvester.iter_reviews("tt0133093")
+
+    first = next(reviews)
+    assert first['review_id'] == "rw1"
+    assert [r['review_id'] for r in reviews] == ["rw2", "rw3", "rw4", "rw5"]
+    assert [key for key, _ in transport.requested] == [None, "k2", "k3"]
+
+
+def test_stop_conditions():
+    harvester = ReviewHarvester(FakeTransport())
+    assert [r['review_id'] for r in harvester.iter_reviews("tt0133093", max_reviews=3)] == ["rw1", "rw2", "rw3"]
+    assert [r['review_id'] for r in harvester.iter_reviews("tt0133093", min_helpful=10)] == ["rw1", "rw3", "rw4"]
+
+    transport = FakeTransport()
+    recent = ReviewHarvester(transport).iter_reviews("tt0133093", since=date(2026, 1, 1))
+    assert [r['review_id'] for r in recent] == ["rw1", "rw2", "rw3"]
+    assert transport.requested[0][1] == "submissionDate"
+
+
+MOVIE = {'imdb_id': "tt0133093", 'title': "The Matrix", 'scraped_at': "2026-03-10 00:00:00", 'featured_reviews': []}
+
+
+def harvesting_scraper(**kwargs):
+    scraper = IMDbScraperDDGS(**kwargs)
+    scraper.harvester = ReviewHarvester(FakeTransport(), prefetch=1)
+    return scraper
+
+
+def test_reviews_stream_into_json_and_csv():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        scraper = harvesting_scraper()
+        saved = scraper.save_movie_data(dict(MOVIE), file_location=root, user_reviews=scraper.harvest_reviews("tt0133093"))
+        assert saved == 5
+
+        with open(root / "json" / "imdb_data_The_Matrix.json", encoding='utf-8') as f:
+            movie = json.load(f)
+        assert {k: v for k, v in movie.items() if k != 'user_reviews'} == MOVIE
+        assert [r['review_id'] for r in movie['user_reviews']] == ["rw1", "rw2", "rw3", "rw4", "rw5"]
+
+        with open(root / "csv" / "imdb_reviews_The_Matrix.csv", encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [r['review_id'] for r in rows] == ["rw1", "rw2", "rw3", "rw4", "rw5"]
+        assert rows[0]['rating'] == "8"
+
+        # Reviews already on the movie are replaced by the stream, not duplicated
+        stale = dict(MOVIE, user_reviews=[{'review_id': "old"}])
+        scraper.save_movie_data(stale, format='json', file_location=root, user_reviews=iter([{'review_id': "rw9"}]))
+        with open(root / "json" / "imdb_data_The_Matrix.json", encoding='utf-8') as f:
+            text = f.read()
+        assert text.count('"user_reviews"') == 1
+        assert json.loads(text)['user_reviews'] == [{'review_id': "rw9"}]
+        assert stale['user_reviews'] == [{'review_id': "old"}]
+
+        # No reviews still gives valid JSON
+        scraper.save_movie_data(dict(MOVIE), format='json', file_location=root, user_reviews=iter([]))
+        with open(root / "json" / "imdb_data_The_Matrix.json", encoding='utf-8') as f:
+            assert json.load(f)['user_reviews'] == []
+
+
+def test_reviews_stream_into_dataset_in_bounded_parts():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        writer = DatasetWriter(root, max_buffered_rows=2)
+        scraper = harvesting_scraper(dataset_writer=writer)
+        assert scraper.save_movie_data(dict(MOVIE), format='dataset', user_reviews=scraper.harvest_reviews("tt0133093")) == 5
+        writer.flush()
+
+        reviews = read_table(root, "reviews", columns=["position", "rating"]).to_pylist()
+        assert sorted(r['position'] for r in reviews) == [0, 1, 2, 3, 4]
+        assert len(list((root / "reviews").rglob("*.parquet"))) >= 2
+        assert read_table(root, "movies").num_rows == 1
+
+
+def test_manifest_keeps_counts_not_harvested_reviews():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        manifest = JobManifest(root / "m.sqlite")
+        manifest.requeue("The Matrix", DETAILS_DONE, imdb_id="tt0133093", payload=dict(MOVIE, search_info={'imdb_id': "tt0133093"}))
+        writer = DatasetWriter(root / "dataset")
+        bulk = BulkScraper(manifest=manifest, dataset_writer=writer, review_limit=100)
+        scraper = harvesting_scraper(dataset_writer=writer)
+        scraper.get_featured_reviews_via_ddgs = lambda title, max_reviews: []
+
+        assert bulk._process_job(scraper, manifest.claim("w1")) == 'saved'
+        writer.flush()
+
+        payload = manifest.completed()[0]['payload']
+        assert 'user_reviews' not in payload
+        assert payload['user_review_count'] == 5
+        assert payload['review_velocity'] == 1 / 30   # only rw1 was posted in the 30 days before the scrape
+        assert load_from_manifest(manifest)[0]['review_velocity'] == 1 / 30
+        assert read_table(root / "dataset", "reviews").num_rows == 5
+        manifest.close()
+
+
+if __name__ == "__main__":
+    test_parse_review_page()
+    test_walks_all_pages_lazily()
+    test_stop_conditions()
+    test_reviews_stream_into_json_and_csv()
+    test_reviews_stream_into_dataset_in_bounded_parts()
+    test_manifest_keeps_counts_not_harvested_reviews()
+    print("✅ Review harvester checks passed.")
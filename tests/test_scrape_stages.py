@@ -0,0 +1,84 @@
+"""
+test_scrape_stages.py
+---------------------
+
+Offline checks for the overlapping stages of
+``scrape_comprehensive_movie_data``: a title that is not found does not
+leave review searches running, every call keeps its own timings, and the
+stage pool and per-thread DDGS clients are reused between calls.
+
+Usage:
+    python -m tests.test_scrape_stages
+"""
+
+import threading
+import time
+
+from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+
+
+class NotFoundSearcher:
+    def improved_search_movie(self, title, year=None):
+        time.sleep(0.01)   # long enough for the review searches to start
+        return None
+
+
+def make_scraper():
+    scraper = IMDbScraperDDGS()
+    scraper.searcher = NotFoundSearcher()
+    scraper.running = 0
+    scraper.clients = set()
+    lock = threading.Lock()
+
+    def slow_search(movie_title, max_reviews=20, ddgs=None):
+        with lock:
+            scraper.running += 1
+            scraper.clients.add((threading.get_ident(), id(ddgs)))
+        time.sleep(0.05)
+        with lock:
+            scraper.running -= 1
+        return []
+
+    scraper.get_reviews_via_ddgs = slow_search
+    scraper.get_featured_reviews_via_ddgs = slow_search
+    return scraper
+
+
+def test_not_found_waits_for_started_review_searches():
+    scraper = make_scraper()
+    try:
+        result = scraper.scrape_comprehensive_movie_data("No Such Movie")
+        assert 'error' in result
+        assert scraper.running == 0
+
+        # Timings belong to this call and are complete when it returns
+        timings = scraper.last_stage_timings
+        assert set(timings) == {'search', 'user_reviews', 'featured_reviews'}
+        snapshot = dict(timings)
+        time.sleep(0.1)
+        assert timings == snapshot
+    finally:
+        scraper.close()
+
+
+def test_stage_pool_and_ddgs_clients_are_reused():
+    scraper = make_scraper()
+    try:
+        scraper.scrape_comprehensive_movie_data("No Such Movie")
+        executor = scraper._stage_executor
+        for _ in range(3):
+            scraper.scrape_comprehensive_movie_data("No Such Movie")
+        assert scraper._stage_executor is executor
+
+        # At most one DDGS client per stage thread, whatever the number of calls
+        threads = {thread for thread, _ in scraper.clients}
+        assert len(scraper.clients) == len(threads) <= 3
+    finally:
+        scraper.close()
+    assert scraper._stage_executor is None
+
+
+if __name__ == "__main__":
+    test_not_found_waits_for_started_review_searches()
+    test_stage_pool_and_ddgs_clients_are_reused()
+    print("✅ Scrape stage checks passed.")
@@ -0,0 +1,244 @@
+"""
+test_streaming.py
+-----------------
+
+Offline checks for the staged ingestion pipeline: stages run concurrently
+with bounded read-ahead, errors stop every stage, and streaming a small
+corpus into the vector store (Chroma or memmap) gives the same documents
+as a rerun, encode calls are large enough for the worker pool and
+token-budgeted batches, and the cleaning workers setting reaches
+``clean_texts``. Movies without an IMDb ID are left out rather than sharing one
+diff scope.
+
+Usage:
+    python -m tests.test_streaming
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from cinematch.processing import pipeline as pipeline_module
+from cinematch.processing.memmap_store import MemmapVectorStore
+from cinematch.processing.pipeline import ingest_movies, load_metadata, load_reviews, sync_movie_records
+from cinematch.processing.store import VectorStore
+from cinematch.processing.streaming import StreamingPipeline
+from tests.test_chunking import load_model, words
+
+
+def test_stages_keep_order_and_bound_read_ahead():
+    produced = []
+
+    def source():
+        for i in range(50):
+            produced.append(i)
+            yield i
+
+    def double(items):
+        for item in items:
+            yield item * 2
+
+    def slow_sink(items):
+        for item in items:
+            time.sleep(0.002)
+            yield item
+
+    pipeline = StreamingPipeline([("double", double), ("sink", slow_sink)], queue_size=2)
+    outputs = []
+    for item in pipeline.run(source()):
+        outputs.append(item)
+        # double's queue (2) + one in its hand + sink's queue (2) + one in its hand + one here
+        assert len(produced) - len(outputs) <= 7
+    assert outputs == [i * 2 for i in range(50)]
+
+    stats = {row['stage']: row for row in (s.to_dict() for s in pipeline.stats)}
+    assert stats['double']['items_in'] == stats['sink']['items_out'] == 50
+    assert stats['double']['queue_depth_max'] <= 2
+    assert pipeline.bottleneck().name == "sink"
+    assert "Bottleneck: sink" in pipeline.report()
+
+
+def test_error_stops_all_stages():
+    def fail(items):
+        for item in items:
+            if item == 3:
+                raise RuntimeError("bad item")
+            yield item
+
+    pipeline = StreamingPipeline([("pass", lambda items: (i for i in items)), ("fail", fail)], queue_size=1)
+    try:
+        list(pipeline.run(range(1_000_000)))
+    except RuntimeError as e:
+        assert str(e) == "bad item"
+    else:
+        raise AssertionError("the stage's error must reach the caller")
+    assert not any(t.name.startswith("stage-") for t in threading.enumerate())
+
+
+class SmallBatchStore(VectorStore):
+    @property
+    def max_batch_size(self) -> int:
+        return 4
+
+
+class FakeEmbedder:
+    def chunk(self, texts, overlap=32):
+        return [[text] for text in texts]
+
+    def encode_array(self, texts, batch_size=32):
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+def write_movie(output_dir, name, imdb_id, reviews):
+    safe_name = name.replace(' ', '_')
+    os.makedirs(os.path.join(output_dir, "json"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "csv"), exist_ok=True)
+    with open(os.path.join(output_dir, "json", f"imdb_data_{safe_name}.json"), 'w') as f:
+        json.dump({'imdb_id': imdb_id, 'title': name, 'year': 1999}, f)
+    pd.DataFrame({'title': "Review", 'content': reviews, 'type': "user"}).to_csv(
+        os.path.join(output_dir, "csv", f"imdb_reviews_{safe_name}.csv"), index=False
+    )
+
+
+def test_ingest_movies_streams_into_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [f"Matrix review number {i} about bullet time." for i in range(7)])
+        write_movie(output_dir, "Pulp Fiction", "tt0110912", [f"Pulp Fiction review {i}, royale with cheese." for i in range(5)])
+        store = SmallBatchStore(persistent_path=os.path.join(tmp, "db"))
+        names = ["The Matrix", "Missing Movie", "Pulp Fiction"]
+
+        totals = {}
+        pipeline = ingest_movies(names, totals, output_dir, encode_size=3, embed_model=FakeEmbedder(), vector_store=store, queue_size=1)
+        assert totals['added'] == 12 and store.count() == 12
+        assert totals['movie_ids'] == {"tt0133093", "tt0110912"}
+        assert [s.items_in for s in pipeline.stats] == [3, 2, 2, 4]  # names, movies, record lists, encode batches
+
+        rerun = {}
+        ingest_movies(names, rerun, output_dir, encode_size=3, embed_model=FakeEmbedder(), vector_store=store)
+        assert rerun['added'] == 0 and rerun['unchanged'] == 12
+
+
+def test_ingest_movies_into_memmap_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [f"Matrix review number {i} about bullet time." for i in range(4)])
+        store = MemmapVectorStore(os.path.join(tmp, "memmap"))
+
+        totals = {}
+        ingest_movies(["The Matrix"], totals, output_dir, encode_size=3, embed_model=FakeEmbedder(), vector_store=store)
+        assert totals['added'] == 4 and store.movie_ids() == {"tt0133093"}
+
+        # Two reviews gone: the rerun deletes them without re-embedding the rest
+        write_movie(output_dir, "The Matrix", "tt0133093", [f"Matrix review number {i} about bullet time." for i in range(2)])
+        rerun = {}
+        ingest_movies(["The Matrix"], rerun, output_dir, encode_size=3, embed_model=FakeEmbedder(), vector_store=store)
+        assert rerun['added'] == 0 and rerun['deleted'] == 2 and rerun['unchanged'] == 2
+        assert MemmapVectorStore(os.path.join(tmp, "memmap"), read_only=True).count() == 2
+
+
+class FakePool:
+    """Stands in for ParallelEncoder: records the encode calls the pool receives."""
+
+    def __init__(self, model_name, workers, threads_per_worker, loader):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append((len(texts), batch_size))
+        return np.array([[len(text.split())] for text in texts], dtype=np.float32)
+
+    def close(self):
+        pass
+
+
+def test_ingestion_uses_the_worker_pool():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [words(0, 10 + i) for i in range(50)])
+        store = MemmapVectorStore(os.path.join(tmp, "memmap"))
+        with mock.patch("cinematch.processing.embedding.ParallelEncoder", FakePool):
+            model, _ = load_model(workers=2)
+            totals = {}
+            ingest_movies(["The Matrix"], totals, output_dir, batch_size=8, embed_model=model, vector_store=store, dedup_threshold=None)
+
+        assert totals['added'] == 50
+        assert model._pool.calls == [(50, 8)]   # one encode call, eight texts per forward pass
+        assert model.model.calls == []
+
+
+def test_ingestion_builds_token_budgeted_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [words(0, 10 + i) for i in range(50)])
+        store = MemmapVectorStore(os.path.join(tmp, "memmap"))
+        model, tokenized = load_model(max_batch_tokens=200)
+        ingest_movies(["The Matrix"], {}, output_dir, batch_size=8, embed_model=model, vector_store=store, dedup_threshold=None)
+
+        stats = model.encode_stats()
+        assert tokenized == [50]
+        assert stats['tokens'] > 0 and stats['padded_tokens'] >= stats['tokens']
+        assert stats['tokens_per_sec'] > 0
+        sizes = [size for size, _ in model.model.calls]
+        assert sum(sizes) == 50 and max(sizes) <= 8
+        assert any(size < 8 for size in sizes[:-1])   # long texts go in batches capped by tokens
+
+
+def test_clean_workers_reach_clean_texts():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [f"Matrix review number {i} about bullet time." for i in range(4)])
+        store = MemmapVectorStore(os.path.join(tmp, "memmap"))
+        totals = {}
+        with mock.patch.object(pipeline_module, "clean_texts", wraps=pipeline_module.clean_texts) as clean_texts:
+            ingest_movies(["The Matrix"], totals, output_dir, embed_model=FakeEmbedder(), vector_store=store, clean_workers=3)
+        assert [call.kwargs['workers'] for call in clean_texts.call_args_list] == [3]
+        assert totals['added'] == 4
+
+
+def test_movies_without_imdb_id_are_not_synced():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        write_movie(output_dir, "The Matrix", "tt0133093", [f"Matrix review number {i} about bullet time." for i in range(3)])
+        write_movie(output_dir, "Home Video", None, [f"Home video review {i}, shaky camera." for i in range(4)])
+        write_movie(output_dir, "Lost Tape", None, [f"Lost tape review {i}, grainy picture." for i in range(2)])
+        store = SmallBatchStore(persistent_path=os.path.join(tmp, "db"))
+
+        totals = {}
+        ingest_movies(["Home Video", "The Matrix", "Lost Tape"], totals, output_dir, encode_size=3, embed_model=FakeEmbedder(), vector_store=store)
+        assert totals['movie_ids'] == {"tt0133093"}
+        assert store.count() == 3
+        assert store.movie_ids() == {"tt0133093"}
+
+        for name in ("Home Video", "Lost Tape"):
+            try:
+                sync_movie_records(name, load_metadata(name, output_dir), load_reviews(name, output_dir), store, {'movie_ids': set()})
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{name} was synced without an IMDb ID")
+        assert store.count() == 3
+
+        try:
+            store.add_documents(["Home video review, shaky camera."], [{'movie_title': "Home Video"}], np.ones((1, 2), dtype=np.float32))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a document ID was invented for metadata without a movie_id")
+
+
+if __name__ == "__main__":
+    test_stages_keep_order_and_bound_read_ahead()
+    test_error_stops_all_stages()
+    test_ingest_movies_streams_into_store()
+    test_ingest_movies_into_memmap_store()
+    test_ingestion_uses_the_worker_pool()
+    test_ingestion_builds_token_budgeted_batches()
+    test_clean_workers_reach_clean_texts()
+    test_movies_without_imdb_id_are_not_synced()
+    print("✅ Streaming pipeline checks passed.")
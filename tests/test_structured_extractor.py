@@ -0,0 +1,121 @@
+"""
+test_structured_extractor.py
+----------------------------
+
+Offline checks for the JSON-LD / __NEXT_DATA__ fast extraction path using
+the saved fixture page in tests/fixtures.
+
+Usage:
+    python -m tests.test_structured_extractor
+"""
+
+import json
+from pathlib import Path
+
+from cinematch.scraper import imdb_scraper
+from cinematch.scraper.imdb_scraper import IMDbScraperDDGS
+from cinematch.scraper.structured_extractor import extract_structured_data
+
+FIXTURE = Path(__file__).parent / "fixtures" / "imdb_title_tt0133093.html"
+
+
+def test_extracts_all_sections_from_embedded_json():
+    data = extract_structured_data(FIXTURE.read_bytes())
+
+    assert data['title'] == "The Matrix"
+    assert data['year'] == "1999"
+    assert data['duration'] == "2h 16m"
+    assert data['imdb_rating'] == "8.7"
+    assert data['rating_count'] == "2,150,000"
+    assert data['content_rating'] == "R"
+    assert data['cast'][0] == {'actor': "Keanu Reeves", 'character': "Neo"}
+    assert data['storyline']['genres'] == ["Action", "Sci-Fi"]
+    assert data['storyline']['tagline'] == "Free your mind"
+    assert data['details']['release_date'] == "March 31, 1999 (United States)"
+    assert data['details']['languages'] == ["English"]
+    assert data['box_office']['budget'] == "$63,000,000"
+    assert data['technical_specs']['aspect_ratio'] == "2.39 : 1"
+
+
+def test_page_without_payloads_yields_nothing():
+    assert extract_structured_data(b"<html><h1>The Matrix</h1></html>") == {}
+
+
+def test_fast_path_skips_soup_when_payloads_are_complete():
+    scraper = IMDbScraperDDGS()
+    built = []
+    original = imdb_scraper.make_soup
+
+    def counting_make_soup(markup):
+        built.append(1)
+        return original(markup)
+
+    imdb_scraper.make_soup = counting_make_soup
+    try:
+        fast = scraper.parse_movie_page(FIXTURE.read_bytes())
+        assert built == []
+
+        legacy = scraper.parse_movie_page(FIXTURE.read_bytes(), fast=False)
+        assert built
+    finally:
+        imdb_scraper.make_soup = original
+
+    assert fast['title'] == legacy['title'] == "The Matrix"
+    assert fast['summary'] == legacy['summary']
+    assert [c['actor'] for c in fast['cast']] == [c['actor'] for c in legacy['cast']]
+
+
+JSON_LD_ONLY_PAGE = b"""<html><head>
+<script type="application/ld+json">{"@type": "Movie", "name": "The Matrix", "datePublished": "1999-03-31",
+ "actor": [{"name": "Keanu Reeves"}, {"name": "Laurence Fishburne"}]}</script>
+</head><body>
+<div data-testid="title-cast-list">
+  <a href="/name/nm0000206/">Keanu Reeves</a><div data-testid="cast-item-characters-link">Neo</div>
+  <a href="/name/nm0000401/">Laurence Fishburne</a><div data-testid="cast-item-characters-link">Morpheus</div>
+</div>
+</body></html>"""
+
+
+def test_json_ld_cast_falls_back_to_selectors_for_characters():
+    assert all(c['character'] == "Unknown" for c in extract_structured_data(JSON_LD_ONLY_PAGE)['cast'])
+
+    data = IMDbScraperDDGS().parse_movie_page(JSON_LD_ONLY_PAGE)
+    assert data['cast'] == [
+        {'actor': "Keanu Reeves", 'character': "Neo"},
+        {'actor': "Laurence Fishburne", 'character': "Morpheus"},
+    ]
+
+
+JSON_LD_STORYLINE_PAGE = b"""<html><head>
+<script type="application/ld+json">{"@type": "Movie", "name": "The Matrix", "genre": ["Action", "Sci-Fi"]}</script>
+</head><body>
+<span data-testid="plot-xl">A computer hacker learns the true nature of his reality.</span>
+<ul><li data-testid="storyline-2"><span>Taglines</span><span>Free your mind</span></li></ul>
+</body></html>"""
+
+
+def test_json_ld_storyline_falls_back_to_selectors_for_plot_and_tagline():
+    assert extract_structured_data(JSON_LD_STORYLINE_PAGE)['storyline'] == {'genres': ["Action", "Sci-Fi"]}
+
+    storyline = IMDbScraperDDGS().parse_movie_page(JSON_LD_STORYLINE_PAGE)['storyline']
+    assert storyline['genres'] == ["Action", "Sci-Fi"]
+    assert storyline['plot_summary'] == "A computer hacker learns the true nature of his reality."
+    assert storyline['tagline'] == "Free your mind"
+
+
+def test_malformed_release_month_keeps_the_year():
+    payload = {'props': {'pageProps': {'mainColumnData': {
+        'releaseDate': {'year': 1999, 'month': 13, 'day': 31, 'country': {'text': "United States"}},
+    }}}}
+    page = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(payload)}</script>'
+    assert extract_structured_data(page.encode())['details']['release_date'] == "1999 (United States)"
+
+
+if __name__ == "__main__":
+    test_extracts_all_sections_from_embedded_json()
+    test_page_without_payloads_yields_nothing()
+    test_fast_path_skips_soup_when_payloads_are_complete()
+    test_json_ld_cast_falls_back_to_selectors_for_characters()
+    test_json_ld_storyline_falls_back_to_selectors_for_plot_and_tagline()
+    test_malformed_release_month_keeps_the_year()
+    print("✅ Structured extractor checks passed.")
@@ -0,0 +1,86 @@
+"""
+test_title_index.py
+-------------------
+
+Builds a tiny offline title index from a hand-written IMDb dump and checks
+fuzzy lookup, the year filter and vote-count tie breaking.
+
+Usage:
+    python -m tests.test_title_index
+"""
+
+import tempfile
+from pathlib import Path
+
+from cinematch.scraper.imdb_searcher import ImprovedIMDbScraper
+from cinematch.scraper.title_index import TitleIndex, build_index, title_grams
+
+BASICS = """tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres
+tt0133093\tmovie\tThe Matrix\tThe Matrix\t0\t1999\t\\N\t136\tAction,Sci-Fi
+tt0234215\tmovie\tThe Matrix Reloaded\tThe Matrix Reloaded\t0\t2003\t\\N\t138\tAction,Sci-Fi
+tt0106062\tmovie\tThe Matrix\tThe Matrix\t0\t1993\t\\N\t60\tShort
+tt1375666\tmovie\tInception\tInception\t0\t2010\t\\N\t148\tAction,Adventure,Sci-Fi
+tt6751668\tmovie\tParasite\tGisaengchung\t0\t2019\t\\N\t132\tDrama,Thriller
+tt0903747\ttvSeries\tBreaking Bad\tBreaking Bad\t0\t2008\t2013\t49\tCrime,Drama
+"""
+
+RATINGS = """tconst\taverageRating\tnumVotes
+tt0133093\t8.7\t2150000
+tt0106062\t6.1\t120
+"""
+
+
+def _build(tmp: str) -> TitleIndex:
+    tmp = Path(tmp)
+    (tmp / "basics.tsv").write_text(BASICS, encoding='utf-8')
+    (tmp / "ratings.tsv").write_text(RATINGS, encoding='utf-8')
+    count = build_index(tmp / "basics.tsv", tmp / "index", tmp / "ratings.tsv")
+    assert count == 5  # the tvSeries row is filtered out
+    return TitleIndex(tmp / "index")
+
+
+def test_exact_title_prefers_most_voted():
+    with tempfile.TemporaryDirectory() as tmp:
+        best = _build(tmp).search("The Matrix", limit=1)[0]
+        assert best['imdb_id'] == "tt0133093"
+        assert best['similarity'] == 1.0
+
+
+def test_year_filter_and_fuzzy_match():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _build(tmp)
+        assert index.search("The Matrix", year=1993, limit=1)[0]['imdb_id'] == "tt0106062"
+        assert index.search("Inceptoin", limit=1)[0]['imdb_id'] == "tt1375666"
+        assert index.search("Inception", year=1950) == []
+
+
+def test_original_title_lookup_scores_against_the_original_name():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _build(tmp)
+        best = index.search("Gisaengchung", limit=1)[0]
+        assert best['imdb_id'] == "tt6751668"
+        assert best['title'] == "Parasite"
+        assert best['similarity'] == 1.0
+        assert index.original_title(0) is None   # The Matrix: same as the primary title
+
+        # Strict enough for the searcher's 0.9 offline-index threshold
+        searcher = ImprovedIMDbScraper(ddgs=None, title_index=index)
+        assert searcher.improved_search_movie("Gisaengchung", 2019)['imdb_id'] == "tt6751668"
+
+
+def test_gram_counts_are_kept_per_title_variant():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _build(tmp)
+        parasite = 4
+        assert index.gram_counts.shape == (2 * len(index),)
+        assert index.gram_counts[2 * parasite] == len(title_grams("Parasite"))
+        assert index.gram_counts[2 * parasite + 1] == len(title_grams("Gisaengchung"))
+        assert index.gram_counts[1] == 0   # no separate original title
+
+
+if __name__ == "__main__":
+    test_exact_title_prefers_most_voted()
+    test_year_filter_and_fuzzy_match()
+    test_original_title_lookup_scores_against_the_original_name()
+    test_gram_counts_are_kept_per_title_variant()
+    print("✅ Title index checks passed.")
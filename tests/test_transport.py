@@ -0,0 +1,127 @@
+"""
+test_transport.py
+-----------------
+
+Offline checks for the shared transport's retry loop: which statuses and
+errors are retried, Retry-After handling, full-jitter backoff bounds and
+the attempt limit. A scripted session stands in for the network and
+``time.sleep`` is patched, so nothing waits.
+
+Usage:
+    python -m tests.test_transport
+"""
+
+from unittest import mock
+
+import requests
+
+from cinematch.scraper.http_cache import CachedResponse
+from cinematch.scraper.transport import Transport
+
+URL = "https://www.imdb.com/title/tt0133093/"
+
+
+class FakeResponse(CachedResponse):
+    def close(self):
+        pass
+
+
+class ScriptedSession:
+    """Plays back a list of statuses (or exceptions to raise), one per request."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        return FakeResponse(url, status, b"body", headers=headers)
+
+
+def make_transport(script, **kwargs):
+    transport = Transport(**kwargs)
+    transport.session = ScriptedSession(script)
+    return transport
+
+
+def test_retries_429_and_5xx_until_success():
+    transport = make_transport([429, 500, 502, 503, 200], max_retries=4, backoff_base=1.0)
+    with mock.patch("cinematch.scraper.transport.time.sleep") as sleep, \
+            mock.patch("cinematch.scraper.transport.random.uniform", side_effect=lambda low, high: high):
+        response = transport.get(URL)
+
+    assert response.status_code == 200
+    assert transport.session.calls == 5
+    # Full jitter draws from [0, base * 2**attempt]; the patched uniform returns the upper bound.
+    assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0, 4.0, 8.0]
+
+
+def test_client_errors_are_not_retried():
+    transport = make_transport([404])
+    with mock.patch("cinematch.scraper.transport.time.sleep") as sleep:
+        assert transport.get(URL).status_code == 404
+    assert transport.session.calls == 1
+    sleep.assert_not_called()
+
+
+def test_retry_after_header_is_honoured_and_capped():
+    transport = make_transport([(429, {'Retry-After': "7"}), (503, {'Retry-After': "120"}), 200], backoff_cap=30.0)
+    with mock.patch("cinematch.scraper.transport.time.sleep") as sleep:
+        assert transport.get(URL).status_code == 200
+    assert [call.args[0] for call in sleep.call_args_list] == [7.0, 30.0]
+
+
+def test_non_numeric_retry_after_falls_back_to_jitter():
+    transport = make_transport([], backoff_base=2.0)
+    with mock.patch("cinematch.scraper.transport.random.uniform", return_value=0.5) as uniform:
+        assert transport.backoff_delay(3, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.5
+    uniform.assert_called_once_with(0, 16.0)
+
+
+def test_jitter_stays_within_bounds():
+    transport = make_transport([], backoff_base=1.0, backoff_cap=5.0)
+    for attempt in range(6):
+        for _ in range(50):
+            assert 0 <= transport.backoff_delay(attempt) <= min(5.0, 2 ** attempt)
+
+
+def test_gives_up_after_max_retries():
+    transport = make_transport([503, 503, 503], max_retries=2)
+    with mock.patch("cinematch.scraper.transport.time.sleep") as sleep:
+        response = transport.get(URL)
+    # The last retryable response is handed back instead of being retried again.
+    assert response.status_code == 503
+    assert transport.session.calls == 3
+    assert sleep.call_count == 2
+
+
+def test_connection_errors_are_retried_then_raised():
+    transport = make_transport([requests.ConnectionError("reset"), 200], max_retries=1)
+    with mock.patch("cinematch.scraper.transport.time.sleep"):
+        assert transport.get(URL).status_code == 200
+
+    transport = make_transport([requests.Timeout("slow"), requests.Timeout("slow")], max_retries=1)
+    with mock.patch("cinematch.scraper.transport.time.sleep") as sleep:
+        try:
+            transport.get(URL)
+        except requests.Timeout:
+            pass
+        else:
+            raise AssertionError("expected the last Timeout to propagate")
+    assert transport.session.calls == 2
+    assert sleep.call_count == 1
+
+
+if __name__ == "__main__":
+    test_retries_429_and_5xx_until_success()
+    test_client_errors_are_not_retried()
+    test_retry_after_header_is_honoured_and_capped()
+    test_non_numeric_retry_after_falls_back_to_jitter()
+    test_jitter_stays_within_bounds()
+    test_gives_up_after_max_retries()
+    test_connection_errors_are_retried_then_raised()
+    print("✅ Transport checks passed.")
@@ -0,0 +1,142 @@
+"""
+test_vector_store.py
+--------------------
+
+Offline checks for the ChromaDB wrapper: upserts larger than the client's
+maximum batch size are split into chunks, float32 arrays are accepted for
+both upserts and queries, content-hash IDs make reruns idempotent, and the
+distance space and HNSW settings are applied and turned into scores.
+
+Usage:
+    python -m tests.test_vector_store
+"""
+
+import tempfile
+
+import numpy as np
+
+from cinematch.core.ranking import RankingService
+from cinematch.processing.store import VectorStore, distance_to_score, document_id
+
+
+class SmallBatchStore(VectorStore):
+    """Pretends the client only accepts three records per upsert."""
+
+    upserts = 0
+
+    @property
+    def max_batch_size(self) -> int:
+        return 3
+
+
+def test_add_documents_chunks_by_max_batch_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SmallBatchStore(persistent_path=tmp)
+        upsert = store.collection.upsert
+
+        def counting_upsert(**kwargs):
+            assert len(kwargs['ids']) <= 3
+            store.upserts += 1
+            return upsert(**kwargs)
+
+        store.collection.upsert = counting_upsert
+        store.add_documents(
+            documents=[f"review {i}" for i in range(7)],
+            metadatas=[{'movie_id': "tt0133093", 'index': i} for i in range(7)],
+            embeddings=[[float(i), 1.0] for i in range(7)],
+        )
+
+        assert store.upserts == 3
+        assert store.count() == 7
+
+
+def test_float32_array_upsert_and_query():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SmallBatchStore(persistent_path=tmp)
+        embeddings = np.eye(5, 4, dtype=np.float32)
+        store.add_documents(
+            documents=[f"review {i}" for i in range(5)],
+            metadatas=[{'movie_id': "tt0133093", 'index': i} for i in range(5)],
+            embeddings=embeddings,
+            ids=[f"r{i}" for i in range(5)],
+        )
+
+        results = store.query_embeddings(embeddings[[2, 3]], n_results=1)
+        assert store.count() == 5
+        assert [ids[0] for ids in results['ids']] == ["r2", "r3"]
+
+
+def embed(texts):
+    return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_sync_documents_is_idempotent():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SmallBatchStore(persistent_path=tmp)
+        reviews = ["loved it", "too long", "loved it", "great score"]
+        metas = [{'movie_id': "tt0133093", 'original_index': i} for i in range(4)]
+
+        counts = store.sync_documents("tt0133093", reviews, metas, embed=embed)
+        assert counts == {'added': 3, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        assert store.sync_documents("tt0133093", reviews, metas, embed=embed)['unchanged'] == 3
+        assert store.count() == 3
+
+        # Plain add_documents derives the same IDs, so it overwrites too.
+        store.add_documents(reviews[:2], metas[:2], embeddings=embed(reviews[:2]))
+        assert store.count() == 3
+
+        # One review edited, one removed, one re-indexed.
+        counts = store.sync_documents(
+            "tt0133093",
+            ["loved it!", "great score"],
+            [{'movie_id': "tt0133093", 'original_index': 0}, {'movie_id': "tt0133093", 'original_index': 1}],
+            embed=embed,
+        )
+        assert counts == {'added': 1, 'updated': 1, 'deleted': 2, 'unchanged': 0}
+        assert store.count() == 2
+        stored = store.collection.get(ids=[document_id("tt0133093", "great score")])
+        assert stored['metadatas'][0]['original_index'] == 1
+
+        # Other movies are untouched.
+        store.sync_documents("tt0110912", ["royale with cheese"], [{'movie_id': "tt0110912"}], embed=embed)
+        store.sync_documents("tt0133093", [], [], embed=embed)
+        assert store.movie_ids() == {"tt0110912"}
+
+
+def test_distance_space_and_hnsw_settings():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore("default_space", persistent_path=tmp)
+        assert store.space == "cosine"
+
+        tuned = VectorStore("tuned", persistent_path=tmp, space="l2", m=8, ef_construction=64, ef_search=32)
+        config = tuned.hnsw_config
+        assert (config['space'], config['max_neighbors'], config['ef_construction'], config['ef_search']) == ("l2", 8, 64, 32)
+
+        # Reopening keeps the build settings; ef_search may change, the space may not.
+        assert VectorStore("tuned", persistent_path=tmp, ef_search=64).hnsw_config['ef_search'] == 64
+        try:
+            VectorStore("tuned", persistent_path=tmp, space="cosine")
+        except ValueError as e:
+            assert "space=l2" in str(e)
+        else:
+            raise AssertionError("an existing collection's space cannot change")
+
+        # Every space scores a pair of unit vectors with their cosine similarity.
+        a, b = np.array([1.0, 0.0], dtype=np.float32), np.array([0.6, 0.8], dtype=np.float32)
+        for space in ("cosine", "ip", "l2"):
+            space_store = VectorStore(f"space_{space}", persistent_path=tmp, space=space)
+            space_store.add_documents(["a", "b"], [{'movie_id': "tt1"}] * 2, embeddings=np.stack([a, b]), ids=["a", "b"])
+            distances = space_store.query_embeddings(a[None, :], n_results=2)['distances'][0]
+            assert np.allclose([space_store.score(d) for d in distances], [1.0, 0.6], atol=1e-5), space
+
+    assert distance_to_score(0.8, "l2") == distance_to_score(0.4, "cosine") == 0.6
+    results = [{'score': 0.9}, {'score': 0.4}]
+    assert RankingService.filter_by_score(results, threshold=0.5) == [{'score': 0.9}]
+
+
+if __name__ == "__main__":
+    test_add_documents_chunks_by_max_batch_size()
+    test_float32_array_upsert_and_query()
+    test_sync_documents_is_idempotent()
+    test_distance_space_and_hnsw_settings()
+    print("✅ Vector store checks passed.")